@@ -1,31 +1,82 @@
 import os
 import sys
-import pandas as pd
-from flask import Flask, request, jsonify, render_template
+import json
+import itertools
+from flask import Flask, Response, request, jsonify, render_template, stream_with_context
 from src.mlproject.pipelines.training_pipeline import ModelTrainer
-from src.mlproject.pipelines.prediction_pipeline import PredictionPipeline
-from src.mlproject.components.model_monitoring import ModelMonitoring  # ✅ Import model monitoring
-from src.mlproject.utils import load_object
+from src.mlproject.components.monitoring_service import MonitoringService, MonitoringClient, service_config_from_env
+from src.mlproject.pipelines.model_registry import get_model_registry, ModelRegistryConfig
+from src.mlproject.pipelines.prediction_cache import PredictionCacheConfig
+from src.mlproject.pipelines.prediction_pipeline import parse_batch_payload, validate_record, rows_frame, DEFAULT_BATCH_CHUNK_SIZE
+from src.mlproject.pipelines.micro_batcher import MicroBatcher, MicroBatcherConfig
+from src.mlproject import metrics
 from src.mlproject.logger import logger
 from src.mlproject.exception import CustomException
 
 app = Flask(__name__)
 
 
-# ✅ Load the trained model using the utility function
+# ✅ One warm model/preprocessor pair per worker, hot-swapped when the artifacts change
 MODEL_PATH = "artifacts/best_model.pkl"
-model = None
+
+# ✅ Repeated student profiles are answered from an LRU/TTL cache tied to the model version (0 disables)
+PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", "10000"))
+registry = get_model_registry(ModelRegistryConfig(
+    cache_config=PredictionCacheConfig(
+        max_entries=PREDICTION_CACHE_SIZE,
+        ttl_seconds=float(os.getenv("PREDICTION_CACHE_TTL_SECONDS", "3600")),
+    ) if PREDICTION_CACHE_SIZE > 0 else None,
+    # ✅ Precomputed predictions over the discrete input grid (python -m src.mlproject.components.lookup_table)
+    lookup_table_path=os.getenv("LOOKUP_TABLE_PATH", "artifacts/prediction_table.npy"),
+))
 
 try:
     if os.path.exists(MODEL_PATH):
-        model = load_object(MODEL_PATH)
+        registry.get()
         logger.info("Model loaded successfully.")
     else:
         logger.warning("Model not found. Training is required.")
 except Exception as e:
-    logger.error(f"Error loading model: {str(e)}")
+    logger.error("Error loading model: %s", e)
     raise CustomException(e, sys)  # ✅ Correctly raising CustomException
 
+# ✅ Optional dynamic batching: coalesce concurrent single-row /predict calls into one model call
+micro_batcher = None
+if os.getenv("MICRO_BATCHING", "0") == "1":
+    micro_batcher = MicroBatcher(registry.get, MicroBatcherConfig(
+        max_batch_size=int(os.getenv("MICRO_BATCH_MAX_SIZE", "64")),
+        max_wait_ms=float(os.getenv("MICRO_BATCH_MAX_WAIT_MS", "5")),
+    ))
+
+# ✅ Prometheus-format timings at /metrics when METRICS_ENABLED=1 (no-op spans otherwise)
+if registry.cache is not None:
+    metrics.register_collector(registry.cache.metrics)
+
+BATCH_CHUNK_SIZE = int(os.getenv("BATCH_CHUNK_SIZE", str(DEFAULT_BATCH_CHUNK_SIZE)))
+
+# ✅ Model monitoring, the streaming drift monitor (/monitor/events) and retraining run in one process,
+# never on the /predict request path. Under gunicorn that is a sidecar (MONITOR_SERVICE_URL, see
+# gunicorn.conf.py) shared by all workers; otherwise this process runs it.
+MONITOR_SERVICE_URL = os.getenv("MONITOR_SERVICE_URL")
+if MONITOR_SERVICE_URL:
+    monitoring = MonitoringClient(MONITOR_SERVICE_URL)
+else:
+    monitoring = MonitoringService(service_config_from_env())
+    registry.add_reload_listener(lambda pipeline, version: monitoring.scheduler.trigger("model_reloaded"))
+
+
+def start_background_services():
+    """Start the worker threads (monitoring, micro-batching). Threads do not survive fork()."""
+    if isinstance(monitoring, MonitoringService):
+        monitoring.start()
+    if micro_batcher is not None:
+        micro_batcher.start()
+
+
+# ✅ With gunicorn preload (gunicorn.conf.py) the master only loads the model; each worker starts these after fork
+if os.getenv("DEFER_BACKGROUND_SERVICES", "0") != "1":
+    start_background_services()
+
 @app.route('/')
 def home():
     """Render the homepage with a form for predictions."""
@@ -33,12 +84,10 @@ def home():
 
 
 @app.route('/predict', methods=['POST'])
+@metrics.timed("http.predict")
 def predict():
-    """Make predictions based on user input and log model performance."""
+    """Make predictions based on user input."""
     try:
-        if not model:
-            raise CustomException("Model not found. Please train the model first.", sys)  # ✅ Raising CustomException
-
         # ✅ Ensure request contains JSON data
         if not request.is_json:
             raise CustomException("Invalid request format. Expected JSON.", sys)
@@ -49,44 +98,111 @@ def predict():
         if not input_data:
             raise CustomException("Received empty input data.", sys)
 
-        # ✅ Convert JSON to DataFrame
-        df = pd.DataFrame([input_data])
-        print(df)  # ✅ Debugging step: Check what the input looks like
+        if micro_batcher is not None:
+            # ✅ Same checks as predict_record / the batch endpoint before the record joins a batch
+            row, error = validate_record(input_data)
+            if error is not None:
+                raise CustomException(error, sys)
+            prediction = micro_batcher.predict(rows_frame([row]))  # The batcher gets the pipeline itself
+        else:
+            # ✅ Reuse the warm prediction pipeline (raises if no model has been trained yet)
+            prediction = registry.get().predict_record(input_data)  # ✅ Compiled fast path, no DataFrame
+
+        return jsonify({"prediction": prediction.tolist()}), 200
+
+    except CustomException as e:
+        logger.error("Prediction Error: %s", e)
+        return jsonify({"error": str(e)}), 400  # Return error response
+
+    except Exception as e:
+        logger.error("Unexpected Error: %s", e)
+        return jsonify({"error": "An unexpected error occurred."}), 500  # Internal Server Error
+
 
-        model_path = "artifacts/best_model.pkl"
-        preprocessor_path = "artifacts/preprocessor.pkl"
+@app.route('/predict/batch', methods=['POST'])
+def predict_batch():
+    """
+    Score many records in one request. Accepts a JSON array, NDJSON or CSV body and
+    streams one NDJSON result line per input record, in order.
+    """
+    try:
+        chunk_size = request.args.get("chunk_size", BATCH_CHUNK_SIZE, type=int)
+        if chunk_size is None or chunk_size < 1:
+            raise CustomException("chunk_size must be a positive integer.", sys)
+
+        predictor = registry.get()
+        records = parse_batch_payload(request.get_data(), request.content_type)
 
-        # ✅ Load the prediction pipeline
-        predictor = PredictionPipeline(model_path, preprocessor_path)
-        prediction = predictor.predict(df)
+        # Fail fast on a malformed body before the streamed 200 response starts
+        first = next(records, None)
+        if first is None:
+            raise CustomException("Received empty input data.", sys)
 
-        # ✅ Log performance metrics to MLflow after prediction
-        monitor = ModelMonitoring()
-        metrics = monitor.evaluate_model("artifacts/test.csv")  # Evaluate on test data
+        def generate():
+            for result in predictor.predict_batch(itertools.chain([first], records), chunk_size=chunk_size):
+                yield json.dumps(result) + "\n"
 
-        return jsonify({
-            "prediction": prediction.tolist(),
-            "metrics": metrics  # ✅ Return monitoring metrics
-        }), 200
+        return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
 
     except CustomException as e:
-        logger.error(f"Prediction Error: {str(e)}")
-        return jsonify({"error": str(e)}), 400  # Return error response
+        logger.error("Batch Prediction Error: %s", e)
+        return jsonify({"error": str(e)}), 400
+
+    except (ValueError, UnicodeDecodeError) as e:
+        logger.error("Batch Prediction Error: %s", e)
+        return jsonify({"error": f"Invalid request body: {str(e)}"}), 400
 
     except Exception as e:
-        logger.error(f"Unexpected Error: {str(e)}")
-        return jsonify({"error": "An unexpected error occurred."}), 500  # Internal Server Error
+        logger.error("Unexpected Error: %s", e)
+        return jsonify({"error": "An unexpected error occurred."}), 500
+
+
+@app.route('/cache/stats', methods=['GET'])
+def prediction_cache_stats():
+    """Return prediction cache size, hit rate, evictions and expirations."""
+    if registry.cache is None:
+        return jsonify({"enabled": False}), 200
+    return jsonify({"enabled": True, **registry.cache.stats()}), 200
+
+
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """Span histograms and cache counters of this worker, in the Prometheus text format."""
+    if not metrics.enabled():
+        return jsonify({"error": "Metrics are disabled, set METRICS_ENABLED=1."}), 404
+    return Response(metrics.render(), content_type=metrics.CONTENT_TYPE)
+
+
+def monitoring_response(payload=None):
+    status, body = monitoring.handle(request.method, request.path, payload)
+    return jsonify(body), status
+
+
+@app.route('/monitor', methods=['GET'])
+def monitor_model():
+    """Return the latest cached model monitoring result."""
+    return monitoring_response()
+
+
+@app.route('/monitor', methods=['POST'])
+def trigger_monitoring():
+    """Queue a background model evaluation."""
+    return monitoring_response()
+
+
+@app.route('/monitor/events', methods=['POST'])
+def record_monitoring_events():
+    """
+    Ingest (features, prediction, actual) events: a JSON object or array of objects holding
+    the input fields plus "prediction" and "actual" (null while the label is unknown).
+    """
+    return monitoring_response(request.get_json(silent=True))
 
 
-# @app.route('/monitor', methods=['GET'])
-# def monitor_model():
-#     """Endpoint to manually check model performance."""
-#     try:
-#         monitor = ModelMonitoring()
-#         metrics = monitor.evaluate_model("artifacts/test.csv")
-#         return jsonify({"metrics": metrics}), 200
-#     except Exception as e:
-#         return jsonify({"error": str(e)}), 500
+@app.route('/monitor/drift', methods=['GET'])
+def drift_status():
+    """Return the latest window report of the streaming drift monitor and the last retrain."""
+    return monitoring_response()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,161 @@
+"""
+Async serving entry point with the same /predict contract as app.py:
+
+    uvicorn asgi:app --host 0.0.0.0 --port 8080
+
+The event loop only parses and answers requests. Model work runs on a sized
+InferenceExecutor (or, with MICRO_BATCHING=1, is coalesced by the MicroBatcher),
+so a burst is admitted up to INFERENCE_WORKERS + INFERENCE_QUEUE_SIZE requests
+and answered 503 beyond that, and every request is bounded by
+INFERENCE_TIMEOUT_SECONDS (504).
+"""
+import os
+import sys
+import contextlib
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from src.mlproject.pipelines.model_registry import get_model_registry, ModelRegistryConfig
+from src.mlproject.pipelines.prediction_cache import PredictionCacheConfig
+from src.mlproject.pipelines.micro_batcher import MicroBatcher, MicroBatcherConfig
+from src.mlproject.pipelines.prediction_pipeline import validate_record, rows_frame
+from src.mlproject.pipelines.inference_executor import InferenceExecutor, InferenceExecutorConfig, InferenceOverloaded
+from src.mlproject import metrics
+from src.mlproject.logger import logger
+from src.mlproject.exception import CustomException
+
+MODEL_PATH = "artifacts/best_model.pkl"
+
+PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", "10000"))
+registry = get_model_registry(ModelRegistryConfig(
+    cache_config=PredictionCacheConfig(
+        max_entries=PREDICTION_CACHE_SIZE,
+        ttl_seconds=float(os.getenv("PREDICTION_CACHE_TTL_SECONDS", "3600")),
+    ) if PREDICTION_CACHE_SIZE > 0 else None,
+    lookup_table_path=os.getenv("LOOKUP_TABLE_PATH", "artifacts/prediction_table.npy"),
+))
+
+executor = InferenceExecutor(InferenceExecutorConfig(
+    max_workers=int(os.getenv("INFERENCE_WORKERS", "0")) or None,
+    max_queue_size=int(os.getenv("INFERENCE_QUEUE_SIZE")) if os.getenv("INFERENCE_QUEUE_SIZE") else None,
+    timeout_seconds=float(os.getenv("INFERENCE_TIMEOUT_SECONDS", "2.0")),
+))
+
+micro_batcher = None
+if os.getenv("MICRO_BATCHING", "0") == "1":
+    micro_batcher = MicroBatcher(registry.get, MicroBatcherConfig(
+        max_batch_size=int(os.getenv("MICRO_BATCH_MAX_SIZE", "64")),
+        max_wait_ms=float(os.getenv("MICRO_BATCH_MAX_WAIT_MS", "5")),
+    ))
+
+if registry.cache is not None:
+    metrics.register_collector(registry.cache.metrics)
+metrics.register_collector(lambda: {
+    "mlproject_inference_in_flight": ("gauge", "Requests admitted to the inference executor.", executor.snapshot()["in_flight"]),
+    **{f"mlproject_inference_{name}_total": ("counter", f"Inference executor {name}.", value)
+       for name, value in executor.stats.items()},
+})
+
+
+def predict_record(input_data):
+    # Runs on an executor thread: registry.get() may stat or reload the artifacts
+    return registry.get().predict_record(input_data)
+
+
+async def predict(request: Request):
+    """Make predictions based on user input."""
+    with metrics.span("http.predict"):
+        return await _predict(request)
+
+
+async def _predict(request):
+    try:
+        if request.headers.get("content-type", "").split(";")[0].strip() != "application/json":
+            raise CustomException("Invalid request format. Expected JSON.", sys)
+        try:
+            input_data = await request.json()
+        except ValueError:
+            raise CustomException("Invalid request format. Expected JSON.", sys)
+        if not input_data:
+            raise CustomException("Received empty input data.", sys)
+
+        if micro_batcher is not None:
+            row, error = validate_record(input_data)
+            if error is not None:
+                raise CustomException(error, sys)
+            try:
+                prediction = await executor.run(None, submit=lambda: micro_batcher.submit(
+                    rows_frame([row]), timeout=executor.config.timeout_seconds,
+                ))
+            except (InferenceOverloaded, TimeoutError):
+                raise
+            except Exception as e:
+                raise CustomException(e, sys)  # As MicroBatcher.predict reports bad input
+        else:
+            prediction = await executor.run(predict_record, input_data)
+        return JSONResponse({"prediction": prediction.tolist()})
+
+    except InferenceOverloaded as e:
+        logger.warning("Prediction rejected: %s", e)
+        return JSONResponse({"error": "Server is busy, try again later."}, status_code=503, headers={"Retry-After": "1"})
+
+    except TimeoutError as e:
+        logger.error("Prediction Timeout: %s", e)
+        return JSONResponse({"error": str(e)}, status_code=504)
+
+    except CustomException as e:
+        logger.error("Prediction Error: %s", e)
+        return JSONResponse({"error": str(e)}, status_code=400)
+
+    except Exception as e:
+        logger.error("Unexpected Error: %s", e)
+        return JSONResponse({"error": "An unexpected error occurred."}, status_code=500)
+
+
+async def serving_stats(request: Request):
+    """Executor admission/timeout counters and, when enabled, prediction cache stats."""
+    stats = {"executor": executor.snapshot()}
+    if registry.cache is not None:
+        stats["cache"] = registry.cache.stats()
+    if micro_batcher is not None:
+        stats["micro_batcher"] = micro_batcher.stats
+    return JSONResponse(stats)
+
+
+async def prometheus_metrics(request: Request):
+    """Span histograms, executor and cache counters of this process, in the Prometheus text format."""
+    if not metrics.enabled():
+        return JSONResponse({"error": "Metrics are disabled, set METRICS_ENABLED=1."}, status_code=404)
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    try:
+        if os.path.exists(MODEL_PATH):
+            registry.get()
+            logger.info("Model loaded successfully.")
+        else:
+            logger.warning("Model not found. Training is required.")
+    except Exception as e:
+        logger.error("Error loading model: %s", e)
+        raise CustomException(e, sys)
+    if micro_batcher is not None:
+        micro_batcher.start()
+    yield
+    if micro_batcher is not None:
+        micro_batcher.stop(timeout=5)
+    executor.shutdown(wait=False)
+
+
+app = Starlette(
+    routes=[
+        Route("/predict", predict, methods=["POST"]),
+        Route("/serving/stats", serving_stats, methods=["GET"]),
+        Route("/metrics", prometheus_metrics, methods=["GET"]),
+    ],
+    lifespan=lifespan,
+)
@@ -0,0 +1,82 @@
+"""
+Parse time and file size of the stage artifacts: CSV vs Parquet vs Feather for the raw student
+frame, and CSV vs .npy (loaded and memory-mapped) for the transformed arrays.
+
+    python -m benchmarks.bench_artifacts --rows 1000000
+"""
+import os
+import time
+import argparse
+import tempfile
+
+import numpy as np
+
+from benchmarks.common import write_results
+from src.mlproject.components.data_transformation import DataTransformation, TARGET_COLUMN
+from src.mlproject.utils import ARTIFACT_FORMATS, generate_student_data, save_frame, load_frame
+
+
+def best_of(repeats, fn):
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def touch_array(array):
+    # Forces a memory-mapped array to actually be read
+    return float(array[:, -1].sum())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--output", help="Results JSON path")
+    args = parser.parse_args()
+
+    df = generate_student_data(args.rows)
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for fmt, extension in ARTIFACT_FORMATS.items():
+            path = os.path.join(tmp_dir, f"train{extension}")
+            write_seconds = best_of(1, lambda: save_frame(df, path))
+            read_seconds = best_of(args.repeats, lambda: load_frame(path))
+            results.append({
+                "artifact": "frame", "format": fmt,
+                "write_seconds": round(write_seconds, 4), "read_seconds": round(read_seconds, 4),
+                "size_mb": round(os.path.getsize(path) / 2 ** 20, 2),
+            })
+
+        preprocessor = DataTransformation().get_data_transform_object()
+        array = np.c_[preprocessor.fit_transform(df.drop(columns=[TARGET_COLUMN])), df[TARGET_COLUMN].to_numpy()]
+
+        csv_path = os.path.join(tmp_dir, "train_array.csv")
+        npy_path = os.path.join(tmp_dir, "train_array.npy")
+        array_cases = [
+            ("csv", csv_path, lambda: np.savetxt(csv_path, array, delimiter=","),
+             lambda: touch_array(np.loadtxt(csv_path, delimiter=","))),
+            ("npy", npy_path, lambda: np.save(npy_path, array), lambda: touch_array(np.load(npy_path))),
+            ("npy (mmap)", npy_path, lambda: None, lambda: touch_array(np.load(npy_path, mmap_mode="r"))),
+        ]
+        for fmt, path, write, read in array_cases:
+            write_seconds = best_of(1, write)
+            read_seconds = best_of(args.repeats, read)
+            results.append({
+                "artifact": "array", "format": fmt,
+                "write_seconds": round(write_seconds, 4), "read_seconds": round(read_seconds, 4),
+                "size_mb": round(os.path.getsize(path) / 2 ** 20, 2),
+            })
+
+    for row in results:
+        print(f"{row['artifact']:<6} {row['format']:<11} write {row['write_seconds']:>8.3f}s   "
+              f"read {row['read_seconds']:>8.3f}s   {row['size_mb']:>9.2f} MB")
+
+    print(f"Results written to {write_results('artifacts', {'rows': args.rows, 'formats': results}, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Per-worker memory of the gunicorn deployment (gunicorn.conf.py) with and without preload_app,
+for 1 and 8 workers. A Random Forest model is trained into a scratch directory, gunicorn is
+started there, every worker serves /predict requests, then /proc/<pid>/smaps_rollup is read:
+
+  RSS  resident pages, shared ones counted in every process
+  PSS  shared pages split between the processes sharing them (sums to the real total)
+  USS  private pages, what each extra worker actually costs
+
+    python -m benchmarks.bench_gunicorn_memory --rows 20000 --workers 1 8
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+import urllib.request
+
+from benchmarks.common import train_serving_artifacts, write_results
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RECORD = {
+    "gender": "female", "race_ethnicity": "group B", "parental_level_of_education": "some college",
+    "lunch": "standard", "test_preparation_course": "none", "reading_score": 70, "writing_score": 72,
+}
+
+
+def smaps_mb(pid):
+    fields = {}
+    with open(f"/proc/{pid}/smaps_rollup") as file_obj:
+        for line in file_obj:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == "kB":
+                fields[parts[0].rstrip(":")] = int(parts[1]) / 1024
+    return {
+        "rss_mb": fields["Rss"],
+        "pss_mb": fields["Pss"],
+        "uss_mb": fields["Private_Clean"] + fields["Private_Dirty"],
+    }
+
+
+def children(pid):
+    with open(f"/proc/{pid}/task/{pid}/children") as file_obj:
+        return [int(child) for child in file_obj.read().split()]
+
+
+def post_predict(port):
+    request = urllib.request.Request(
+        f"http://127.0.0.1:{port}/predict", data=json.dumps(RECORD).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return response.status
+
+
+def run_case(directory, workers, preload, port, requests_per_worker):
+    env = dict(os.environ, WEB_CONCURRENCY=str(workers), GUNICORN_PRELOAD="1" if preload else "0",
+               PORT=str(port), MONITOR_INTERVAL_SECONDS="0", PYTHONPATH=REPO_ROOT)
+    server = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", os.path.join(REPO_ROOT, "gunicorn.conf.py"), "wsgi:app"],
+        cwd=directory, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        deadline = time.monotonic() + 300
+        while True:
+            try:
+                post_predict(port)
+                break
+            except OSError:
+                if time.monotonic() > deadline or server.poll() is not None:
+                    raise RuntimeError("gunicorn did not start")
+                time.sleep(0.5)
+        # Without preload each worker loads the model lazily on its first request
+        while len(children(server.pid)) < workers:
+            time.sleep(0.2)
+        for _ in range(requests_per_worker * workers):
+            post_predict(port)
+
+        master = smaps_mb(server.pid)
+        per_worker = [smaps_mb(pid) for pid in children(server.pid)]
+        mean = {key: sum(w[key] for w in per_worker) / len(per_worker) for key in master}
+        return {
+            "workers": workers,
+            "preload": preload,
+            "master": {k: round(v, 1) for k, v in master.items()},
+            "worker_mean": {k: round(v, 1) for k, v in mean.items()},
+            "total_pss_mb": round(master["pss_mb"] + sum(w["pss_mb"] for w in per_worker), 1),
+        }
+    finally:
+        server.terminate()
+        server.wait(timeout=60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20_000, help="Training rows of the Random Forest")
+    parser.add_argument("--workers", type=int, nargs="*", default=[1, 8])
+    parser.add_argument("--requests-per-worker", type=int, default=50)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--output", help="Results JSON path")
+    args = parser.parse_args()
+
+    results = []
+    with tempfile.TemporaryDirectory() as directory:
+        train_serving_artifacts(directory, "Random Forest", args.rows)
+
+        for workers in args.workers:
+            for preload in (False, True):
+                row = run_case(directory, workers, preload, args.port, args.requests_per_worker)
+                results.append(row)
+                w = row["worker_mean"]
+                print(f"{workers} worker(s) preload={str(preload):<5}  per worker: RSS {w['rss_mb']:>7.1f} MB  "
+                      f"PSS {w['pss_mb']:>7.1f} MB  USS {w['uss_mb']:>7.1f} MB | total PSS {row['total_pss_mb']:>7.1f} MB")
+
+    print(f"Results written to {write_results('gunicorn_memory', {'rows': args.rows, 'cases': results}, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
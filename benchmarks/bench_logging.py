@@ -0,0 +1,119 @@
+"""
+Per-call cost of logging on the request path, before and after the queue-backed logger.
+
+  file     the previous setup: a synchronous FileHandler, the line is formatted and
+           written under the handler lock in the calling thread
+  queue    src.mlproject.logger: the caller resolves the %-style message and enqueues,
+           a QueueListener formats and writes the rotating file
+
+Each handler is timed for an enabled INFO call with an f-string and with %-style args,
+and for a filtered DEBUG call (where %-style skips the formatting entirely). "drain" is
+the time until the queue listener has written everything, i.e. the work moved off the
+caller. A second run uses several threads logging at once, as gunicorn threads would.
+
+    python -m benchmarks.bench_logging --calls 50000 --threads 8
+"""
+import os
+import time
+import logging
+import argparse
+import tempfile
+import threading
+
+from benchmarks.common import write_results
+from src.mlproject import logger as mlproject_logger
+
+SHAPE = (1000, 8)
+
+
+def make_logger(kind, directory, log_format):
+    name = f"bench.{kind}.{log_format}"
+    bench_logger = logging.getLogger(name)
+    bench_logger.handlers.clear()
+    bench_logger.propagate = False
+    bench_logger.setLevel(logging.INFO)
+    path = os.path.join(directory, f"{kind}-{log_format}.log")
+
+    if kind == "file":
+        handler = logging.FileHandler(path)
+        handler.setFormatter(logging.Formatter(mlproject_logger.TEXT_FORMAT))
+        bench_logger.addHandler(handler)
+        return bench_logger, lambda: None, lambda: handler.close()
+
+    file_handler = mlproject_logger._file_handler(path)
+    file_handler.setFormatter(
+        mlproject_logger.JsonFormatter() if log_format == "json" else logging.Formatter(mlproject_logger.TEXT_FORMAT)
+    )
+    log_queue = mlproject_logger.queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, file_handler)
+    listener.start()
+    bench_logger.addHandler(mlproject_logger._QueueHandler(log_queue))
+
+    def drain():
+        listener.stop()
+        listener.start()
+
+    def close():
+        listener.stop()
+        file_handler.close()
+    return bench_logger, drain, close
+
+
+CALLS = {
+    "info_fstring": lambda log, i: log.info(f"Request {i}: input shape {SHAPE}"),
+    "info_percent": lambda log, i: log.info("Request %s: input shape %s", i, SHAPE),
+    "debug_fstring": lambda log, i: log.debug(f"Request {i}: input shape {SHAPE}"),
+    "debug_percent": lambda log, i: log.debug("Request %s: input shape %s", i, SHAPE),
+}
+
+
+def time_calls(log, call, n_calls, threads):
+    per_thread = n_calls // threads
+
+    def worker():
+        for i in range(per_thread):
+            call(log, i)
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    started = time.perf_counter()
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return time.perf_counter() - started, per_thread * threads
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=50_000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--format", default="text", choices=["text", "json"], help="Line format of the queue logger")
+    parser.add_argument("--output", help="Results JSON path")
+    args = parser.parse_args()
+
+    runs = []
+    with tempfile.TemporaryDirectory() as directory:
+        for threads in sorted({1, args.threads}):
+            for kind in ("file", "queue"):
+                for call_name, call in CALLS.items():
+                    log, drain, close = make_logger(kind, directory, args.format)
+                    seconds, n_calls = time_calls(log, call, args.calls, threads)
+                    drain_started = time.perf_counter()
+                    drain()
+                    drain_seconds = time.perf_counter() - drain_started
+                    close()
+                    run = {
+                        "handler": kind, "call": call_name, "threads": threads, "calls": n_calls,
+                        "us_per_call": round(seconds / n_calls * 1e6, 3),
+                        "drain_seconds": round(drain_seconds, 3),
+                    }
+                    runs.append(run)
+                    print(f"threads={threads:<3} {kind:<6} {call_name:<14} {run['us_per_call']:>8.2f} us/call  "
+                          f"drain {run['drain_seconds']:.3f}s")
+
+    payload = {"calls": args.calls, "format": args.format, "runs": runs}
+    print(f"Results written to {write_results('logging', payload, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+/predict latency: live inference (compiled preprocessor + estimator) vs the exported lookup table,
+for single records and for a batch, after exporting the model over the full input grid.
+
+    python -m benchmarks.bench_lookup_table --rows 20000 --models "Random Forest" XGBRegressor
+"""
+import os
+import time
+import argparse
+import tempfile
+
+import numpy as np
+
+from benchmarks.common import write_results
+from src.mlproject.components.data_transformation import DataTransformation, TARGET_COLUMN
+from src.mlproject.components.lookup_table import LookupTable, LookupTableConfig, LookupTableExporter
+from src.mlproject.components.model_trainer import ModelTrainer
+from src.mlproject.pipelines.prediction_pipeline import PredictionPipeline
+from src.mlproject.utils import generate_student_data, save_object
+
+DEFAULT_MODELS = ["Linear Regression", "Random Forest", "XGBRegressor", "CatBoosting Regressor"]
+
+
+def per_call_us(function, args_list, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for args in args_list:
+            function(args)
+    return (time.perf_counter() - started) / (repeat * len(args_list)) * 1e6
+
+
+def run_case(directory, model_name, rows, n_records, batch_rows):
+    df = generate_student_data(rows)
+    preprocessor = DataTransformation().get_data_transform_object()
+    X = preprocessor.fit_transform(df.drop(columns=[TARGET_COLUMN]))
+    _, params, model = next(c for c in ModelTrainer().get_candidate_models() if c[0] == model_name)
+    model.set_params(**params).fit(X, df[TARGET_COLUMN])
+    model_path, preprocessor_path = os.path.join(directory, "best_model.pkl"), os.path.join(directory, "preprocessor.pkl")
+    save_object(model_path, model)
+    save_object(preprocessor_path, preprocessor)
+
+    config = LookupTableConfig(model_path=model_path, preprocessor_path=preprocessor_path,
+                               table_path=os.path.join(directory, "prediction_table.npy"))
+    started = time.perf_counter()
+    LookupTableExporter(config).initiate_export()
+    export_seconds = time.perf_counter() - started
+
+    live = PredictionPipeline(model_path, preprocessor_path)
+    table = PredictionPipeline(model_path, preprocessor_path)
+    table.attach_lookup_table(LookupTable.load(config.table_path))
+
+    records = generate_student_data(n_records, random_state=1).drop(columns=[TARGET_COLUMN]).to_dict("records")
+    batch = generate_student_data(batch_rows, random_state=2).drop(columns=[TARGET_COLUMN])
+    np.testing.assert_allclose(table.predict(batch), live.predict(batch), rtol=1e-4, atol=1e-3)
+
+    result = {
+        "model": model_name,
+        "export_seconds": round(export_seconds, 2),
+        "table_mb": round(os.path.getsize(config.table_path) / 1e6, 1),
+        "live_record_us": round(per_call_us(live.predict_record, records, 3), 1),
+        "table_record_us": round(per_call_us(table.predict_record, records, 3), 1),
+    }
+    for name, pipeline in (("live", live), ("table", table)):
+        started = time.perf_counter()
+        pipeline.predict(batch)
+        result[f"{name}_batch_ms"] = round((time.perf_counter() - started) * 1e3, 1)
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20_000, help="Training rows")
+    parser.add_argument("--records", type=int, default=500, help="Single-record calls timed")
+    parser.add_argument("--batch-rows", type=int, default=10_000)
+    parser.add_argument("--models", nargs="*", default=DEFAULT_MODELS)
+    parser.add_argument("--output", help="Results JSON path")
+    args = parser.parse_args()
+
+    results = []
+    for model_name in args.models:
+        with tempfile.TemporaryDirectory() as directory:
+            row = run_case(directory, model_name, args.rows, args.records, args.batch_rows)
+        results.append(row)
+        print(f"{model_name:<22} export {row['export_seconds']:>6.1f}s {row['table_mb']:>5.1f} MB | record: live "
+              f"{row['live_record_us']:>8.1f} us  table {row['table_record_us']:>6.1f} us | batch of {args.batch_rows}: "
+              f"live {row['live_batch_ms']:>8.1f} ms  table {row['table_batch_ms']:>7.1f} ms")
+
+    payload = {"rows": args.rows, "records": args.records, "batch_rows": args.batch_rows, "cases": results}
+    print(f"Results written to {write_results('lookup_table', payload, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Retrain wall time: incremental (reuse preprocessor, continue the model) vs full retrain
+(refit preprocessor + candidate search), after appending a batch of newly labelled rows.
+
+    python -m benchmarks.bench_retrain --rows 50000 --new-rows 5000 --models XGBRegressor "CatBoosting Regressor"
+"""
+import os
+import argparse
+import tempfile
+
+from benchmarks.common import write_results
+from src.mlproject import tracking
+from src.mlproject.components.data_transformation import DataTransformation, DataTransformationConfig, TARGET_COLUMN
+from src.mlproject.components.model_monitoring import ModelMonitoring, RetrainConfig
+from src.mlproject.components.model_trainer import ModelTrainer, ModelTrainerConfig
+from src.mlproject.utils import generate_student_data, save_frame, save_object
+
+DEFAULT_MODELS = ["XGBRegressor", "CatBoosting Regressor", "Gradient Boosting", "Random Forest"]
+
+
+class _NoTracking:
+    def log_run(self, *args, **kwargs):
+        pass
+
+
+def run_case(directory, model_name, mode, rows, new_rows):
+    df = generate_student_data(rows + rows // 4)
+    train_path, test_path = os.path.join(directory, "train.parquet"), os.path.join(directory, "test.parquet")
+    save_frame(df.iloc[:rows], train_path)
+    save_frame(df.iloc[rows:], test_path)
+    new_path = os.path.join(directory, "new.parquet")
+    save_frame(generate_student_data(new_rows, random_state=1), new_path)
+
+    transformation_config = DataTransformationConfig(
+        preprocessor_obj_file_path=os.path.join(directory, "preprocessor.pkl"),
+        train_features_path=os.path.join(directory, "train_features"),
+        test_features_path=os.path.join(directory, "test_features"),
+        train_target_path=os.path.join(directory, "train_target.npy"),
+        test_target_path=os.path.join(directory, "test_target.npy"),
+    )
+    preprocessor = DataTransformation(transformation_config).get_data_transform_object()
+    X = preprocessor.fit_transform(df.iloc[:rows].drop(columns=[TARGET_COLUMN]))
+    _, params, model = next(c for c in ModelTrainer().get_candidate_models() if c[0] == model_name)
+    model.set_params(**params).fit(X, df.iloc[:rows][TARGET_COLUMN])
+    model_path = os.path.join(directory, "best_model.pkl")
+    save_object(model_path, model)
+    save_object(transformation_config.preprocessor_obj_file_path, preprocessor)
+
+    config = RetrainConfig(
+        train_data_path=train_path, test_data_path=test_path, mode=mode,
+        transformation_config=transformation_config,
+        trainer_config=ModelTrainerConfig(trained_model_file_path=model_path),
+    )
+    result = ModelMonitoring(model_path, transformation_config.preprocessor_obj_file_path).retrain_model(new_path, config)
+    return {"model": model_name, "mode": result["mode"], "strategy": result["strategy"],
+            "seconds": round(result["seconds"], 3), "r2": round(result["r2"], 4)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--new-rows", type=int, default=5_000)
+    parser.add_argument("--models", nargs="*", default=DEFAULT_MODELS)
+    parser.add_argument("--output", help="Results JSON path")
+    args = parser.parse_args()
+
+    tracking._tracker = _NoTracking()  # Time the retrain itself, not MLflow uploads
+    results = []
+    for model_name in args.models:
+        for mode in ("incremental", "full"):
+            with tempfile.TemporaryDirectory() as directory:
+                row = run_case(directory, model_name, mode, args.rows, args.new_rows)
+            results.append(row)
+            print(f"{model_name:<22} {row['mode']:<11} {row['strategy']:<16} {row['seconds']:>8.2f}s   R2 {row['r2']:.4f}")
+
+    payload = {"rows": args.rows, "new_rows": args.new_rows, "cases": results}
+    print(f"Results written to {write_results('retrain', payload, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
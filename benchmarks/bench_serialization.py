@@ -0,0 +1,102 @@
+"""
+Save time, file size, cold load time and RSS of the trained model artifact per serialization
+format (pickle, joblib, joblib compressed, XGBoost UBJ / CatBoost cbm) for every ModelTrainer
+candidate. Each load runs in a fresh interpreter, so the numbers match a server cold start.
+
+    python -m benchmarks.bench_serialization --rows 100000 --models "Random Forest" XGBRegressor
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+
+import numpy as np
+
+from benchmarks.common import make_training_arrays, write_results
+from src.mlproject.components.model_trainer import ModelTrainer
+from src.mlproject.serialization import NATIVE_EXTENSIONS
+from src.mlproject.utils import model_input, save_object
+
+FORMATS = [("pickle", 0), ("joblib", 0), ("joblib", 3), ("native", 0)]
+
+# Runs in a child process: libraries are imported before the clock starts, only the load is timed
+LOAD_SCRIPT = """
+import sys, json, time
+import numpy as np
+from src.mlproject.utils import load_object, model_input
+
+def rss_mb():
+    with open("/proc/self/status") as file_obj:
+        return next(int(line.split()[1]) for line in file_obj if line.startswith("VmRSS")) / 1024
+
+X = np.load(sys.argv[2])
+before = rss_mb()
+started = time.perf_counter()
+model = load_object(sys.argv[1])
+load_seconds = time.perf_counter() - started
+loaded = rss_mb()
+model.predict(model_input(model, X))  # Touches every memory-mapped page the model needs
+print(json.dumps({"load_seconds": load_seconds, "load_rss_mb": loaded - before, "rss_after_predict_mb": rss_mb() - before}))
+"""
+
+
+def payload_size(path):
+    with open(path, "rb") as file_obj:
+        if file_obj.read(1) != b"{":
+            return os.path.getsize(path)
+        file_obj.seek(0)
+        return json.load(file_obj)["size_bytes"]
+
+
+def cold_load(model_path, sample_path):
+    output = subprocess.check_output([sys.executable, "-c", LOAD_SCRIPT, model_path, sample_path], text=True)
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000, help="Training rows")
+    parser.add_argument("--models", nargs="*", help="Candidate names (default: all)")
+    parser.add_argument("--output", help="Results JSON path")
+    args = parser.parse_args()
+
+    X_train, y_train, X_test, _ = make_training_arrays(args.rows)
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        sample_path = os.path.join(tmp_dir, "sample.npy")
+        np.save(sample_path, X_test[:1000].toarray() if hasattr(X_test, "toarray") else X_test[:1000])
+
+        for model_name, params, model in ModelTrainer().get_candidate_models():
+            if args.models and model_name not in args.models:
+                continue
+            model.set_params(**params).fit(model_input(model, X_train), y_train)
+
+            for fmt, compress in FORMATS:
+                if fmt == "native" and type(model).__module__.split(".")[0] not in NATIVE_EXTENSIONS:
+                    continue
+                model_path = os.path.join(tmp_dir, model_name.replace(" ", "_"), "best_model.pkl")
+                started = time.perf_counter()
+                save_object(model_path, model, fmt=fmt, compress=compress)
+                save_seconds = time.perf_counter() - started
+
+                row = {
+                    "model": model_name,
+                    "format": f"{fmt} (compress={compress})" if compress else fmt,
+                    "save_seconds": round(save_seconds, 3),
+                    "size_mb": round(payload_size(model_path) / 2 ** 20, 2),
+                    **{k: round(v, 3) for k, v in cold_load(model_path, sample_path).items()},
+                }
+                results.append(row)
+                print(f"{row['model']:<22} {row['format']:<20} save {row['save_seconds']:>7.3f}s  "
+                      f"{row['size_mb']:>8.2f} MB  load {row['load_seconds']:>7.3f}s  "
+                      f"RSS +{row['load_rss_mb']:>7.1f} MB (+{row['rss_after_predict_mb']:>7.1f} MB after predict)")
+
+    print(f"Results written to {write_results('serialization', {'rows': args.rows, 'cases': results}, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+"""
+Latency and throughput of the prediction service on synthetic student records.
+
+  pipeline  PredictionPipeline.predict_record called in-process from N threads, plus a
+            per-phase split of one request: validate, preprocess, predict, monitor
+            (DriftMonitor.record of the served event).
+  wsgi      POST /predict against gunicorn (gunicorn.conf.py, wsgi:app) started here.
+  asgi      POST /predict against uvicorn (asgi:app) started here.
+  url       POST /predict against an already running server (--url).
+
+For every concurrency level the p50/p95/p99 latency and the throughput are reported.
+Results go to benchmarks/results/serving-<git sha>.json; --baseline prints the change
+against an earlier results file, so commits can be compared.
+
+    python -m benchmarks.bench_serving --targets pipeline asgi --concurrency 1 8 32 --requests 2000
+    python -m benchmarks.bench_serving --baseline benchmarks/results/serving-<sha>.json
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import threading
+import subprocess
+import http.client
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.common import train_serving_artifacts, write_results
+from src.mlproject.components.data_transformation import TARGET_COLUMN
+from src.mlproject.components.drift_monitor import DriftMonitor
+from src.mlproject.pipelines.prediction_pipeline import PredictionPipeline, validate_record
+from src.mlproject.utils import generate_student_data
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PERCENTILES = (50, 95, 99)
+
+
+def synthetic_records(n, random_state=1):
+    """Raw /predict payloads with the same distribution as the training data (JSON-safe types)."""
+    df = generate_student_data(n, random_state=random_state).drop(columns=[TARGET_COLUMN])
+    return json.loads(df.to_json(orient="records"))
+
+
+def summarize(latencies, wall_seconds, errors):
+    latencies_ms = np.asarray(latencies) * 1e3
+    summary = {f"p{p}_ms": round(float(np.percentile(latencies_ms, p)), 3) for p in PERCENTILES}
+    summary.update({
+        "mean_ms": round(float(latencies_ms.mean()), 3),
+        "throughput_rps": round(len(latencies) / wall_seconds, 1),
+        "requests": len(latencies),
+        "errors": errors,
+    })
+    return summary
+
+
+def drive(call, records, concurrency):
+    """Send every record through `call` from `concurrency` threads; failed requests are counted by error, not timed."""
+    latencies, errors = [], {}
+    lock = threading.Lock()
+    chunks = [records[i::concurrency] for i in range(concurrency)]
+
+    def worker(chunk):
+        state = {}  # Per-thread state, e.g. a keep-alive HTTP connection
+        own = []
+        for record in chunk:
+            started = time.perf_counter()
+            try:
+                call(record, state)
+            except Exception as e:
+                with lock:
+                    errors[str(e)] = errors.get(str(e), 0) + 1
+                continue
+            own.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(own)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, chunks))
+    return summarize(latencies, time.perf_counter() - started, errors)
+
+
+def phase_split(pipeline, monitor, records):
+    """Mean/p95 time per phase of one request, measured on the serving code path."""
+    timings = {"validate": [], "preprocess": [], "predict": [], "monitor": []}
+    for record in records:
+        t0 = time.perf_counter()
+        validate_record(record)
+        t1 = time.perf_counter()
+        if pipeline.compiled_preprocessor is not None:
+            features = pipeline.compiled_preprocessor.transform_record(record).reshape(1, -1)
+        else:
+            features = pipeline.preprocessor.transform(pd.DataFrame([record]))
+        t2 = time.perf_counter()
+        prediction = pipeline.model.predict(features)
+        t3 = time.perf_counter()
+        monitor.record([record], prediction, [np.nan])
+        t4 = time.perf_counter()
+        for phase, seconds in zip(timings, (t1 - t0, t2 - t1, t3 - t2, t4 - t3)):
+            timings[phase].append(seconds * 1e3)
+
+    total = sum(np.mean(values) for values in timings.values())
+    return {
+        phase: {
+            "mean_ms": round(float(np.mean(values)), 4),
+            "p95_ms": round(float(np.percentile(values, 95)), 4),
+            "share": round(float(np.mean(values) / total), 3),
+        }
+        for phase, values in timings.items()
+    }
+
+
+def http_call(address):
+    """POST /predict over one keep-alive connection per thread; `address` is "host:port" or a port."""
+    host, port = address.rsplit(":", 1) if isinstance(address, str) and ":" in address else ("127.0.0.1", address)
+
+    def call(record, state):
+        connection = state.get("connection")
+        if connection is None:
+            connection = state["connection"] = http.client.HTTPConnection(host, int(port), timeout=30)
+        connection.request("POST", "/predict", body=json.dumps(record), headers={"Content-Type": "application/json"})
+        response = connection.getresponse()
+        response.read()
+        if response.status != 200:
+            raise RuntimeError(f"HTTP {response.status}")
+    return call
+
+
+def start_server(target, directory, port, workers):
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT, PORT=str(port), WEB_CONCURRENCY=str(workers),
+               MONITOR_INTERVAL_SECONDS="0", PREDICTION_CACHE_SIZE="0")
+    if target == "wsgi":
+        command = [sys.executable, "-m", "gunicorn", "-c", os.path.join(REPO_ROOT, "gunicorn.conf.py"), "wsgi:app"]
+    else:
+        command = [sys.executable, "-m", "uvicorn", "asgi:app", "--port", str(port), "--workers", str(workers),
+                   "--log-level", "warning"]
+    server = subprocess.Popen(command, cwd=directory, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    deadline = time.monotonic() + 300
+    while True:
+        try:
+            http_call(port)(synthetic_records(1)[0], {})
+            return server
+        except (OSError, RuntimeError):
+            if time.monotonic() > deadline or server.poll() is not None:
+                server.kill()
+                raise RuntimeError(f"{target} server did not start")
+            time.sleep(0.5)
+
+
+def print_comparison(results, baseline_path):
+    with open(baseline_path) as file_obj:
+        baseline = json.load(file_obj)
+    previous = {(r["target"], r["concurrency"]): r for r in baseline["results"]["runs"]}
+    print(f"\nChange vs {baseline['git_revision']} ({baseline_path}):")
+    for run in results["runs"]:
+        before = previous.get((run["target"], run["concurrency"]))
+        if before is None:
+            continue
+        deltas = "  ".join(
+            f"{key} {100 * (run[key] - before[key]) / before[key]:+.1f}%"
+            for key in ("p50_ms", "p99_ms", "throughput_rps") if before[key]
+        )
+        print(f"  {run['target']:<8} c={run['concurrency']:<4} {deltas}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--targets", nargs="*", default=["pipeline", "wsgi", "asgi"],
+                        choices=["pipeline", "wsgi", "asgi", "url"])
+    parser.add_argument("--url", default="http://127.0.0.1:8080", help="Server for the 'url' target")
+    parser.add_argument("--concurrency", type=int, nargs="*", default=[1, 8, 32])
+    parser.add_argument("--requests", type=int, default=2000, help="Requests per concurrency level")
+    parser.add_argument("--model", default="Random Forest", help="ModelTrainer candidate to serve")
+    parser.add_argument("--rows", type=int, default=20_000, help="Training rows")
+    parser.add_argument("--workers", type=int, default=1, help="Server processes for wsgi/asgi")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--baseline", help="Earlier results JSON to compare against")
+    parser.add_argument("--output", help="Results JSON path")
+    args = parser.parse_args()
+
+    records = synthetic_records(args.requests)
+    results = {"model": args.model, "rows": args.rows, "requests": args.requests, "workers": args.workers, "runs": []}
+
+    with tempfile.TemporaryDirectory() as directory:
+        model_path, preprocessor_path, train_df = train_serving_artifacts(directory, args.model, args.rows)
+        pipeline = PredictionPipeline(model_path, preprocessor_path)
+        monitor = DriftMonitor.from_reference_frame(train_df)
+        results["phases"] = phase_split(pipeline, monitor, records[:500])
+        print("Phase split of one request: " + "  ".join(
+            f"{phase} {row['mean_ms']:.3f} ms ({row['share']:.0%})" for phase, row in results["phases"].items()
+        ))
+
+        for target in args.targets:
+            server = None
+            if target == "pipeline":
+                call = lambda record, state: pipeline.predict_record(record)
+            elif target == "url":
+                call = http_call(args.url.rsplit("/", 1)[-1])
+            else:
+                server = start_server(target, directory, args.port, args.workers)
+                call = http_call(args.port)
+            try:
+                drive(call, records[:min(200, len(records))], 1)  # Warm-up
+                for concurrency in args.concurrency:
+                    run = {"target": target, "concurrency": concurrency, **drive(call, records, concurrency)}
+                    results["runs"].append(run)
+                    print(f"{target:<8} c={concurrency:<4} p50 {run['p50_ms']:>8.2f} ms  p95 {run['p95_ms']:>8.2f} ms  "
+                          f"p99 {run['p99_ms']:>8.2f} ms  {run['throughput_rps']:>8.1f} req/s  errors {run['errors'] or 0}")
+            finally:
+                if server is not None:
+                    server.terminate()
+                    server.wait(timeout=60)
+
+    print(f"Results written to {write_results('serving', results, args.output)}")
+    if args.baseline:
+        print_comparison(results, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Peak memory and training time with a high-cardinality categorical feature set: the old dense
+path (toarray + np.c_[X, y] + slicing) vs keeping the preprocessor's CSR output end to end.
+Each case runs in a fresh process so peak RSS is measured per case.
+
+    python -m benchmarks.bench_sparse --rows 50000 --cardinality 2000 500
+"""
+import time
+import argparse
+import resource
+import multiprocessing
+
+import numpy as np
+
+from benchmarks.common import write_results
+from src.mlproject.components.data_transformation import DataTransformation, CATEGORICAL_COLUMNS, TARGET_COLUMN
+from src.mlproject.components.model_trainer import ModelTrainer
+from src.mlproject.utils import generate_student_data, model_input
+
+DEFAULT_MODELS = ["Linear Regression", "Decision Tree", "XGBRegressor", "CatBoosting Regressor"]
+
+
+def make_high_cardinality_frame(n_rows, cardinalities, random_state=0):
+    """Synthetic students plus extra categorical id-like columns with the given cardinalities."""
+    df = generate_student_data(n_rows, random_state=random_state)
+    rng = np.random.default_rng(random_state)
+    extra_columns = []
+    for i, cardinality in enumerate(cardinalities):
+        column = f"category_{i}"
+        df[column] = np.char.add("c", rng.integers(0, cardinality, n_rows).astype(str)).astype(object)
+        extra_columns.append(column)
+    return df, extra_columns
+
+
+def run_case(mode, model_name, rows, cardinalities):
+    df, extra_columns = make_high_cardinality_frame(rows, cardinalities)
+    preprocessor = DataTransformation().get_data_transform_object(categorical_columns=CATEGORICAL_COLUMNS + extra_columns)
+
+    started = time.perf_counter()
+    X = preprocessor.fit_transform(df.drop(columns=[TARGET_COLUMN]))
+    y = df[TARGET_COLUMN].to_numpy(dtype=np.float64)
+    if mode == "dense":
+        # What the pipeline used to do: one dense array with the target glued on, then sliced
+        array = np.c_[X.toarray() if hasattr(X, "toarray") else X, y]
+        X, y = array[:, :-1], array[:, -1]
+    transform_seconds = time.perf_counter() - started
+
+    _, params, model = next(candidate for candidate in ModelTrainer().get_candidate_models() if candidate[0] == model_name)
+    model.set_params(**params)
+    started = time.perf_counter()
+    model.fit(model_input(model, X), y)
+    fit_seconds = time.perf_counter() - started
+
+    return {
+        "mode": mode,
+        "model": model_name,
+        "n_features": X.shape[1],
+        "transform_seconds": round(transform_seconds, 3),
+        "fit_seconds": round(fit_seconds, 3),
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--cardinality", type=int, nargs="*", default=[2000, 500])
+    parser.add_argument("--models", nargs="*", default=DEFAULT_MODELS)
+    parser.add_argument("--output", help="Results JSON path")
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for model_name in args.models:
+        for mode in ("dense", "sparse"):
+            with context.Pool(1) as pool:
+                row = pool.apply(run_case, (mode, model_name, args.rows, args.cardinality))
+            results.append(row)
+            print(f"{model_name:<22} {mode:<6} features={row['n_features']:<6} transform {row['transform_seconds']:>7.2f}s   "
+                  f"fit {row['fit_seconds']:>7.2f}s   peak RSS {row['peak_rss_mb']:>8.1f} MB")
+
+    payload = {"rows": args.rows, "cardinality": args.cardinality, "cases": results}
+    print(f"Results written to {write_results('sparse', payload, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
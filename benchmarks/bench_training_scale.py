@@ -0,0 +1,171 @@
+"""
+Scaling report of the training pipeline on synthetic student datasets (same schema as stud.csv).
+
+For every size the stages run in the order of run_training_pipeline, each in its own
+process so its peak RSS is measured in isolation:
+
+  generate        write the source CSV (in 1M-row chunks)
+  ingestion       DataIngestion: source CSV -> raw/train/test artifacts
+  transformation  DataTransformation: fit the preprocessor, write the feature arrays
+  <candidate>     train_candidate for each ModelTrainer candidate (fit + test-set eval)
+
+Sizes at or above --stream-above use the chunked ingestion/transformation paths.
+A candidate that exceeds --candidate-timeout is reported as "timeout", which is itself
+the answer to "does it still scale". Each row has wall time, rows/s, peak RSS and the
+scaling exponent vs the previous size (1.0 = linear, 2.0 = quadratic).
+
+    python -m benchmarks.bench_training_scale --sizes 10000 100000 1000000 10000000
+    python -m benchmarks.bench_training_scale --sizes 1000000 --models "Linear Regression" XGBRegressor
+"""
+import os
+import sys
+import json
+import math
+import glob
+import time
+import argparse
+import resource
+import tempfile
+import subprocess
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GENERATE_CHUNK_ROWS = 1_000_000
+
+
+def rss_mb():
+    with open("/proc/self/status") as file_obj:
+        return next(int(line.split()[1]) for line in file_obj if line.startswith("VmRSS")) / 1024
+
+
+def run_stage(stage, rows, stream, candidate=None):
+    """Child process body: run one stage in the current directory, return its measurements."""
+    # Imported here so the parent process stays small and every stage pays the same import cost
+    from src.mlproject.utils import generate_student_data, load_features
+    from src.mlproject.components.data_ingestion import DataIngestion, DataIngestionConfig
+    from src.mlproject.components.data_transformation import DataTransformation, DataTransformationConfig
+    from src.mlproject.components.model_trainer import ModelTrainer, train_candidate
+    import numpy as np
+
+    chunk_size = GENERATE_CHUNK_ROWS if stream else None
+    baseline = rss_mb()
+    started = time.perf_counter()
+    result = {}
+
+    if stage == "generate":
+        for i, start in enumerate(range(0, rows, GENERATE_CHUNK_ROWS)):
+            generate_student_data(min(GENERATE_CHUNK_ROWS, rows - start), random_state=i).to_csv(
+                "source.csv", mode="w" if i == 0 else "a", header=i == 0, index=False
+            )
+        result["size_mb"] = os.path.getsize("source.csv") / 2 ** 20
+
+    elif stage == "ingestion":
+        DataIngestion(DataIngestionConfig(source_data_path="source.csv", chunk_size=chunk_size)).initiate_data_ingestion()
+
+    elif stage == "transformation":
+        ingestion = DataIngestionConfig()
+        transformation = DataTransformation(DataTransformationConfig(chunk_size=chunk_size))
+        transformation.initiate_data_transformation(ingestion.train_data_path, ingestion.test_data_path)
+
+    else:
+        config = DataTransformationConfig()
+        X_train = load_features(glob.glob(f"{config.train_features_path}.np[yz]")[0])
+        X_test = load_features(glob.glob(f"{config.test_features_path}.np[yz]")[0])
+        y_train, y_test = np.load(config.train_target_path), np.load(config.test_target_path)
+        _, params, model = next(c for c in ModelTrainer().get_candidate_models() if c[0] == candidate)
+        fitted = train_candidate(candidate, params, model, X_train, y_train, X_test, y_test, n_threads=os.cpu_count())
+        result["r2"] = round(float(fitted["r2"]), 4)
+
+    result["seconds"] = time.perf_counter() - started
+    result["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    result["stage_rss_mb"] = result["peak_rss_mb"] - baseline  # Above the interpreter + imports
+    return result
+
+
+def spawn(stage, directory, rows, stream, timeout, candidate=None):
+    command = [sys.executable, "-m", "benchmarks.bench_training_scale", "--child", stage,
+               "--sizes", str(rows)] + (["--stream-above", "0"] if stream else []) + \
+              (["--models", candidate] if candidate else [])
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+    try:
+        completed = subprocess.run(command, cwd=directory, env=env, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {"status": "timeout"}
+    if completed.returncode != 0:
+        # e.g. -9 when the kernel's OOM killer stepped in
+        return {"status": f"failed ({completed.returncode})", "error": completed.stderr.strip().splitlines()[-1:]}
+    return {"status": "ok", **json.loads(completed.stdout.strip().splitlines()[-1])}
+
+
+def add_scaling(rows_by_key):
+    """Annotate each measurement with its scaling exponent vs the same stage at the previous size."""
+    for runs in rows_by_key.values():
+        previous = None
+        for run in runs:
+            if previous and run["status"] == "ok" and previous["status"] == "ok" and previous["seconds"] > 0:
+                run["scaling_exponent"] = round(
+                    math.log(run["seconds"] / previous["seconds"]) / math.log(run["rows"] / previous["rows"]), 2
+                )
+            previous = run
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="*", default=[10_000, 100_000, 1_000_000, 10_000_000])
+    parser.add_argument("--models", nargs="*", help="Candidate names (default: all seven)")
+    parser.add_argument("--stream-above", type=int, default=1_000_000,
+                        help="Use chunked ingestion/transformation from this many rows on")
+    parser.add_argument("--candidate-timeout", type=float, default=1800, help="Seconds per candidate and size")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    parser.add_argument("--output", help="Results JSON path")
+    args = parser.parse_args()
+
+    if args.child:
+        rows = args.sizes[0]
+        result = run_stage(args.child, rows, rows >= args.stream_above, args.models[0] if args.models else None)
+        print(json.dumps(result))
+        return
+
+    from benchmarks.common import write_results
+    from src.mlproject.components.model_trainer import ModelTrainer
+
+    candidates = [name for name, _, _ in ModelTrainer().get_candidate_models() if not args.models or name in args.models]
+    stages = [("generate", None), ("ingestion", None), ("transformation", None)] + [(name, name) for name in candidates]
+    runs = []
+
+    for rows in args.sizes:
+        stream = rows >= args.stream_above
+        with tempfile.TemporaryDirectory() as directory:
+            for stage, candidate in stages:
+                timeout = args.candidate_timeout if candidate else None
+                run = {"rows": rows, "stage": stage, "streaming": stream,
+                       **spawn("candidate" if candidate else stage, directory, rows, stream, timeout, candidate)}
+                if run["status"] == "ok":
+                    run["rows_per_second"] = round(rows / run["seconds"], 1)
+                runs.append(run)
+                if stage in ("generate", "ingestion", "transformation") and run["status"] != "ok":
+                    print(f"{rows:>10,} {stage:<22} {run['status']}, skipping the remaining stages for this size")
+                    break
+
+                if run["status"] == "ok":
+                    print(f"{rows:>10,} {stage:<22} {run['seconds']:>9.2f}s  {run['rows_per_second']:>12,.0f} rows/s  "
+                          f"peak RSS {run['peak_rss_mb']:>8.1f} MB (+{run['stage_rss_mb']:>7.1f})"
+                          + (f"  R2 {run['r2']:.3f}" if "r2" in run else ""))
+                else:
+                    print(f"{rows:>10,} {stage:<22} {run['status']}")
+
+    by_stage = {}
+    for run in runs:
+        by_stage.setdefault(run["stage"], []).append(run)
+    add_scaling(by_stage)
+
+    print("\nScaling exponent per 10x rows (1.0 = linear):")
+    for stage, stage_runs in by_stage.items():
+        exponents = "  ".join(f"{r['rows']:,}: {r['scaling_exponent']:.2f}" for r in stage_runs if "scaling_exponent" in r)
+        print(f"  {stage:<22} {exponents or '-'}")
+
+    payload = {"sizes": args.sizes, "stream_above": args.stream_above, "cpu_count": os.cpu_count(), "runs": runs}
+    print(f"Results written to {write_results('training_scale', payload, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
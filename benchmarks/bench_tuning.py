@@ -0,0 +1,62 @@
+"""
+Time-to-best-model: exhaustive GridSearchCV (utils.evaluate_models) vs successive halving (ModelTuner).
+
+    python -m benchmarks.bench_tuning --rows 5000 --models "Random Forest" XGBRegressor
+"""
+import argparse
+import time
+
+from sklearn.base import clone
+from sklearn.metrics import r2_score
+
+from benchmarks.common import make_training_arrays, write_results
+from src.mlproject.components.model_trainer import ModelTrainer, THREAD_PARAMS
+from src.mlproject.components.model_tuner import ModelTuner, ModelTunerConfig, PARAM_SPACES
+from src.mlproject.utils import evaluate_models
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--models", nargs="*", help="Candidate names (default: all with a search space)")
+    parser.add_argument("--n-jobs", type=int, default=-1)
+    parser.add_argument("--output", help="Results JSON path")
+    args = parser.parse_args()
+
+    X_train, y_train, X_test, y_test = make_training_arrays(args.rows)
+    tuner = ModelTuner(ModelTunerConfig(n_jobs=args.n_jobs))
+    results = []
+
+    for model_name, params, model in ModelTrainer().get_candidate_models():
+        if not PARAM_SPACES.get(model_name) or (args.models and model_name not in args.models):
+            continue
+        model.set_params(**params)
+        thread_param = THREAD_PARAMS.get(type(model))
+        if thread_param is not None:
+            model.set_params(**{thread_param: 1})
+
+        started = time.perf_counter()
+        grid_r2 = evaluate_models(X_train, y_train, X_test, y_test, {model_name: clone(model)},
+                                  {model_name: PARAM_SPACES[model_name]}, n_jobs=args.n_jobs)[model_name]
+        grid_seconds = time.perf_counter() - started
+
+        best, _, halving_seconds = tuner.tune(model_name, clone(model), X_train, y_train)
+        halving_r2 = r2_score(y_test, best.predict(X_test))
+
+        row = {
+            "model": model_name,
+            "grid_seconds": round(grid_seconds, 3),
+            "grid_test_r2": round(grid_r2, 4),
+            "halving_seconds": round(halving_seconds, 3),
+            "halving_test_r2": round(halving_r2, 4),
+            "speedup": round(grid_seconds / halving_seconds, 2),
+        }
+        results.append(row)
+        print(f"{model_name:<24} grid {row['grid_seconds']:>8.2f}s r2={row['grid_test_r2']:.4f}   "
+              f"halving {row['halving_seconds']:>7.2f}s r2={row['halving_test_r2']:.4f}   x{row['speedup']}")
+
+    print(f"Results written to {write_results('tuning', {'rows': args.rows, 'models': results}, args.output)}")
+
+
+if __name__ == "__main__":
+    main()
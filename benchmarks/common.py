@@ -0,0 +1,64 @@
+import os
+import json
+import platform
+import subprocess
+from datetime import datetime, timezone
+
+from src.mlproject.components.data_transformation import DataTransformation, TARGET_COLUMN
+from src.mlproject.utils import generate_student_data, save_object
+
+RESULTS_DIR = os.path.join("benchmarks", "results")
+
+
+def make_training_arrays(n_rows, test_size=0.2, random_state=0):
+    """Synthetic students -> fitted preprocessor -> (X_train, y_train, X_test, y_test)."""
+    df = generate_student_data(n_rows, random_state=random_state)
+    split = int(n_rows * (1 - test_size))
+    train_df, test_df = df.iloc[:split], df.iloc[split:]
+
+    preprocessor = DataTransformation().get_data_transform_object()
+    X_train = preprocessor.fit_transform(train_df.drop(columns=[TARGET_COLUMN]))
+    X_test = preprocessor.transform(test_df.drop(columns=[TARGET_COLUMN]))
+    return X_train, train_df[TARGET_COLUMN].to_numpy(), X_test, test_df[TARGET_COLUMN].to_numpy()
+
+
+def train_serving_artifacts(directory, model_name="Random Forest", n_rows=20_000, fmt="auto"):
+    """Fit one ModelTrainer candidate and save <directory>/artifacts/{best_model,preprocessor}.pkl as app.py expects."""
+    from src.mlproject.components.model_trainer import ModelTrainer
+
+    df = generate_student_data(n_rows)
+    preprocessor = DataTransformation().get_data_transform_object()
+    X = preprocessor.fit_transform(df.drop(columns=[TARGET_COLUMN]))
+    _, params, model = next(c for c in ModelTrainer().get_candidate_models() if c[0] == model_name)
+    model.set_params(**params).fit(X, df[TARGET_COLUMN])
+
+    model_path = os.path.join(directory, "artifacts", "best_model.pkl")
+    preprocessor_path = os.path.join(directory, "artifacts", "preprocessor.pkl")
+    save_object(model_path, model, fmt=fmt)
+    save_object(preprocessor_path, preprocessor)
+    return model_path, preprocessor_path, df
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except Exception:
+        return "unknown"
+
+
+def write_results(name, results, output=None):
+    """Save results as JSON (benchmarks/results/<name>-<git sha>.json by default) and return the path."""
+    output = output or os.path.join(RESULTS_DIR, f"{name}-{git_revision()}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    payload = {
+        "benchmark": name,
+        "git_revision": git_revision(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+    with open(output, "w") as file_obj:
+        json.dump(payload, file_obj, indent=2, default=float)
+    return output
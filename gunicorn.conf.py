@@ -0,0 +1,125 @@
+"""
+Production serving:  gunicorn -c gunicorn.conf.py wsgi:app
+
+With preload_app the master imports app.py, so the model, preprocessor and lookup
+table are loaded once and inherited by every worker through fork(). Their NumPy
+buffers stay shared copy-on-write pages (memory-mapped .npy/joblib payloads are
+shared through the page cache), instead of one private copy per worker.
+
+When a worker's ModelRegistry notices new artifacts it reloads them for itself and
+asks the master (SIGHUP, once per version) to preload them too; the master then
+forks a fresh set of workers that share the new model and retires the old ones
+gracefully, without a restart or dropped requests.
+
+Monitoring, drift tracking and retraining must not run once per worker: the master
+starts one monitoring sidecar (src.mlproject.components.monitoring_service) and the
+workers forward /monitor requests to it (MONITOR_SERVICE_URL).
+"""
+import os
+import gc
+import sys
+import signal
+import hashlib
+import tempfile
+import subprocess
+
+bind = f"0.0.0.0:{os.getenv('PORT', '8080')}"
+workers = int(os.getenv("WEB_CONCURRENCY", "4"))
+threads = int(os.getenv("GUNICORN_THREADS", "1"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+preload_app = os.getenv("GUNICORN_PRELOAD", "1") == "1"
+
+if preload_app:
+    # Monitoring / micro-batching threads are started per worker in post_fork, never in the master
+    os.environ["DEFER_BACKGROUND_SERVICES"] = "1"
+    # No collections in the master: they write to every tracked object's header and un-share its page
+    gc.disable()
+
+# An externally run service (MONITOR_SERVICE_URL, e.g. its own container) is used as is
+monitor_sidecar = not os.getenv("MONITOR_SERVICE_URL")
+if monitor_sidecar:
+    monitor_service_port = int(os.getenv("MONITOR_SERVICE_PORT", "9090"))
+    os.environ["MONITOR_SERVICE_URL"] = f"http://127.0.0.1:{monitor_service_port}"  # Read by app.py in every worker
+_sidecar = None
+
+
+def _reload_marker(master_pid, version):
+    digest = hashlib.sha1(repr(version).encode("utf-8")).hexdigest()[:16]
+    return os.path.join(tempfile.gettempdir(), f"gunicorn-{master_pid}-reload-{digest}")
+
+
+def _request_master_reload(worker, preloaded_version, version):
+    """Reload listener in a worker: ask the master to preload `version`, once across all workers."""
+    if version is None or version == preloaded_version:
+        return
+    try:
+        os.close(os.open(_reload_marker(worker.ppid, version), os.O_CREAT | os.O_EXCL))
+    except FileExistsError:
+        return  # Another worker already asked for this version
+    worker.log.info(f"Artifacts changed, asking master {worker.ppid} to preload version {version}")
+    os.kill(worker.ppid, signal.SIGHUP)
+
+
+def _start_sidecar(server):
+    global _sidecar
+    if _sidecar is not None and _sidecar.poll() is None:
+        return
+    # A fresh interpreter rather than a fork of the master, whose threads and model it does not need
+    _sidecar = subprocess.Popen([
+        sys.executable, "-m", "src.mlproject.components.monitoring_service", "--port", str(monitor_service_port),
+    ])
+    server.log.info(f"Started monitoring sidecar (pid {_sidecar.pid}) on port {monitor_service_port}")
+
+
+def when_ready(server):
+    if monitor_sidecar:
+        _start_sidecar(server)
+
+
+def pre_fork(server, worker):
+    if preload_app:
+        gc.freeze()  # Everything loaded so far goes to the permanent generation, untouched by the child's GC
+
+
+def post_fork(server, worker):
+    if not preload_app:
+        return
+    gc.enable()
+
+    from app import registry, start_background_services
+    start_background_services()
+    preloaded_version = registry.version
+    registry.add_reload_listener(lambda pipeline, version: _request_master_reload(worker, preloaded_version, version))
+
+
+def on_reload(server):
+    """SIGHUP: load the current artifacts in the master before the new workers are forked."""
+    if monitor_sidecar:
+        _start_sidecar(server)  # Restarted here if it died
+    if not preload_app:
+        return
+    from app import registry
+    try:
+        registry.reload()
+        gc.collect()  # Drop the previous model before it is frozen into the new workers
+    except Exception as e:
+        server.log.error(f"Master could not preload the new model, workers will load it themselves: {str(e)}")
+
+
+def on_exit(server):
+    if _sidecar is not None and _sidecar.poll() is None:
+        _sidecar.terminate()
+        try:
+            _sidecar.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            _sidecar.kill()
+    for name in os.listdir(tempfile.gettempdir()):
+        if name.startswith(f"gunicorn-{server.pid}-reload-"):
+            os.remove(os.path.join(tempfile.gettempdir(), name))
+
+
+def worker_exit(server, worker):
+    # Workers end with os._exit, which skips atexit: write out the records still queued
+    from src.mlproject import logger as mlproject_logger
+    mlproject_logger.stop()
@@ -0,0 +1,114 @@
+import math
+import numpy as np
+from sklearn.compose import ColumnTransformer
+from sklearn.impute import SimpleImputer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+
+def _is_missing(value):
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+
+def _scaler_vectors(scaler, n_columns):
+    """Fuse a fitted StandardScaler into out = x * mul + add."""
+    if scaler is None:
+        return np.ones(n_columns), np.zeros(n_columns)
+    mean = scaler.mean_ if scaler.with_mean else np.zeros(n_columns)
+    scale = scaler.scale_ if scaler.with_std else np.ones(n_columns)
+    mul = 1.0 / np.asarray(scale, dtype=float)
+    return mul, -np.asarray(mean, dtype=float) * mul
+
+
+class CompiledPreprocessor:
+    """
+    Flat NumPy lowering of the fitted ColumnTransformer built by
+    DataTransformation.get_data_transform_object.
+
+    Maps a raw record dict straight to the feature vector using imputation
+    constants, category -> output column lookups and fused scale/offset
+    vectors, without building a DataFrame.
+    """
+
+    def __init__(self, n_features, numeric, categorical, base):
+        self.n_features = n_features
+        self._numeric = numeric  # [(column, fill, out_index, mul, add)]
+        self._categorical = categorical  # [(column, fill, {category: out_index}, {out_index: hot_delta}, handle_unknown)]
+        self._base = base  # Output for an all-zero one-hot row
+
+    @classmethod
+    def compile(cls, preprocessor: ColumnTransformer) -> "CompiledPreprocessor":
+        """Lower a fitted preprocessor. Raises ValueError for pipeline shapes it does not support."""
+        if not isinstance(preprocessor, ColumnTransformer) or not hasattr(preprocessor, "transformers_"):
+            raise ValueError("Expected a fitted ColumnTransformer.")
+
+        numeric, categorical, base = [], [], []
+        offset = 0
+
+        for name, transformer, columns in preprocessor.transformers_:
+            if isinstance(transformer, str):
+                if transformer == "drop" or len(columns) == 0:
+                    continue
+                raise ValueError(f"Unsupported transformer '{name}': {transformer}")
+            if not isinstance(transformer, Pipeline):
+                raise ValueError(f"Unsupported transformer '{name}'.")
+
+            steps = dict(transformer.steps)
+            imputer = steps.get("imputer")
+            encoder = steps.get("one_hot_encoder")
+            scaler = steps.get("scaler")
+            if not isinstance(imputer, SimpleImputer) or (scaler is not None and not isinstance(scaler, StandardScaler)):
+                raise ValueError(f"Unsupported steps in '{name}': {list(steps)}")
+
+            if encoder is None:
+                mul, add = _scaler_vectors(scaler, len(columns))
+                for i, column in enumerate(columns):
+                    numeric.append((column, float(imputer.statistics_[i]), offset + i, mul[i], add[i]))
+                base.extend([0.0] * len(columns))
+                offset += len(columns)
+                continue
+
+            if not isinstance(encoder, OneHotEncoder) or encoder.drop_idx_ is not None \
+                    or getattr(encoder, "_infrequent_enabled", False):
+                raise ValueError(f"Unsupported encoder in '{name}'.")
+
+            n_out = sum(len(categories) for categories in encoder.categories_)
+            mul, add = _scaler_vectors(scaler, n_out)
+            base.extend(add)
+
+            position = 0
+            for i, column in enumerate(columns):
+                lookup, deltas = {}, {}
+                for category in encoder.categories_[i]:
+                    lookup[category] = offset + position
+                    deltas[offset + position] = mul[position]
+                    position += 1
+                categorical.append((column, imputer.statistics_[i], lookup, deltas, encoder.handle_unknown))
+            offset += n_out
+
+        return cls(offset, numeric, categorical, np.asarray(base, dtype=float))
+
+    def transform_record(self, record: dict) -> np.ndarray:
+        """Return the 1-D feature vector for one raw record."""
+        out = self._base.copy()
+
+        for column, fill, index, mul, add in self._numeric:
+            value = record.get(column)
+            out[index] = (fill if _is_missing(value) else float(value)) * mul + add
+
+        for column, fill, lookup, deltas, handle_unknown in self._categorical:
+            value = record.get(column)
+            if _is_missing(value):
+                value = fill
+            index = lookup.get(value)
+            if index is None:
+                if handle_unknown == "error":
+                    raise ValueError(f"Found unknown category {value!r} in column '{column}'.")
+                continue  # handle_unknown='ignore' encodes an unseen category as all zeros
+            out[index] += deltas[index]
+
+        return out
+
+    def transform_records(self, records) -> np.ndarray:
+        """Return a 2-D feature matrix for an iterable of raw records."""
+        return np.vstack([self.transform_record(record) for record in records])
@@ -1,52 +1,160 @@
 import os
 import sys
 import pandas as pd
-from dataclasses import dataclass
+from contextlib import ExitStack
+from dataclasses import dataclass, replace
 from sklearn.model_selection import train_test_split
 
 from src.mlproject.logger import logger
 from src.mlproject.exception import CustomException
+from src.mlproject.components.data_transformation import TARGET_COLUMN, NUMERICAL_COLUMNS, CATEGORICAL_COLUMNS
+from src.mlproject.components.sql_source import SQLSource, SQLSourceConfig
+from src.mlproject.utils import ARTIFACT_FORMATS, FrameWriter, save_frame, load_frame, iter_frame_chunks
+
+# Fixed dtypes for streamed chunks, so every chunk (and every output file) has the same schema
+STREAMING_DTYPES = {
+    **{column: "float64" for column in NUMERICAL_COLUMNS + [TARGET_COLUMN]},
+    **{column: "object" for column in CATEGORICAL_COLUMNS},
+}
+
+
+def hash_split(df, test_size=0.2, seed=42):
+    """
+    Boolean mask of the rows that go to the test set. A row's side depends only on its
+    content and the seed, so the split is identical for any chunking or row order.
+    """
+    hashes = pd.util.hash_pandas_object(df, index=False, hash_key=f"{seed:016d}"[-16:])
+    return (hashes.to_numpy() % 10_000) < int(test_size * 10_000)
+
 
 
 @dataclass
 class DataIngestionConfig:
-    train_data_path: str = os.path.join("artifacts", "train.csv")
-    test_data_path: str = os.path.join("artifacts", "test.csv")
-    raw_data_path: str = os.path.join("artifacts", "raw.csv")
+    train_data_path: str = None  # Defaults to artifacts/train.<artifact_format>
+    test_data_path: str = None
+    raw_data_path: str = None
+    source_data_path: str = os.path.join("notebooks", "data", "stud.csv")
+    artifact_format: str = "parquet"  # "parquet", "feather" or "csv"
+    export_csv: bool = True  # Also write raw/train/test .csv copies, so the DVC-tracked artifacts/*.csv stay current
+    source: str = "file"  # "file" (source_data_path) or "mysql" (read through SQLSource, see sql_config)
+    sql_config: SQLSourceConfig = None  # Table, pool, partitioning and watermark settings for source="mysql"
+    chunk_size: int = None  # Stream the source in chunks of this many rows instead of loading it whole
+    test_size: float = 0.2
+    random_state: int = 42
+
+    def __post_init__(self):
+        if self.artifact_format not in ARTIFACT_FORMATS:
+            raise ValueError(f"Unknown artifact_format '{self.artifact_format}', expected one of {list(ARTIFACT_FORMATS)}")
+        extension = ARTIFACT_FORMATS[self.artifact_format]
+        self.train_data_path = self.train_data_path or os.path.join("artifacts", f"train{extension}")
+        self.test_data_path = self.test_data_path or os.path.join("artifacts", f"test{extension}")
+        self.raw_data_path = self.raw_data_path or os.path.join("artifacts", f"raw{extension}")
+        self.sql_config = self.sql_config or SQLSourceConfig()
+
+    @property
+    def csv_export_paths(self):
+        """The raw/train/test .csv copies written with export_csv (none if the artifacts are CSV already)."""
+        if not self.export_csv or self.artifact_format == "csv":
+            return []
+        return [os.path.splitext(path)[0] + ".csv" for path in (self.raw_data_path, self.train_data_path, self.test_data_path)]
 
 class DataIngestion:
-    def __init__(self):
+    def __init__(self, config: DataIngestionConfig = None):
         
-        self.ingestion_config = DataIngestionConfig()
+        self.ingestion_config = config or DataIngestionConfig()
+
+    def _source_path(self):
+        csv_path = os.path.abspath(os.path.normpath(self.ingestion_config.source_data_path))
+        logger.info(f"CSV file path: {csv_path}")
+
+        if not os.path.exists(csv_path):
+            logger.error(f"CSV file not found at {csv_path}")
+            raise FileNotFoundError(f"CSV file not found at {csv_path}")
+        return csv_path
+
+    def _sql_source(self):
+        config = self.ingestion_config
+        if config.chunk_size:
+            return SQLSource(replace(config.sql_config, fetch_size=config.chunk_size))
+        return SQLSource(config.sql_config)
+
+    def _appending(self):
+        """
+        True when the SQL source only returns rows above its stored watermark: those rows are
+        added to the existing raw/train/test artifacts instead of replacing them.
+        """
+        config = self.ingestion_config
+        if config.source != "mysql" or not config.sql_config.watermark_column:
+            return False
+        if SQLSource(config.sql_config).watermark() is None:
+            return False  # First pull: the whole table
+        if not all(os.path.exists(path) for path in (config.raw_data_path, config.train_data_path, config.test_data_path)):
+            logger.warning(
+                f"Watermark pull without existing artifacts, only the new rows will be ingested. "
+                f"Delete {config.sql_config.watermark_path} to pull the whole table again."
+            )
+            return False
+        return True
 
     def initiate_data_ingestion(self):
+        if self.ingestion_config.chunk_size:
+            return self.initiate_streaming_ingestion()
+
         try:
             logger.info("Starting Data Ingestion Process...")
 
             # Ensure artifact directory exists
             os.makedirs(os.path.dirname(self.ingestion_config.raw_data_path), exist_ok=True)
 
-            csv_path = os.path.abspath(os.path.normpath(os.path.join('notebooks', 'data', 'stud.csv')))
-            logger.info(f"CSV file path: {csv_path}")
+            appending = self._appending()  # Decided before the pull advances the watermark
+            source = None
+            if self.ingestion_config.source == "mysql":
+                logger.info("Trying to fetch data from MySQL database...")
+                source = self._sql_source()
+                with source:
+                    df = source.read()
+            else:
+                csv_path = self._source_path()
+                logger.info("Reading data from CSV file...")
+                df = load_frame(csv_path)
+                logger.info("Data successfully read from CSV file.")
 
-            if not os.path.exists(csv_path):
-                logger.error(f"CSV file not found at {csv_path}")
-                raise FileNotFoundError(f"CSV file not found at {csv_path}")
+            if appending:
+                if df.empty:
+                    logger.info("No new rows since the last pull, artifacts are unchanged.")
+                    source.commit_watermark()
+                    return self.ingestion_config.train_data_path, self.ingestion_config.test_data_path
 
-            logger.info("Reading data from CSV file...")
-            df = pd.read_csv(csv_path)
-            logger.info("Data successfully read from CSV file.")
+                # ✅ Only the new rows are split (by content, as in streaming ingestion) and appended
+                is_test = hash_split(df, self.ingestion_config.test_size, self.ingestion_config.random_state)
+                logger.info(f"Appending {len(df)} new rows ({int(is_test.sum())} test) to the existing artifacts")
+                train_set = pd.concat([load_frame(self.ingestion_config.train_data_path), df[~is_test]], ignore_index=True)
+                test_set = pd.concat([load_frame(self.ingestion_config.test_data_path), df[is_test]], ignore_index=True)
+                df = pd.concat([load_frame(self.ingestion_config.raw_data_path), df], ignore_index=True)
+            else:
+                # Split data into train and test
+                train_set, test_set = train_test_split(
+                    df, test_size=self.ingestion_config.test_size, random_state=self.ingestion_config.random_state
+                )
 
             # Save raw data
-            df.to_csv(self.ingestion_config.raw_data_path, index=False)
+            save_frame(df, self.ingestion_config.raw_data_path)
             logger.info(f"Raw data saved at {self.ingestion_config.raw_data_path}")
 
-            # Split data into train and test
-            train_set, test_set = train_test_split(df, test_size=0.2, random_state=42)
-
             # Save train and test datasets
-            train_set.to_csv(self.ingestion_config.train_data_path, index=False)
-            test_set.to_csv(self.ingestion_config.test_data_path, index=False)
+            save_frame(train_set, self.ingestion_config.train_data_path)
+            save_frame(test_set, self.ingestion_config.test_data_path)
+
+            if self.ingestion_config.export_csv and self.ingestion_config.artifact_format != "csv":
+                for frame, path in [(df, self.ingestion_config.raw_data_path),
+                                    (train_set, self.ingestion_config.train_data_path),
+                                    (test_set, self.ingestion_config.test_data_path)]:
+                    save_frame(frame, os.path.splitext(path)[0] + ".csv")
+                logger.info("CSV copies of raw/train/test data exported.")
+
+            # ✅ Only now are the pulled rows on disk: a failure above pulls them again next time
+            if source is not None:
+                source.commit_watermark()
 
             logger.info(f"Train data saved at {self.ingestion_config.train_data_path}")
             logger.info(f"Test data saved at {self.ingestion_config.test_data_path}")
@@ -61,6 +169,69 @@ class DataIngestion:
             logger.error(f"Error during Data Ingestion: {str(e)}")
             raise CustomException(e, sys)
 
+    def read_source_chunks(self, source=None):
+        """Iterate over the source as DataFrames of chunk_size rows (`source`: the SQLSource to read)."""
+        config = self.ingestion_config
+        if config.source == "mysql":
+            # Server-side cursors; partitions arrive in completion order, which hash_split doesn't mind
+            with source or self._sql_source() as source:
+                yield from source.iter_chunks()
+        else:
+            yield from iter_frame_chunks(self._source_path(), config.chunk_size, dtype=STREAMING_DTYPES)
+
+    def initiate_streaming_ingestion(self):
+        """
+        Ingest a source larger than memory: chunks are split with hash_split and appended to the
+        raw/train/test artifacts as they are read, so peak memory is bounded by chunk_size.
+        A watermark pull (see _appending) copies the existing artifacts first, then the new rows.
+        """
+        try:
+            config = self.ingestion_config
+            logger.info(f"Starting streaming Data Ingestion (chunk_size={config.chunk_size})...")
+            appending = self._appending()
+            source = self._sql_source() if config.source == "mysql" else None
+
+            outputs = {
+                "raw": [config.raw_data_path],
+                "train": [config.train_data_path],
+                "test": [config.test_data_path],
+            }
+            if config.export_csv and config.artifact_format != "csv":
+                for paths in outputs.values():
+                    paths.append(os.path.splitext(paths[0])[0] + ".csv")
+
+            with ExitStack() as stack:
+                writers = {
+                    name: [stack.enter_context(FrameWriter(path)) for path in paths] for name, paths in outputs.items()
+                }
+                if appending:
+                    for name, paths in outputs.items():
+                        for chunk in iter_frame_chunks(paths[0], config.chunk_size, dtype=STREAMING_DTYPES):
+                            for writer in writers[name]:
+                                writer.write(chunk)
+                for chunk in self.read_source_chunks(source):
+                    chunk = chunk.astype({c: t for c, t in STREAMING_DTYPES.items() if c in chunk.columns})
+                    is_test = hash_split(chunk, config.test_size, config.random_state)
+
+                    for name, part in (("raw", chunk), ("train", chunk[~is_test]), ("test", chunk[is_test])):
+                        for writer in writers[name]:
+                            writer.write(part)
+
+            # The writers have moved every file into place: the pulled rows are saved
+            if source is not None:
+                source.commit_watermark()
+
+            logger.info(
+                f"Streamed {writers['raw'][0].rows} rows: {writers['train'][0].rows} train "
+                f"at {config.train_data_path}, {writers['test'][0].rows} test at {config.test_data_path}"
+            )
+            logger.info("Data Ingestion Process Completed Successfully!")
+            return config.train_data_path, config.test_data_path
+
+        except Exception as e:
+            logger.error(f"Error during streaming Data Ingestion: {str(e)}")
+            raise CustomException(e, sys)
+
 
 
 # if you want to read from mysql database use this code
@@ -11,17 +11,35 @@ from sklearn.impute import SimpleImputer
 
 from src.mlproject.logger import logger
 from src.mlproject.exception import CustomException
-from src.mlproject.utils import save_object
+from scipy import sparse
+from src.mlproject.utils import save_object, load_frame, iter_frame_chunks, save_features
+from src.mlproject.components.incremental_preprocessor import IncrementalPreprocessor
+
+# Input schema shared by training and serving
+TARGET_COLUMN = "math_score"
+NUMERICAL_COLUMNS = ['writing_score', 'reading_score']
+CATEGORICAL_COLUMNS = [
+    "gender", "race_ethnicity", "parental_level_of_education",
+    "lunch", "test_preparation_course"
+]
 
 @dataclass
 class DataTransformationConfig:
     preprocessor_obj_file_path: str = os.path.join('artifacts', 'preprocessor.pkl')
+    # Features are saved as <path>.npz when the preprocessor output is sparse, <path>.npy otherwise
+    train_features_path: str = os.path.join('artifacts', 'train_features')
+    test_features_path: str = os.path.join('artifacts', 'test_features')
+    train_target_path: str = os.path.join('artifacts', 'train_target.npy')
+    test_target_path: str = os.path.join('artifacts', 'test_target.npy')
+    sparse_threshold: float = 0.3  # Output stays CSR when its density is below this (ColumnTransformer)
+    chunk_size: int = None  # Fit/transform out of core, streaming this many rows at a time
 
 class DataTransformation:
-    def __init__(self):
-        self.data_transformation_config = DataTransformationConfig()
+    def __init__(self, config: DataTransformationConfig = None):
+        self.data_transformation_config = config or DataTransformationConfig()
+        self.artifact_paths = {}  # Files written by the last initiate_* call
     
-    def get_data_transform_object(self):
+    def get_data_transform_object(self, numerical_columns=None, categorical_columns=None):
         """
         Create and return the preprocessing pipeline for numerical and categorical features.
         """
@@ -29,11 +47,8 @@ class DataTransformation:
             logger.info("Initializing Data Transformation pipeline.")
 
             # Define columns
-            numerical_columns = ['writing_score', 'reading_score']
-            categorical_columns = [
-                "gender", "race_ethnicity", "parental_level_of_education",
-                "lunch", "test_preparation_course"
-            ]
+            numerical_columns = numerical_columns or NUMERICAL_COLUMNS
+            categorical_columns = categorical_columns or CATEGORICAL_COLUMNS
 
             logger.info(f"Numerical columns: {numerical_columns}")
             logger.info(f"Categorical columns: {categorical_columns}")
@@ -55,7 +70,7 @@ class DataTransformation:
             preprocessor = ColumnTransformer([
                 ("num_pipeline", num_pipeline, numerical_columns),
                 ("cat_pipeline", cat_pipeline, categorical_columns),
-            ])
+            ], sparse_threshold=self.data_transformation_config.sparse_threshold)
 
             logger.info("Data transformation pipeline created successfully.")
             return preprocessor
@@ -67,7 +82,12 @@ class DataTransformation:
     def initiate_data_transformation(self, train_path: str, test_path: str):
         """
         Read train and test data, apply preprocessing, and save the preprocessor.
+        Returns (X_train, y_train, X_test, y_test, preprocessor_path); X stays CSR if the
+        preprocessor output is sparse.
         """
+        if self.data_transformation_config.chunk_size:
+            return self.initiate_chunked_data_transformation(train_path, test_path)
+
         try:
             logger.info(f"Reading training data from: {train_path}")
             logger.info(f"Reading testing data from: {test_path}")
@@ -75,8 +95,8 @@ class DataTransformation:
             if not os.path.exists(train_path) or not os.path.exists(test_path):
                 raise FileNotFoundError("Train or test file not found.")
 
-            train_df = pd.read_csv(train_path)
-            test_df = pd.read_csv(test_path)
+            train_df = load_frame(train_path)
+            test_df = load_frame(test_path)
 
             logger.info(f"Train Data Shape: {train_df.shape}, Columns: {list(train_df.columns)}")
             logger.info(f"Test Data Shape: {test_df.shape}, Columns: {list(test_df.columns)}")
@@ -84,8 +104,7 @@ class DataTransformation:
             preprocessor_obj = self.get_data_transform_object()
 
             # Define target variable
-            target_column_name = "math_score"
-            numerical_columns = ['writing_score', 'reading_score']
+            target_column_name = TARGET_COLUMN
 
             if target_column_name not in train_df.columns:
                 raise ValueError(f"Target column '{target_column_name}' not found in training data.")
@@ -108,9 +127,9 @@ class DataTransformation:
             logger.info(f"Transformed Train Data Shape: {input_feature_train_arr.shape}")
             logger.info(f"Transformed Test Data Shape: {input_feature_test_arr.shape}")
 
-            # Combine input features and target variable
-            train_arr = np.c_[input_feature_train_arr, target_feature_train_df.to_numpy()]
-            test_arr = np.c_[input_feature_test_arr, target_feature_test_df.to_numpy()]
+            # Features and target are kept apart: gluing them with np.c_ would densify a sparse matrix
+            y_train = target_feature_train_df.to_numpy(dtype=np.float64)
+            y_test = target_feature_test_df.to_numpy(dtype=np.float64)
 
             # Ensure artifacts directory exists before saving
             os.makedirs(os.path.dirname(self.data_transformation_config.preprocessor_obj_file_path), exist_ok=True)
@@ -124,7 +143,13 @@ class DataTransformation:
 
             logger.info("Preprocessing object saved successfully.")
 
-            return train_arr, test_arr, self.data_transformation_config.preprocessor_obj_file_path
+            # Keep the transformed arrays so a cached pipeline run can skip this stage
+            self._save_arrays(input_feature_train_arr, y_train, input_feature_test_arr, y_test)
+
+            return (
+                input_feature_train_arr, y_train, input_feature_test_arr, y_test,
+                self.data_transformation_config.preprocessor_obj_file_path,
+            )
 
         except FileNotFoundError as e:
             logger.error(f"File not found: {str(e)}")
@@ -133,3 +158,99 @@ class DataTransformation:
         except Exception as e:
             logger.error(f"Error in initiate_data_transformation: {str(e)}")
             raise CustomException(e, sys)
+
+    @staticmethod
+    def _store_features(X, path_stem):
+        if isinstance(X, np.memmap):  # Already written in place by _transform_in_chunks
+            return f"{path_stem}.npy"
+        return save_features(X, path_stem)
+
+    def _save_arrays(self, X_train, y_train, X_test, y_test):
+        config = self.data_transformation_config
+        self.artifact_paths = {
+            "preprocessor": config.preprocessor_obj_file_path,
+            "train_features": self._store_features(X_train, config.train_features_path),
+            "test_features": self._store_features(X_test, config.test_features_path),
+            "train_target": config.train_target_path,
+            "test_target": config.test_target_path,
+        }
+        np.save(config.train_target_path, y_train)
+        np.save(config.test_target_path, y_test)
+
+    def _transform_in_chunks(self, preprocessor_obj, data_path, features_stem):
+        """
+        Transform a data file chunk by chunk. Dense output is written straight into a
+        memory-mapped <features_stem>.npy; if any chunk comes out sparse every chunk is
+        converted to CSR and stacked instead. Returns (X, y).
+        """
+        chunk_size = self.data_transformation_config.chunk_size
+        n_rows = sum(len(chunk) for chunk in iter_frame_chunks(data_path, chunk_size))
+        if not n_rows:
+            raise ValueError(f"No rows found in {data_path}.")
+
+        # 🔹 A fitted ColumnTransformer keeps one format, but a preprocessor that applies
+        # sparse_threshold per call can return dense and sparse chunks for the same file
+        chunks, dense, targets, start = [], None, [], 0
+        for chunk in iter_frame_chunks(data_path, chunk_size):
+            if TARGET_COLUMN not in chunk.columns:
+                raise ValueError(f"Target column '{TARGET_COLUMN}' not found in {data_path}.")
+            features = preprocessor_obj.transform(chunk.drop(columns=[TARGET_COLUMN]))
+            targets.append(chunk[TARGET_COLUMN].to_numpy(dtype=np.float64))
+            rows = slice(start, start + len(chunk))
+            start += len(chunk)
+
+            if sparse.issparse(features):
+                chunks.append(features.tocsr())
+                continue
+            if dense is None:
+                if os.path.exists(f"{features_stem}.npz"):
+                    os.remove(f"{features_stem}.npz")
+                dense = np.lib.format.open_memmap(f"{features_stem}.npy", mode="w+", dtype=np.float64,
+                                                  shape=(n_rows, features.shape[1]))
+            dense[rows] = features
+            chunks.append(rows)
+
+        y = np.concatenate(targets)
+        if any(sparse.issparse(chunk) for chunk in chunks):
+            # ✅ Dense rows are already in the memory map; convert them in file order
+            X = sparse.vstack([chunk if sparse.issparse(chunk) else sparse.csr_matrix(dense[chunk])
+                               for chunk in chunks], format="csr")
+            return X, y
+        dense.flush()
+        return dense, y
+
+    def initiate_chunked_data_transformation(self, train_path: str, test_path: str):
+        """
+        Out-of-core variant of initiate_data_transformation: the preprocessor is fitted in a single
+        streamed pass over the training data (IncrementalPreprocessor) and both matrices are built
+        chunk by chunk, so memory use is bounded by chunk_size (or by the non-zeros, for CSR output).
+        """
+        try:
+            config = self.data_transformation_config
+            logger.info(f"Fitting preprocessor incrementally on {train_path} (chunk_size={config.chunk_size})")
+
+            if not os.path.exists(train_path) or not os.path.exists(test_path):
+                raise FileNotFoundError("Train or test file not found.")
+
+            incremental = IncrementalPreprocessor(self.get_data_transform_object())
+            for chunk in iter_frame_chunks(train_path, config.chunk_size):
+                incremental.partial_fit(chunk.drop(columns=[TARGET_COLUMN], errors="ignore"))
+            preprocessor_obj = incremental.to_column_transformer()
+            logger.info(f"Preprocessor fitted on {incremental.n_rows} rows.")
+
+            os.makedirs(os.path.dirname(config.preprocessor_obj_file_path), exist_ok=True)
+            X_train, y_train = self._transform_in_chunks(preprocessor_obj, train_path, config.train_features_path)
+            X_test, y_test = self._transform_in_chunks(preprocessor_obj, test_path, config.test_features_path)
+            logger.info(f"Transformed Train Data Shape: {X_train.shape}, Test Data Shape: {X_test.shape}")
+
+            self._save_arrays(X_train, y_train, X_test, y_test)
+            save_object(file_path=config.preprocessor_obj_file_path, obj=preprocessor_obj)
+            return X_train, y_train, X_test, y_test, config.preprocessor_obj_file_path
+
+        except FileNotFoundError as e:
+            logger.error(f"File not found: {str(e)}")
+            raise CustomException(e, sys)
+
+        except Exception as e:
+            logger.error(f"Error in initiate_chunked_data_transformation: {str(e)}")
+            raise CustomException(e, sys)
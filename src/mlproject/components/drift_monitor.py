@@ -0,0 +1,281 @@
+import copy
+import threading
+from collections import deque
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from src.mlproject.logger import logger
+from src.mlproject.components.data_transformation import NUMERICAL_COLUMNS, CATEGORICAL_COLUMNS
+
+
+def psi(expected_counts, actual_counts, floor=1e-4):
+    """Population stability index between two histograms over the same bins."""
+    expected = np.asarray(expected_counts, dtype=float)
+    actual = np.asarray(actual_counts, dtype=float)
+    if not expected.sum() or not actual.sum():
+        return 0.0
+    expected = np.clip(expected / expected.sum(), floor, None)
+    actual = np.clip(actual / actual.sum(), floor, None)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+class RegressionAccumulator:
+    """
+    Running RMSE / MAE / R2 in O(1) memory. Sums of errors plus a mean / sum of squared
+    deviations of the actuals (Chan et al.), so accumulators over disjoint events merge exactly.
+    """
+
+    def __init__(self):
+        self.n = 0
+        self.sum_abs_error = 0.0
+        self.sum_squared_error = 0.0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def _combine(self, n, mean, m2):
+        total = self.n + n
+        delta = mean - self.mean
+        self.mean += delta * n / total
+        self.m2 += m2 + delta ** 2 * self.n * n / total
+        self.n = total
+
+    def update(self, y_true, y_pred):
+        y_true = np.asarray(y_true, dtype=float).ravel()
+        errors = y_true - np.asarray(y_pred, dtype=float).ravel()
+        if not y_true.size:
+            return self
+        self.sum_abs_error += float(np.abs(errors).sum())
+        self.sum_squared_error += float(np.square(errors).sum())
+        mean = float(y_true.mean())
+        self._combine(y_true.size, mean, float(np.square(y_true - mean).sum()))
+        return self
+
+    def merge(self, other):
+        if other.n:
+            self.sum_abs_error += other.sum_abs_error
+            self.sum_squared_error += other.sum_squared_error
+            self._combine(other.n, other.mean, other.m2)
+        return self
+
+    def metrics(self):
+        """{"rmse", "mae", "r2"}; R2 of constant actuals follows sklearn (1.0 if perfect, else 0.0)."""
+        if not self.n:
+            return {"rmse": np.nan, "mae": np.nan, "r2": np.nan}
+        if self.m2 > 0:
+            r2 = 1.0 - self.sum_squared_error / self.m2
+        else:
+            r2 = 1.0 if self.sum_squared_error == 0 else 0.0
+        return {"rmse": float(np.sqrt(self.sum_squared_error / self.n)), "mae": self.sum_abs_error / self.n, "r2": float(r2)}
+
+
+class NumericSketch:
+    """Fixed-bin histogram (bins from reference quantiles), mergeable and O(bins) memory."""
+
+    def __init__(self, edges):
+        self.edges = np.asarray(edges, dtype=float)
+        self.counts = np.zeros(len(self.edges) + 1)
+
+    @classmethod
+    def from_reference(cls, values, bins=10):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        edges = np.unique(np.quantile(values, np.linspace(0, 1, bins + 1)[1:-1])) if values.size else []
+        return cls(edges).update(values)
+
+    def empty(self):
+        return type(self)(self.edges)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        self.counts += np.bincount(np.searchsorted(self.edges, values, side="right"), minlength=len(self.counts))
+        return self
+
+    def merge(self, other):
+        self.counts += other.counts
+        return self
+
+    def psi(self, reference):
+        return psi(reference.counts, self.counts)
+
+    def ks(self, reference):
+        """Kolmogorov-Smirnov statistic evaluated at the bin edges."""
+        if not self.counts.sum() or not reference.counts.sum():
+            return 0.0
+        return float(np.max(np.abs(np.cumsum(self.counts) / self.counts.sum()
+                                   - np.cumsum(reference.counts) / reference.counts.sum())))
+
+
+class CategoricalSketch:
+    """Counts over the reference categories plus one bucket for anything unseen."""
+
+    def __init__(self, categories):
+        self.categories = list(categories)
+        self._index = {category: i for i, category in enumerate(self.categories)}
+        self.counts = np.zeros(len(self.categories) + 1)
+
+    @classmethod
+    def from_reference(cls, values):
+        values = pd.Series(values).dropna()
+        return cls(sorted(values.unique())).update(values)
+
+    def empty(self):
+        return type(self)(self.categories)
+
+    def update(self, values):
+        values = pd.Series(values).dropna()
+        index = values.map(self._index).fillna(len(self.categories)).to_numpy(dtype=np.int64)
+        self.counts += np.bincount(index, minlength=len(self.counts))
+        return self
+
+    def merge(self, other):
+        self.counts += other.counts
+        return self
+
+    def psi(self, reference):
+        return psi(reference.counts, self.counts)
+
+    def unseen_share(self):
+        total = self.counts.sum()
+        return float(self.counts[-1] / total) if total else 0.0
+
+
+class _WindowState:
+    """Everything accumulated over one pane or window."""
+
+    def __init__(self, reference):
+        self.events = 0
+        self.metrics = RegressionAccumulator()
+        self.sketches = {column: sketch.empty() for column, sketch in reference.items()}
+
+    def update(self, features, predictions, actuals):
+        self.events += len(features)
+        # A missing label or an unparseable prediction would turn the whole window's RMSE/MAE into NaN
+        labelled = ~np.isnan(actuals) & ~np.isnan(predictions)
+        self.metrics.update(actuals[labelled], predictions[labelled])
+        for column, sketch in self.sketches.items():
+            if column in features.columns:
+                sketch.update(features[column].to_numpy())
+
+    def merge(self, other):
+        self.events += other.events
+        self.metrics.merge(other.metrics)
+        for column, sketch in self.sketches.items():
+            sketch.merge(other.sketches[column])
+        return self
+
+
+@dataclass
+class DriftMonitorConfig:
+    window_size: int = 1000  # Events per window
+    slide: int = None  # Events between window evaluations; None = window_size (tumbling windows)
+    bins: int = 10  # Reference quantile bins per numeric column
+    numerical_columns: tuple = tuple(NUMERICAL_COLUMNS)
+    categorical_columns: tuple = tuple(CATEGORICAL_COLUMNS)
+    min_r2: float = 0.6  # Same bar as ModelMonitoring.evaluate_model
+    psi_threshold: float = 0.2
+    ks_threshold: float = 0.2
+    cooldown_windows: int = 5  # Windows to wait after a retrain trigger before triggering again
+    history_size: int = 100  # Window reports kept for /monitor/drift
+
+
+class DriftMonitor:
+    """
+    Streaming model monitor. `record` ingests (features, prediction, actual) events and
+    keeps per-pane accumulators; every `slide` events the last window_size / slide panes
+    are merged into a window report (RMSE/MAE/R2 plus PSI and KS against the reference
+    distribution). A report breaching the thresholds calls `on_retrain(report)`.
+    Memory is bounded by the number of panes, never by the number of events.
+    """
+
+    def __init__(self, reference, config: DriftMonitorConfig = None, on_retrain=None):
+        self.config = config or DriftMonitorConfig()
+        self.slide = self.config.slide or self.config.window_size
+        if self.config.window_size % self.slide:
+            raise ValueError("window_size must be a multiple of slide.")
+        self.reference = reference
+        self.on_retrain = on_retrain
+        self.events = 0
+        self.reports = deque(maxlen=self.config.history_size)
+        self._panes = deque(maxlen=self.config.window_size // self.slide)
+        self._pane = _WindowState(reference)
+        self._cooldown = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_reference_frame(cls, df, config: DriftMonitorConfig = None, on_retrain=None):
+        """Build the reference sketches from the training data."""
+        config = config or DriftMonitorConfig()
+        reference = {column: NumericSketch.from_reference(df[column], config.bins) for column in config.numerical_columns}
+        reference.update({column: CategoricalSketch.from_reference(df[column]) for column in config.categorical_columns})
+        return cls(reference, config, on_retrain)
+
+    def record(self, features, predictions, actuals):
+        """Ingest a batch of events; `features` is a DataFrame or a list of records. NaN actuals are skipped for metrics."""
+        features = features if isinstance(features, pd.DataFrame) else pd.DataFrame(features)
+        predictions = np.asarray(predictions, dtype=float).ravel()
+        actuals = np.asarray(actuals, dtype=float).ravel()
+        reports = []
+        with self._lock:
+            start = 0
+            while start < len(features):
+                take = min(self.slide - self._pane.events, len(features) - start)
+                stop = start + take
+                self._pane.update(features.iloc[start:stop], predictions[start:stop], actuals[start:stop])
+                self.events += take
+                start = stop
+                if self._pane.events == self.slide:
+                    self._panes.append(self._pane)
+                    self._pane = _WindowState(self.reference)
+                    if len(self._panes) == self._panes.maxlen:
+                        reports.append(self._evaluate_window())
+
+        for report in reports:
+            if report["retrain"] and self.on_retrain is not None:
+                try:
+                    self.on_retrain(report)
+                except Exception as e:
+                    logger.error("Retrain trigger failed: %s", e)
+        return reports
+
+    def _evaluate_window(self):
+        window = copy.deepcopy(self._panes[0])
+        for pane in list(self._panes)[1:]:
+            window.merge(pane)
+
+        config = self.config
+        psi_values = {column: sketch.psi(self.reference[column]) for column, sketch in window.sketches.items()}
+        ks_values = {column: window.sketches[column].ks(self.reference[column]) for column in config.numerical_columns}
+        metrics = window.metrics.metrics()
+
+        reasons = [f"psi {column}={value:.3f}" for column, value in psi_values.items() if value > config.psi_threshold]
+        reasons += [f"ks {column}={value:.3f}" for column, value in ks_values.items() if value > config.ks_threshold]
+        if window.metrics.n and metrics["r2"] < config.min_r2:
+            reasons.append(f"r2={metrics['r2']:.3f}")
+
+        retrain = bool(reasons) and self._cooldown == 0
+        if retrain:
+            self._cooldown = config.cooldown_windows
+            logger.warning(f"🚨 Window drift at event {self.events}: {', '.join(reasons)}. Retraining triggered.")
+        elif self._cooldown:
+            self._cooldown -= 1
+
+        report = {
+            "window_end": self.events,
+            "events": window.events,
+            "labelled": window.metrics.n,
+            # None, not NaN, for a window without labelled events: NaN is not valid JSON
+            **{name: None if np.isnan(value) else value for name, value in metrics.items()},
+            "psi": psi_values,
+            "ks": ks_values,
+            "reasons": reasons,
+            "retrain": retrain,
+        }
+        self.reports.append(report)
+        return report
+
+    def latest(self):
+        """Most recent window report, or None before the first full window."""
+        return self.reports[-1] if self.reports else None
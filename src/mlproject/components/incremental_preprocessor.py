@@ -0,0 +1,229 @@
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.compose import ColumnTransformer
+from sklearn.impute import SimpleImputer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+
+class QuantileSketch:
+    """
+    Mergeable streaming quantile sketch over (value, count) centroids.
+
+    Exact while the column has at most max_bins distinct values (e.g. integer
+    scores), otherwise compressed into max_bins equal-weight bins, which
+    bounds the rank error of a quantile by about 1 / max_bins.
+    """
+
+    def __init__(self, max_bins=2048):
+        self.max_bins = max_bins
+        self.values = np.empty(0, dtype=float)
+        self.counts = np.empty(0, dtype=float)
+        self.exact = True
+
+    def update(self, values):
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if not values.size:
+            return
+        new_values, new_counts = np.unique(values, return_counts=True)
+        self.values, inverse = np.unique(np.concatenate([self.values, new_values]), return_inverse=True)
+        self.counts = np.bincount(inverse, weights=np.concatenate([self.counts, new_counts]))
+        if len(self.values) > self.max_bins:
+            self._compress()
+
+    def _compress(self):
+        # Assign each centroid to an equal-weight bin by the midpoint of its rank range
+        cumulative = np.cumsum(self.counts)
+        midpoints = (cumulative - self.counts / 2) / cumulative[-1]
+        bins = np.minimum((midpoints * self.max_bins).astype(int), self.max_bins - 1)
+        counts = np.bincount(bins, weights=self.counts, minlength=self.max_bins)
+        sums = np.bincount(bins, weights=self.counts * self.values, minlength=self.max_bins)
+        keep = counts > 0
+        self.values, self.counts = sums[keep] / counts[keep], counts[keep]
+        self.exact = False
+
+    def quantile(self, q):
+        """Quantile with linear interpolation between ranks, as np.quantile / np.median."""
+        if not self.counts.size:
+            return np.nan
+        cumulative = np.cumsum(self.counts)
+        position = q * (cumulative[-1] - 1)
+        lower, upper = np.searchsorted(cumulative, [np.floor(position), np.ceil(position)], side="right")
+        return self.values[lower] + (self.values[upper] - self.values[lower]) * (position - np.floor(position))
+
+
+def _is_constant(var, mean, n_samples):
+    # Same tolerance StandardScaler uses to treat a feature as constant (scale_ = 1)
+    eps = np.finfo(np.float64).eps
+    return var <= n_samples * eps * var + (n_samples * mean * eps) ** 2
+
+
+def _scaler_state(scaler, mean, var, n_samples):
+    scaler.mean_ = np.asarray(mean, dtype=float)
+    scaler.var_ = np.asarray(var, dtype=float)
+    scaler.scale_ = np.where(_is_constant(scaler.var_, scaler.mean_, n_samples), 1.0, np.sqrt(scaler.var_))
+    scaler.n_samples_seen_ = n_samples
+
+
+class _NumericState:
+    """Median imputer + StandardScaler statistics for a group of numeric columns."""
+
+    def __init__(self, columns, max_bins):
+        self.columns = list(columns)
+        self.sketches = [QuantileSketch(max_bins) for _ in self.columns]
+        self.count = np.zeros(len(self.columns))
+        self.mean = np.zeros(len(self.columns))
+        self.m2 = np.zeros(len(self.columns))
+
+    def update(self, df):
+        values = df[self.columns].to_numpy(dtype=float)
+        observed = ~np.isnan(values)
+        for i, sketch in enumerate(self.sketches):
+            sketch.update(values[observed[:, i], i])
+
+        # Chan et al. parallel update of count / mean / sum of squared deviations
+        count = observed.sum(axis=0)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(count > 0, np.nansum(values, axis=0) / count, 0.0)
+            m2 = np.nansum((values - mean) ** 2, axis=0)
+        total = self.count + count
+        delta = mean - self.mean
+        with np.errstate(invalid="ignore", divide="ignore"):
+            self.mean = np.where(total > 0, self.mean + delta * count / total, 0.0)
+            self.m2 = self.m2 + m2 + np.where(total > 0, delta ** 2 * self.count * count / total, 0.0)
+        self.count = total
+
+    def finalize(self, n_rows):
+        """Return (medians, mean, var) of the columns after median imputation."""
+        medians = np.array([sketch.quantile(0.5) for sketch in self.sketches])
+        missing = n_rows - self.count
+        # Imputed rows add `missing` points at the median
+        delta = medians - self.mean
+        mean = self.mean + delta * missing / n_rows
+        var = (self.m2 + delta ** 2 * self.count * missing / n_rows) / n_rows
+        return medians, mean, var
+
+
+class _CategoricalState:
+    """Most-frequent imputer, one-hot vocabulary and scaler statistics for categorical columns."""
+
+    def __init__(self, columns):
+        self.columns = list(columns)
+        self.counters = [Counter() for _ in self.columns]
+        self.missing = np.zeros(len(self.columns), dtype=np.int64)
+
+    def update(self, df):
+        for i, column in enumerate(self.columns):
+            values = df[column].to_numpy(dtype=object)
+            missing = values != values  # NaN only, matching SimpleImputer's missing_values=np.nan
+            self.missing[i] += missing.sum()
+            self.counters[i].update(pd.Series(values[~missing]).value_counts().to_dict())
+
+    def finalize(self, n_rows):
+        """Return (modes, categories per column, mean, var) of the scaled one-hot output."""
+        modes, categories, means, variances = [], [], [], []
+        for counter, missing in zip(self.counters, self.missing):
+            counts = Counter(counter)
+            if counts:
+                top = max(counts.values())
+                mode = min(value for value, count in counts.items() if count == top)  # Ties -> smallest, as sklearn
+                counts[mode] += missing
+            else:
+                mode = np.nan
+            column_categories = sorted(counts)
+            frequency = np.array([counts[category] for category in column_categories], dtype=float) / n_rows
+            modes.append(mode)
+            categories.append(column_categories)
+            means.append(frequency)
+            variances.append(frequency * (1.0 - frequency))
+        return modes, categories, np.concatenate(means), np.concatenate(variances)
+
+
+class IncrementalPreprocessor:
+    """
+    Single-pass, out-of-core fit of the ColumnTransformer built by
+    DataTransformation.get_data_transform_object.
+
+    `partial_fit` accumulates per-chunk state: a quantile sketch per numeric
+    column for the median, running mean/variance, and category counters for
+    the most-frequent fill and one-hot vocabulary. `to_column_transformer`
+    then returns a fitted sklearn preprocessor with the same statistics an
+    in-memory fit would have learned.
+    """
+
+    def __init__(self, preprocessor: ColumnTransformer, max_bins=2048):
+        self.preprocessor = preprocessor
+        self.n_rows = 0
+        self._template = None
+        self._states = []
+
+        for name, transformer, columns in preprocessor.transformers:
+            if not isinstance(transformer, Pipeline):
+                raise ValueError(f"Unsupported transformer '{name}'.")
+            steps = dict(transformer.steps)
+            imputer, encoder, scaler = steps.get("imputer"), steps.get("one_hot_encoder"), steps.get("scaler")
+            if scaler is not None and not isinstance(scaler, StandardScaler):
+                raise ValueError(f"Unsupported scaler in '{name}'.")
+
+            if encoder is None and isinstance(imputer, SimpleImputer) and imputer.strategy == "median":
+                self._states.append(_NumericState(columns, max_bins))
+            elif isinstance(encoder, OneHotEncoder) and encoder.drop is None and encoder.max_categories is None \
+                    and encoder.min_frequency is None and isinstance(imputer, SimpleImputer) \
+                    and imputer.strategy == "most_frequent":
+                self._states.append(_CategoricalState(columns))
+            else:
+                raise ValueError(f"Unsupported steps in '{name}': {list(steps)}")
+
+    def partial_fit(self, df: pd.DataFrame):
+        """Update the statistics with one chunk of input rows."""
+        if self._template is None:
+            self._template = df.iloc[:1].reset_index(drop=True)
+        for state in self._states:
+            state.update(df)
+        self.n_rows += len(df)
+        return self
+
+    def to_column_transformer(self) -> ColumnTransformer:
+        """Return a fitted copy of the preprocessor carrying the accumulated statistics."""
+        if not self.n_rows:
+            raise ValueError("partial_fit has not seen any rows.")
+
+        results = [state.finalize(self.n_rows) for state in self._states]
+
+        # Fit the pipeline once on a tiny frame holding every category, so all fitted
+        # structure (vocabularies, feature names, output widths) is built by sklearn itself...
+        n_support = max([2] + [len(c) for state, result in zip(self._states, results)
+                               if isinstance(state, _CategoricalState) for c in result[1]])
+        support = self._template.loc[np.zeros(n_support, dtype=int)].reset_index(drop=True)
+        for state, result in zip(self._states, results):
+            for i, column in enumerate(state.columns):
+                if isinstance(state, _NumericState):
+                    support[column] = np.arange(n_support, dtype=float)
+                else:
+                    support[column] = np.array(np.resize(result[1][i], n_support), dtype=object)
+        fitted = clone(self.preprocessor).fit(support)
+
+        # ...then overwrite the learned statistics with the streamed ones
+        n_features, n_nonzero = 0, 0
+        for (_, pipeline, _), state, result in zip(fitted.transformers_, self._states, results):
+            steps = dict(pipeline.steps)
+            if isinstance(state, _NumericState):
+                medians, mean, var = result
+                steps["imputer"].statistics_ = medians
+                n_features += len(state.columns)
+                n_nonzero += len(state.columns)
+            else:
+                modes, categories, mean, var = result
+                steps["imputer"].statistics_ = np.array(modes, dtype=object)
+                n_features += len(mean)
+                n_nonzero += len(state.columns)  # One hot entry per categorical column
+            if steps.get("scaler") is not None:
+                _scaler_state(steps["scaler"], mean, var, self.n_rows)
+
+        # Dense vs sparse output is decided from the training data density, not the support frame's
+        fitted.sparse_output_ = bool(n_features) and n_nonzero / n_features < fitted.sparse_threshold
+        return fitted
@@ -0,0 +1,229 @@
+import os
+import sys
+import json
+import math
+import time
+import hashlib
+import argparse
+import itertools
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from src.mlproject.logger import logger
+from src.mlproject.exception import CustomException
+from src.mlproject.components.data_transformation import NUMERICAL_COLUMNS, CATEGORICAL_COLUMNS
+from src.mlproject.pipelines.stage_cache import file_digest
+from src.mlproject.utils import load_object, model_input
+
+
+@dataclass
+class LookupTableConfig:
+    model_path: str = os.path.join("artifacts", "best_model.pkl")
+    preprocessor_path: str = os.path.join("artifacts", "preprocessor.pkl")
+    table_path: str = os.path.join("artifacts", "prediction_table.npy")  # Metadata at .json; the table itself is versioned
+    score_range: tuple = (0, 100)  # Inclusive integer range of every numeric column
+    categories: dict = None  # {column: [values]} to export a subset; default every category the encoder knows
+    dtype: str = "float64"  # Same values as the live model; float32 halves the table at ~1e-7 relative error
+    batch_size: int = 200_000  # Grid rows per preprocessor.transform + model.predict call
+
+
+def metadata_path(table_path):
+    return os.path.splitext(table_path)[0] + ".json"
+
+
+def versioned_table_path(table_path, artifact_digest):
+    """prediction_table.<digest>.npy: each export of other artifacts gets its own file."""
+    root, extension = os.path.splitext(table_path)
+    return f"{root}.{hashlib.sha256(artifact_digest.encode()).hexdigest()[:12]}{extension}"
+
+
+def _artifact_digest(model_path, preprocessor_path):
+    return f"{file_digest(model_path)}:{file_digest(preprocessor_path)}"
+
+
+class LookupTable:
+    """
+    Predictions of one model over a finite input grid, memory-mapped from a .npy file.
+
+    The grid has one axis per categorical column (its category list) followed by
+    one per numeric column (integers in [low, high]). `lookup` maps a validated
+    record to its flat index; anything outside the grid (unknown category,
+    missing value, non-integer or out-of-range score) returns None so the caller
+    can fall back to the real model.
+    """
+
+    def __init__(self, table, metadata):
+        self.table = table
+        self.metadata = metadata
+        self._flat = table.reshape(-1)
+        self._categories = [
+            (column, {value: i for i, value in enumerate(values)}) for column, values in metadata["categories"].items()
+        ]
+        self._low, self._high = metadata["score_range"]
+        self._numeric = metadata["numerical_columns"]
+        self._span = self._high - self._low + 1
+
+    @classmethod
+    def load(cls, table_path, mmap=True):
+        """Load through the metadata, which names the table file it was written for."""
+        with open(metadata_path(table_path)) as file_obj:
+            metadata = json.load(file_obj)
+        if metadata.get("table_file"):
+            table_path = os.path.join(os.path.dirname(table_path), metadata["table_file"])
+        return cls(np.load(table_path, mmap_mode="r" if mmap else None), metadata)
+
+    def matches(self, model_path, preprocessor_path):
+        """True if the table was exported from exactly these model/preprocessor files."""
+        return self.metadata.get("artifact_digest") == _artifact_digest(model_path, preprocessor_path)
+
+    def index(self, row):
+        """Flat table index of a validated row, or None if it is outside the grid."""
+        flat = 0
+        for column, positions in self._categories:
+            position = positions.get(row[column])
+            if position is None:
+                return None
+            flat = flat * len(positions) + position
+        for column in self._numeric:
+            value = row[column]
+            if value is None or math.isnan(value) or not float(value).is_integer() \
+                    or not self._low <= value <= self._high:
+                return None
+            flat = flat * self._span + int(value) - self._low
+        return flat
+
+    def lookup(self, row):
+        flat = self.index(row)
+        return None if flat is None else float(self._flat[flat])
+
+    def lookup_frame(self, df):
+        """Vectorised lookup of a raw input frame: (predictions with NaN outside the grid, in-grid mask)."""
+        flat = np.zeros(len(df), dtype=np.int64)
+        found = np.ones(len(df), dtype=bool)
+        for column, positions in self._categories:
+            codes = pd.Categorical(df[column], categories=list(positions)).codes.astype(np.int64)
+            found &= codes >= 0
+            flat = flat * len(positions) + np.maximum(codes, 0)
+        for column in self._numeric:
+            values = pd.to_numeric(df[column], errors="coerce").to_numpy(dtype=float)
+            with np.errstate(invalid="ignore"):
+                in_grid = (values == np.round(values)) & (values >= self._low) & (values <= self._high)
+            found &= in_grid
+            flat = flat * self._span + np.where(in_grid, values - self._low, 0).astype(np.int64)
+
+        predictions = np.full(len(df), np.nan)
+        predictions[found] = self._flat[flat[found]]
+        return predictions, found
+
+    def lookup_rows(self, rows):
+        """Predictions for validated rows, with None for rows outside the grid."""
+        predictions, found = self.lookup_frame(pd.DataFrame(rows))
+        return [float(value) if hit else None for value, hit in zip(predictions, found)]
+
+
+class LookupTableExporter:
+    def __init__(self, config: LookupTableConfig = None):
+        self.lookup_table_config = config or LookupTableConfig()
+
+    def _grid_categories(self, preprocessor):
+        """{column: values} per categorical column, in CATEGORICAL_COLUMNS order."""
+        known = {}
+        for _, pipeline, columns in preprocessor.transformers_:
+            encoder = dict(getattr(pipeline, "steps", [])).get("one_hot_encoder")
+            if encoder is not None:
+                known.update({column: list(values) for column, values in zip(columns, encoder.categories_)})
+
+        subset = self.lookup_table_config.categories or {}
+        categories = {}
+        for column in CATEGORICAL_COLUMNS:
+            values = subset.get(column, known.get(column))
+            if not values:
+                raise ValueError(f"No categories for '{column}' in the preprocessor or config.")
+            categories[column] = [str(value) for value in values]
+        return categories
+
+    def initiate_export(self):
+        """Evaluate the model on every grid point and write the table + metadata. Returns the table path."""
+        config = self.lookup_table_config
+        try:
+            started = time.perf_counter()
+            model = load_object(config.model_path)
+            preprocessor = load_object(config.preprocessor_path)
+
+            categories = self._grid_categories(preprocessor)
+            low, high = config.score_range
+            scores = np.arange(low, high + 1, dtype=float)
+            shape = tuple(len(values) for values in categories.values()) + (len(scores),) * len(NUMERICAL_COLUMNS)
+            block = len(scores) ** len(NUMERICAL_COLUMNS)  # Grid points per categorical combination
+            logger.info(f"Exporting lookup table over {int(np.prod(shape))} grid points, shape {shape}")
+
+            # Score axes are the fastest-varying, so each categorical combination is one contiguous block
+            score_grid = pd.DataFrame(
+                np.stack(np.meshgrid(*[scores] * len(NUMERICAL_COLUMNS), indexing="ij"), -1).reshape(-1, len(NUMERICAL_COLUMNS)),
+                columns=NUMERICAL_COLUMNS,
+            )
+            combinations = list(itertools.product(*categories.values()))
+            per_batch = max(1, config.batch_size // block)
+
+            digest = _artifact_digest(config.model_path, config.preprocessor_path)
+            table_path = versioned_table_path(config.table_path, digest)
+            os.makedirs(os.path.dirname(config.table_path) or ".", exist_ok=True)
+            tmp_path = f"{config.table_path}.tmp.npy"
+            table = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=config.dtype, shape=shape)
+            flat = table.reshape(-1)
+            for start in range(0, len(combinations), per_batch):
+                group = combinations[start:start + per_batch]
+                frame = pd.concat([score_grid.assign(**dict(zip(categories, combo))) for combo in group], ignore_index=True)
+                predictions = model.predict(model_input(model, preprocessor.transform(frame)))
+                flat[start * block:(start + len(group)) * block] = predictions
+            table.flush()
+            del table, flat
+            os.replace(tmp_path, table_path)
+
+            # ✅ The metadata is the switch: written last and atomically, naming the table it describes
+            previous = None
+            if os.path.exists(metadata_path(config.table_path)):
+                with open(metadata_path(config.table_path)) as file_obj:
+                    previous = json.load(file_obj)
+            metadata = {
+                "table_file": os.path.basename(table_path),
+                "previous_table_file": previous.get("table_file") if previous else None,
+                "categories": categories,
+                "numerical_columns": NUMERICAL_COLUMNS,
+                "score_range": [low, high],
+                "shape": list(shape),
+                "dtype": config.dtype,
+                "artifact_digest": digest,
+            }
+            if metadata["previous_table_file"] == metadata["table_file"]:
+                metadata["previous_table_file"] = previous.get("previous_table_file")
+            tmp_metadata_path = f"{metadata_path(config.table_path)}.tmp"
+            with open(tmp_metadata_path, "w") as file_obj:
+                json.dump(metadata, file_obj, indent=2)
+            os.replace(tmp_metadata_path, metadata_path(config.table_path))
+
+            # A reader of the previous metadata may still open its table; the one before is stale
+            stale = previous.get("previous_table_file") if previous else None
+            if stale and stale not in (metadata["table_file"], metadata["previous_table_file"]):
+                stale_path = os.path.join(os.path.dirname(config.table_path), stale)
+                if os.path.exists(stale_path):
+                    os.remove(stale_path)
+
+            logger.info(f"Lookup table saved to {table_path} "
+                        f"({os.path.getsize(table_path) / 1e6:.1f} MB) in {time.perf_counter() - started:.1f}s")
+            return config.table_path
+
+        except Exception as e:
+            logger.error(f"Error exporting lookup table: {str(e)}")
+            raise CustomException(e, sys)
+
+
+if __name__ == "__main__":
+    # python -m src.mlproject.components.lookup_table  ->  export artifacts/prediction_table.npy
+    parser = argparse.ArgumentParser(description="Export the best model's predictions over the discrete input grid.")
+    parser.add_argument("--table-path", default=LookupTableConfig.table_path)
+    parser.add_argument("--dtype", default=LookupTableConfig.dtype, choices=["float32", "float64"])
+    args = parser.parse_args()
+    LookupTableExporter(LookupTableConfig(table_path=args.table_path, dtype=args.dtype)).initiate_export()
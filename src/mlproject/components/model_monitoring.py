@@ -1,15 +1,144 @@
 import os
-import mlflow
+import copy
+import json
+import time
+import hashlib
 import numpy as np
 import pandas as pd
-from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
-from src.mlproject.utils import load_object, save_object
+from dataclasses import dataclass, field, replace
+from catboost import CatBoostRegressor
+from xgboost import XGBRegressor
+from src.mlproject.serialization import artifact_format, write_release, promote_object, discard_object
+from src.mlproject.utils import load_object, save_object, load_frame, save_frame, iter_frame_chunks, model_input
 from src.mlproject.logger import logger
 from src.mlproject.exception import CustomException
-from src.mlproject.pipelines.training_pipeline import ModelTrainer
-from mlflow.models.signature import infer_signature
+from src.mlproject.tracking import get_tracker
+from src.mlproject.components.data_ingestion import DataIngestionConfig
+from src.mlproject.components.data_transformation import (
+    DataTransformation, DataTransformationConfig, TARGET_COLUMN, NUMERICAL_COLUMNS,
+)
+from src.mlproject.components.model_trainer import ModelTrainer, ModelTrainerConfig, eval_metrics
+from src.mlproject.components.drift_monitor import RegressionAccumulator, psi
 import sys
 
+RETRAIN_MODES = ("incremental", "full")
+
+
+@dataclass
+class RetrainConfig:
+    train_data_path: str = field(default_factory=lambda: DataIngestionConfig().train_data_path)
+    test_data_path: str = field(default_factory=lambda: DataIngestionConfig().test_data_path)
+    mode: str = "incremental"  # "incremental" (reuse preprocessor, continue the model) or "full"
+    extra_rounds: int = 50  # Boosting rounds / trees added when continuing a model
+    psi_threshold: float = 0.2  # PSI above this on any numeric column counts as drift
+    min_r2: float = 0.6  # An incremental model below this is replaced by a full retrain
+    transformation_config: DataTransformationConfig = None  # Full retrain only
+    trainer_config: ModelTrainerConfig = None  # Full retrain only
+
+
+def population_stability_index(expected, actual, bins=10):
+    """PSI of `actual` against `expected`, on quantile bins of `expected`."""
+    expected = np.asarray(expected, dtype=float)
+    actual = np.asarray(actual, dtype=float)
+    expected, actual = expected[~np.isnan(expected)], actual[~np.isnan(actual)]
+    if not expected.size or not actual.size:
+        return 0.0
+    edges = np.unique(np.quantile(expected, np.linspace(0, 1, bins + 1)[1:-1]))
+    return psi(
+        np.bincount(np.searchsorted(edges, expected, side="right"), minlength=len(edges) + 1),
+        np.bincount(np.searchsorted(edges, actual, side="right"), minlength=len(edges) + 1),
+    )
+
+
+def _file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as file_obj:
+        for block in iter(lambda: file_obj.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _staged_path(path):
+    """best_model.pkl -> best_model.retrain.pkl, next to it (os.replace stays within one filesystem)."""
+    root, extension = os.path.splitext(path)
+    return f"{root}.retrain{extension}"
+
+
+def _ingested_ledger_path(train_data_path):
+    """JSON record, next to the training set, of the new-data files already appended to it."""
+    root, _ = os.path.splitext(train_data_path)
+    return f"{root}.ingested.json"
+
+
+def _encoder_categories(preprocessor):
+    """{column: known categories} from the fitted one-hot encoders of a ColumnTransformer."""
+    categories = {}
+    for _, pipeline, columns in getattr(preprocessor, "transformers_", []):
+        encoder = dict(getattr(pipeline, "steps", [])).get("one_hot_encoder")
+        if encoder is not None:
+            categories.update({column: set(values) for column, values in zip(columns, encoder.categories_)})
+    return categories
+
+
+def detect_drift(reference_df, new_df, preprocessor, psi_threshold=0.2):
+    """
+    Compare newly labelled rows with the data the preprocessor/model were fitted on.
+    Drift = changed columns, categories the encoder has never seen, or numeric PSI above threshold.
+    """
+    feature_columns = [column for column in reference_df.columns if column != TARGET_COLUMN]
+    schema_changed = set(new_df.columns) != set(reference_df.columns)
+
+    unseen_categories = {}
+    for column, known in _encoder_categories(preprocessor).items():
+        if column in new_df.columns:
+            unseen = set(new_df[column].dropna().unique()) - known
+            if unseen:
+                unseen_categories[column] = sorted(map(str, unseen))
+
+    psi = {
+        column: population_stability_index(reference_df[column], new_df[column])
+        for column in NUMERICAL_COLUMNS + [TARGET_COLUMN]
+        if column in reference_df.columns and column in new_df.columns
+    }
+    drifted_columns = sorted(column for column, value in psi.items() if value > psi_threshold)
+
+    return {
+        "drifted": bool(schema_changed or unseen_categories or drifted_columns),
+        "schema_changed": schema_changed,
+        "unseen_categories": unseen_categories,
+        "psi": psi,
+        "drifted_columns": drifted_columns,
+        "feature_columns": feature_columns,
+    }
+
+
+def continue_training(model, X, y, extra_rounds=50):
+    """
+    Keep fitting an already fitted model on (X, y) and return (model, strategy).
+    XGBoost/CatBoost continue boosting from their existing trees, sklearn ensembles with
+    warm_start grow `extra_rounds` more estimators, anything else is refit from scratch.
+    """
+    X = model_input(model, X)
+    if isinstance(model, XGBRegressor):
+        booster = model.get_booster()
+        model.set_params(n_estimators=extra_rounds)
+        model.fit(X, y, xgb_model=booster)
+        return model, "xgb_model"
+    if isinstance(model, CatBoostRegressor):
+        # A fitted CatBoost model can't change params, so the extra rounds go into a fresh estimator
+        continued = CatBoostRegressor(**{**model.get_params(), "iterations": extra_rounds})
+        continued.fit(X, y, init_model=model)
+        return continued, "init_model"
+    params = model.get_params()
+    if "warm_start" in params and "n_estimators" in params:
+        model.set_params(warm_start=True, n_estimators=params["n_estimators"] + extra_rounds)
+        model.fit(X, y)
+        model.set_params(warm_start=False)
+        return model, "warm_start"
+    model.fit(X, y)
+    return model, "refit"
+
+
 class ModelMonitoring:
     def __init__(self, model_path="artifacts/best_model.pkl", preprocessor_path="artifacts/preprocessor.pkl"):
         try:
@@ -22,95 +151,197 @@ class ModelMonitoring:
             logger.error(f"Error loading model or preprocessor: {str(e)}")
             raise CustomException(e, sys)
 
-        # ✅ Set MLflow tracking
-        mlflow.set_registry_uri("https://dagshub.com/SHAIK-07/practice.mlflow")
-        mlflow.set_experiment("Model Monitoring")
+        # ✅ MLflow runs go through the background tracker
+        self.tracker = get_tracker()
+        self.experiment_name = "Model Monitoring"
 
-    def evaluate_model(self, new_data_path):
-        """Evaluates the model on new test data and logs metrics to MLflow."""
+    def evaluate_model(self, new_data_path, chunk_size=50_000):
+        """Evaluates the model on new test data (streamed in chunks) and logs metrics to MLflow."""
         if self.model is None:
             logger.error("No trained model found. Please train the model first.")
             return None
 
         try:
-            df = pd.read_csv(new_data_path)
-            if "math_score" not in df.columns:
-                logger.error("Target column 'math_score' not found in new data!")
-                return None
+            # ✅ Running metrics, so memory is bounded by chunk_size rather than the file size
+            accumulator = RegressionAccumulator()
+            for df in iter_frame_chunks(new_data_path, chunk_size):
+                if "math_score" not in df.columns:
+                    logger.error("Target column 'math_score' not found in new data!")
+                    return None
 
-            X_new = df.drop(columns=["math_score"])
-            y_true = df["math_score"]
-
-            # ✅ Apply preprocessing
-            X_processed = self.preprocessor.transform(X_new)
-
-            # ✅ Make predictions
-            y_pred = self.model.predict(X_processed)
+                # ✅ Apply preprocessing and make predictions
+                X_processed = self.preprocessor.transform(df.drop(columns=["math_score"]))
+                y_pred = self.model.predict(model_input(self.model, X_processed))
+                accumulator.update(df["math_score"], y_pred)
 
             # ✅ Calculate metrics
-            rmse = np.sqrt(mean_squared_error(y_true, y_pred))
-            mae = mean_absolute_error(y_true, y_pred)
-            r2 = r2_score(y_true, y_pred)
+            metrics = accumulator.metrics()
+            rmse, mae, r2 = metrics["rmse"], metrics["mae"], metrics["r2"]
 
             logger.info(f"Model Evaluation: RMSE={rmse:.4f}, MAE={mae:.4f}, R2 Score={r2:.4f}")
 
-            # ✅ Log metrics to MLflow
-            with mlflow.start_run(run_name="Model Monitoring Run"):
-                mlflow.log_metric("rmse", rmse)
-                mlflow.log_metric("mae", mae)
-                mlflow.log_metric("r2", r2)
+            # ✅ Queue metrics for MLflow (uploaded in the background)
+            self.tracker.log_run(
+                self.experiment_name, "Model Monitoring Run", metrics={"rmse": rmse, "mae": mae, "r2": r2},
+            )
 
-            # ✅ If R² drops below 0.6, trigger retraining
-            if r2 < 0.6:
-                logger.warning("🚨 Model performance has degraded! Retraining model...")
-                self.retrain_model()
+            # ✅ If R² drops below 0.6, flag the model for retraining (the caller decides when to run it)
+            retrain_required = bool(r2 < 0.6)
+            if retrain_required:
+                logger.warning("🚨 Model performance has degraded! Retraining required.")
 
-            return {"rmse": rmse, "mae": mae, "r2": r2}
+            return {"rmse": rmse, "mae": mae, "r2": r2, "retrain_required": retrain_required}
 
         except Exception as e:
             logger.error(f"Error during model evaluation: {str(e)}")
             raise CustomException(e, sys)
 
-    # def retrain_model(self):
-    #     """Triggers model retraining, registers it in MLflow, and updates the best model."""
-    #     try:
-    #         trainer = ModelTrainer()
-    #         train_path = "artifacts/train.csv"
-    #         test_path = "artifacts/test.csv"
-
-    #         # ✅ Load training data
-    #         train_df = pd.read_csv(train_path)
-    #         test_df = pd.read_csv(test_path)
-
-    #         train_array = train_df.to_numpy()
-    #         test_array = test_df.to_numpy()
-
-    #         # ✅ Train new model
-    #         new_r2 = trainer.initiate_model_trainer(train_array, test_array)
-
-    #         if new_r2 > 0.6:
-    #             # ✅ Load new model
-    #             new_model = load_object(self.model_path)
-
-    #             # ✅ Log new model to MLflow and register it
-    #             with mlflow.start_run(run_name="New Best Model"):
-    #                 input_example = pd.DataFrame(test_array[:, :-1][:5])  # Sample 5 rows
-    #                 signature = infer_signature(test_array[:, :-1], new_model.predict(test_array[:, :-1]))
-
-    #                 mlflow.sklearn.log_model(
-    #                     new_model,
-    #                     "best_model",
-    #                     registered_model_name="Best_Maths_Model",  # ✅ Registering model in MLflow
-    #                     signature=signature,
-    #                     input_example=input_example
-    #                 )
-
-    #             # ✅ Save the new model locally
-    #             save_object(self.model_path, new_model)
-    #             logger.info("✅ New model trained, registered in MLflow, and saved successfully!")
-    #         else:
-    #             logger.warning("🚨 Retrained model did not improve performance!")
-
-    #     except Exception as e:
-    #         logger.error(f"Error during model retraining: {str(e)}")
-    #         raise CustomException(e, sys)
+    def retrain_model(self, new_data_path, config: RetrainConfig = None):
+        """
+        Append newly labelled rows to the training set and retrain.
+
+        The appended training set only replaces `train_data_path` once a retrained model has
+        been saved; a failed retrain leaves it untouched. Files already appended (same content)
+        are recorded and skipped, so a repeated trigger does not duplicate rows.
+
+        In "incremental" mode the fitted preprocessor is reused and the current model keeps
+        training (see continue_training). A full retrain (refit preprocessor + candidate
+        search) runs instead when the new rows drift from the training set, or when the
+        incremental model scores below min_r2. Returns the metrics, mode and wall time.
+        """
+        config = config or RetrainConfig()
+        if config.mode not in RETRAIN_MODES:
+            raise ValueError(f"Unknown retrain mode '{config.mode}', expected one of {RETRAIN_MODES}")
+
+        try:
+            started = time.perf_counter()
+            ledger_path = _ingested_ledger_path(config.train_data_path)
+            ledger = {}
+            if os.path.exists(ledger_path):
+                with open(ledger_path) as file_obj:
+                    ledger = json.load(file_obj)
+            new_digest = _file_digest(new_data_path)
+            if new_digest in ledger:
+                logger.info("Skipping retrain: %s was already appended to %s", new_data_path, config.train_data_path)
+                return {"mode": "skipped", "reason": f"{new_data_path} was already ingested", "new_rows": 0}
+
+            new_df = load_frame(new_data_path)
+            train_df = load_frame(config.train_data_path)
+            if TARGET_COLUMN not in new_df.columns:
+                raise ValueError(f"Target column '{TARGET_COLUMN}' not found in new data!")
+
+            drift = detect_drift(train_df, new_df, self.preprocessor, config.psi_threshold)
+
+            # ✅ The appended training set is staged next to the real one and only committed with the new model
+            train_df = pd.concat([train_df, new_df], ignore_index=True)
+            staged_path = _staged_path(config.train_data_path)
+            save_frame(train_df, staged_path)
+            try:
+                result, reason = None, "full mode requested"
+                if config.mode == "incremental":
+                    if drift["drifted"]:
+                        reason = (f"drift detected (columns: {drift['drifted_columns']}, "
+                                  f"unseen categories: {drift['unseen_categories']}, schema changed: {drift['schema_changed']})")
+                    else:
+                        result = self._retrain_incremental(train_df, config)
+                        if result["r2"] < config.min_r2:
+                            reason = f"incremental model R2 {result['r2']:.4f} below {config.min_r2}"
+                            result = None
+
+                if result is None:
+                    logger.warning(f"🚨 Falling back to full retrain: {reason}")
+                    result = self._retrain_full(config, staged_path)
+                    result["reason"] = reason
+
+                # A model trained on the appended rows is saved: they are part of the training set now
+                os.replace(staged_path, config.train_data_path)
+            finally:
+                if os.path.exists(staged_path):
+                    os.remove(staged_path)
+            logger.info(f"Appended {len(new_df)} labelled rows to {config.train_data_path} ({len(train_df)} rows)")
+
+            ledger[new_digest] = {"path": new_data_path, "rows": len(new_df), "ingested_at": time.time()}
+            with open(f"{ledger_path}.tmp", "w") as file_obj:
+                json.dump(ledger, file_obj)
+            os.replace(f"{ledger_path}.tmp", ledger_path)
+
+            result["seconds"] = time.perf_counter() - started
+            result["drift"] = drift
+            logger.info(f"✅ {result['mode'].capitalize()} retrain ({result['strategy']}) finished in "
+                        f"{result['seconds']:.2f}s with R2 Score={result['r2']:.4f}")
+
+            self.tracker.log_run(
+                self.experiment_name,
+                f"{result['mode'].capitalize()} Retrain",
+                params={"mode": result["mode"], "strategy": result["strategy"], "new_rows": len(new_df)},
+                metrics={"retrain_seconds": result["seconds"], "rmse": result["rmse"], "mae": result["mae"], "r2": result["r2"]},
+            )
+            return result
+
+        except Exception as e:
+            logger.error(f"Error during model retraining: {str(e)}")
+            raise CustomException(e, sys)
+
+    def _split_xy(self, df):
+        X = self.preprocessor.transform(df.drop(columns=[TARGET_COLUMN]))
+        return X, df[TARGET_COLUMN].to_numpy(dtype=np.float64)
+
+    def _retrain_incremental(self, train_df, config):
+        """Continue the current model on the appended training set, reusing the fitted preprocessor."""
+        X_train, y_train = self._split_xy(train_df)
+        X_test, y_test = self._split_xy(load_frame(config.test_data_path))
+
+        # Work on a copy so the serving model is untouched if the result is rejected
+        model, strategy = continue_training(copy.deepcopy(self.model), X_train, y_train, config.extra_rounds)
+        rmse, mae, r2 = eval_metrics(y_test, model.predict(model_input(model, X_test)))
+        if r2 < config.min_r2:
+            return {"mode": "incremental", "strategy": strategy, "rmse": rmse, "mae": mae, "r2": r2}
+
+        # Keep the artifact in the format the trainer chose (a model's native format fits the same model type)
+        save_object(self.model_path, model, fmt="auto" if artifact_format(self.model_path) != "pickle" else "pickle")
+        write_release(self.model_path, self.preprocessor_path)
+        self.model = model
+
+        # ✅ Register the updated model under its candidate name, as ModelTrainer does
+        names = {type(estimator): name for name, _, estimator in ModelTrainer().get_candidate_models()}
+        self.tracker.log_run(
+            self.experiment_name,
+            "Incrementally Retrained Model",
+            model=model,
+            artifact_path="best_model",
+            registered_model_name=names.get(type(model), type(model).__name__),
+        )
+        return {"mode": "incremental", "strategy": strategy, "rmse": rmse, "mae": mae, "r2": r2}
+
+    def _retrain_full(self, config, train_data_path):
+        """
+        Refit the preprocessor and rerun the candidate search on the appended training set.
+        Both are written to staging paths and only replace the live pair once the trainer
+        has accepted the new model, so a rejected retrain leaves the served artifacts as they were.
+        """
+        transformation_config = config.transformation_config or DataTransformationConfig(preprocessor_obj_file_path=self.preprocessor_path)
+        trainer_config = config.trainer_config or ModelTrainerConfig(trained_model_file_path=self.model_path)
+        preprocessor_path = transformation_config.preprocessor_obj_file_path
+        model_path = trainer_config.trained_model_file_path
+        staged_preprocessor_path, staged_model_path = _staged_path(preprocessor_path), _staged_path(model_path)
+
+        try:
+            transformation = DataTransformation(replace(transformation_config, preprocessor_obj_file_path=staged_preprocessor_path))
+            X_train, y_train, X_test, y_test, _ = transformation.initiate_data_transformation(
+                train_data_path, config.test_data_path
+            )
+            trainer = ModelTrainer(replace(trainer_config, trained_model_file_path=staged_model_path))
+            trainer.initiate_model_trainer(X_train, y_train, X_test, y_test)  # Raises below the R2 gate
+
+            # ✅ Accepted: move the pair into place, then release it
+            promote_object(staged_preprocessor_path, preprocessor_path)
+            promote_object(staged_model_path, model_path)
+            write_release(model_path, preprocessor_path)
+        finally:
+            discard_object(staged_preprocessor_path)
+            discard_object(staged_model_path)
+
+        self.preprocessor = load_object(preprocessor_path)
+        self.model = load_object(model_path)
+        rmse, mae, r2 = eval_metrics(y_test, self.model.predict(model_input(self.model, X_test)))
+        return {"mode": "full", "strategy": "candidate search", "rmse": rmse, "mae": mae, "r2": r2}
@@ -1,9 +1,9 @@
 import os
 import sys
+import time
 from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from urllib.parse import urlparse
-import mlflow
-import mlflow.sklearn
 import numpy as np
 import pandas as pd
 from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
@@ -19,85 +19,177 @@ from xgboost import XGBRegressor
 from mlflow.models.signature import infer_signature
 
 from src.mlproject.exception import CustomException
-from src.mlproject.logger import logging
-from src.mlproject.utils import save_object
+from src.mlproject.logger import logging, stop_at_worker_exit
+from src.mlproject.utils import save_object, model_input
+from src.mlproject import metrics
+from src.mlproject.tracking import get_tracker
+from src.mlproject.components.model_tuner import ModelTuner, ModelTunerConfig
+
+# Estimator parameter that controls its internal thread count
+THREAD_PARAMS = {
+    RandomForestRegressor: "n_jobs",
+    XGBRegressor: "n_jobs",
+    CatBoostRegressor: "thread_count",
+}
+
+EXECUTION_BACKENDS = ("serial", "thread", "process")
+
 
 @dataclass
 class ModelTrainerConfig:
-    trained_model_file_path = os.path.join("artifacts", "best_model.pkl")
+    trained_model_file_path: str = os.path.join("artifacts", "best_model.pkl")
+    execution_backend: str = "serial"  # "serial", "thread" or "process"
+    max_workers: int = None  # Candidates trained at once (defaults to all, capped by cpu_budget)
+    cpu_budget: int = None  # Cores shared by all candidates (defaults to os.cpu_count())
+    random_state: int = 42
+    tune_hyperparameters: bool = False  # Successive-halving search instead of the fixed params
+    tuner_config: ModelTunerConfig = None
+    model_format: str = "auto"  # "auto" = XGBoost UBJ / CatBoost cbm, joblib otherwise; or "pickle", "joblib", "native"
+    compress: int = 0  # joblib compression level; 0 keeps the arrays memory-mappable on load
+
+
+def eval_metrics(actual, pred):
+    """Calculate RMSE, MAE, and R2 Score."""
+    rmse = np.sqrt(mean_squared_error(actual, pred))
+    mae = mean_absolute_error(actual, pred)
+    r2 = r2_score(actual, pred)
+    return rmse, mae, r2
+
+
+def train_candidate(model_name, params, model, X_train, y_train, X_test, y_test, n_threads=1, tuner_config=None):
+    """
+    Fit and evaluate a single candidate. Module level so it can run in a process pool.
+    `n_threads` caps the estimator's own parallelism so outer workers don't oversubscribe cores.
+    With `tuner_config` the fixed params are only the starting point for a successive-halving search.
+    """
+    logging.info(f"Training {model_name} with params: {params} ({n_threads} thread(s))")
+    started = time.perf_counter()
+
+    model.set_params(**params)
+    # CSR input is passed through unless the estimator cannot take it
+    X_train, X_test = model_input(model, X_train), model_input(model, X_test)
+    thread_param = THREAD_PARAMS.get(type(model))
+
+    if tuner_config is not None:
+        # The search parallelises over folds/candidates, so each fit stays single-threaded
+        if thread_param is not None:
+            model.set_params(**{thread_param: 1})
+        model, best_params, _ = ModelTuner(tuner_config).tune(model_name, model, X_train, y_train, n_jobs=n_threads)
+        params = {**params, **best_params}
+    else:
+        if thread_param is not None:
+            model.set_params(**{thread_param: n_threads})
+        with metrics.span(f"fit.{model_name}"):
+            model.fit(X_train, y_train)
+
+    predictions = model.predict(X_test)
+    rmse, mae, r2 = eval_metrics(y_test, predictions)
+    logging.info(f"{model_name} - RMSE: {rmse:.4f}, R2 Score: {r2:.4f}")
+
+    return {
+        "model_name": model_name,
+        "params": params,
+        "model": model,
+        "rmse": rmse,
+        "mae": mae,
+        "r2": r2,
+        "fit_seconds": time.perf_counter() - started,
+    }
+
+
+def select_best_model(results):
+    """Pick the highest R2; ties go to the earlier candidate, as in the serial loop."""
+    best = None
+    for result in results:
+        if best is None or result["r2"] > best["r2"]:
+            best = result
+    return best
+
 
 class ModelTrainer:
-    def __init__(self):
-        self.model_trainer_config = ModelTrainerConfig()
+    def __init__(self, config: ModelTrainerConfig = None):
+        self.model_trainer_config = config or ModelTrainerConfig()
 
-        # ✅ Set DagsHub as MLflow tracking server
-        mlflow.set_registry_uri("https://dagshub.com/SHAIK-07/practice.mlflow")
-        mlflow.set_experiment("Maths_Score_Prediction")
+        # ✅ MLflow runs go through the background tracker (DagsHub registry), off the training path
+        self.tracker = get_tracker()
+        self.experiment_name = "Maths_Score_Prediction"
 
     def eval_metrics(self, actual, pred):
         """Calculate RMSE, MAE, and R2 Score."""
-        rmse = np.sqrt(mean_squared_error(actual, pred))
-        mae = mean_absolute_error(actual, pred)
-        r2 = r2_score(actual, pred)
-        return rmse, mae, r2
-
-    def initiate_model_trainer(self, train_array, test_array):
+        return eval_metrics(actual, pred)
+
+    def get_candidate_models(self):
+        """Return the candidates as (name, params, estimator) in evaluation order."""
+        seed = self.model_trainer_config.random_state
+        return [
+            ("Random Forest", {"n_estimators": 100, "max_depth": None}, RandomForestRegressor(random_state=seed)),
+            ("Decision Tree", {"criterion": "squared_error", "max_depth": None}, DecisionTreeRegressor(random_state=seed)),
+            ("Gradient Boosting", {"learning_rate": 0.1, "n_estimators": 100, "subsample": 0.8}, GradientBoostingRegressor(random_state=seed)),
+            ("Linear Regression", {}, LinearRegression()),
+            ("XGBRegressor", {"learning_rate": 0.1, "n_estimators": 100, "use_label_encoder": False, "eval_metric": "logloss"}, XGBRegressor(random_state=seed)),
+            ("CatBoosting Regressor", {"depth": 6, "learning_rate": 0.05, "iterations": 100}, CatBoostRegressor(verbose=False, random_seed=seed, allow_writing_files=False)),
+            ("AdaBoost Regressor", {"learning_rate": 0.1, "n_estimators": 100}, AdaBoostRegressor(random_state=seed)),
+        ]
+
+    def train_candidates(self, X_train, y_train, X_test, y_test, models=None):
+        """Train and evaluate every candidate on the configured backend; results keep candidate order."""
+        config = self.model_trainer_config
+        if config.execution_backend not in EXECUTION_BACKENDS:
+            raise ValueError(f"Unknown execution backend '{config.execution_backend}', expected one of {EXECUTION_BACKENDS}")
+
+        models = models if models is not None else self.get_candidate_models()
+        cpu_budget = max(1, config.cpu_budget or os.cpu_count() or 1)
+
+        if config.execution_backend == "serial":
+            workers = 1
+        else:
+            workers = max(1, min(config.max_workers or len(models), len(models), cpu_budget))
+        n_threads = max(1, cpu_budget // workers)
+
+        logging.info(
+            f"Training {len(models)} candidates on '{config.execution_backend}' backend "
+            f"with {workers} worker(s) x {n_threads} thread(s)"
+        )
+
+        tuner_config = None
+        if config.tune_hyperparameters:
+            tuner_config = config.tuner_config or ModelTunerConfig(random_state=config.random_state)
+
+        jobs = [
+            (name, params, model, X_train, y_train, X_test, y_test, n_threads, tuner_config)
+            for name, params, model in models
+        ]
+
+        if workers == 1:
+            return [train_candidate(*job) for job in jobs]
+
+        if config.execution_backend == "thread":
+            executor = ThreadPoolExecutor(max_workers=workers)
+        else:
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=stop_at_worker_exit)  # Keep the workers' logs
+        with executor:
+            futures = [executor.submit(train_candidate, *job) for job in jobs]
+            return [future.result() for future in futures]
+
+    def initiate_model_trainer(self, X_train, y_train, X_test, y_test):
+        """Train the candidates on (X, y) as returned by DataTransformation; X may be CSR."""
         try:
-            logging.info("Splitting training and test input data")
-            X_train, y_train, X_test, y_test = (
-                train_array[:, :-1],
-                train_array[:, -1],
-                test_array[:, :-1],
-                test_array[:, -1],
-            )
+            # ✅ Train & Evaluate each model (serially or concurrently, see ModelTrainerConfig)
+            results = self.train_candidates(X_train, y_train, X_test, y_test)
+
+            # ✅ Queue MLflow runs in candidate order (logs models but does NOT register them)
+            for result in results:
+                self.tracker.log_run(
+                    self.experiment_name,
+                    f"{result['model_name']} Run",
+                    params=result["params"],
+                    metrics={"rmse": result["rmse"], "mae": result["mae"], "r2": result["r2"]},
+                    model=result["model"],
+                )
 
-            # ✅ Define models as a tuple list
-            models = [
-                ("Random Forest", {"n_estimators": 100, "max_depth": None}, RandomForestRegressor(), (X_train, y_train), (X_test, y_test)),
-                ("Decision Tree", {"criterion": "squared_error", "max_depth": None}, DecisionTreeRegressor(), (X_train, y_train), (X_test, y_test)),
-                ("Gradient Boosting", {"learning_rate": 0.1, "n_estimators": 100, "subsample": 0.8}, GradientBoostingRegressor(), (X_train, y_train), (X_test, y_test)),
-                ("Linear Regression", {}, LinearRegression(), (X_train, y_train), (X_test, y_test)),
-                ("XGBRegressor", {"learning_rate": 0.1, "n_estimators": 100, "use_label_encoder": False, "eval_metric": "logloss"}, XGBRegressor(), (X_train, y_train), (X_test, y_test)),
-                ("CatBoosting Regressor", {"depth": 6, "learning_rate": 0.05, "iterations": 100}, CatBoostRegressor(verbose=False), (X_train, y_train), (X_test, y_test)),
-                ("AdaBoost Regressor", {"learning_rate": 0.1, "n_estimators": 100}, AdaBoostRegressor(), (X_train, y_train), (X_test, y_test)),
-            ]
-
-            # ✅ Track model performances
-            model_scores = {}
-            best_model = None
-            best_model_name = None
-            best_model_r2 = -np.inf  # Initialize with a low value
-
-            # ✅ Train & Evaluate each model
-            for model_name, params, model, (X_train, y_train), (X_test, y_test) in models:
-                logging.info(f"Training {model_name} with params: {params}")
-
-                # Set parameters & train
-                model.set_params(**params)
-                model.fit(X_train, y_train)
-
-                # Predictions
-                predictions = model.predict(X_test)
-
-                # Evaluate
-                rmse, mae, r2 = self.eval_metrics(y_test, predictions)
-                model_scores[model_name] = r2  # Store R2 score
-
-                logging.info(f"{model_name} - RMSE: {rmse:.4f}, R2 Score: {r2:.4f}")
-
-                # ✅ Log to MLflow (but DO NOT register yet)
-                with mlflow.start_run(run_name=f"{model_name} Run"):
-                    mlflow.log_params(params)
-                    mlflow.log_metric("rmse", rmse)
-                    mlflow.log_metric("mae", mae)
-                    mlflow.log_metric("r2", r2)
-                    mlflow.sklearn.log_model(model, "model")  # ✅ Logs model but does NOT register
-
-                # ✅ Select the best model
-                if r2 > best_model_r2:
-                    best_model_r2 = r2
-                    best_model_name = model_name
-                    best_model = model
+            # ✅ Select the best model
+            best = select_best_model(results)
+            best_model, best_model_name, best_model_r2 = best["model"], best["model_name"], best["r2"]
 
             logging.info(f"Best Model: {best_model_name} with R2 Score: {best_model_r2}")
 
@@ -106,21 +198,27 @@ class ModelTrainer:
                 raise CustomException("No best model found with an acceptable R2 score.", sys)
 
             # ✅ Fix MLflow Warning (Add Model Signature & Input Example)
-            input_example = pd.DataFrame(X_test[:5])  # Take first 5 rows as example input
-            signature = infer_signature(X_test, best_model.predict(X_test))
+            example_rows = X_test[:5]
+            example_rows = example_rows.toarray() if hasattr(example_rows, "toarray") else np.asarray(example_rows)
+            input_example = pd.DataFrame(example_rows)  # Take first 5 rows as example input
+            signature = infer_signature(example_rows, best_model.predict(model_input(best_model, X_test[:5])))
 
             # ✅ Register Only the Best Model in MLflow Model Registry
-            with mlflow.start_run(run_name=f"Best Model: {best_model_name}"):
-                mlflow.sklearn.log_model(
-                    best_model,
-                    "best_model",
-                    registered_model_name=best_model_name,
-                    signature=signature,  # ✅ Adds model signature
-                    input_example=input_example  # ✅ Adds input example
-                )
+            self.tracker.log_run(
+                self.experiment_name,
+                f"Best Model: {best_model_name}",
+                model=best_model,
+                artifact_path="best_model",
+                registered_model_name=best_model_name,
+                signature=signature,  # ✅ Adds model signature
+                input_example=input_example  # ✅ Adds input example
+            )
 
             # ✅ Save the Best Model Locally
-            save_object(self.model_trainer_config.trained_model_file_path, best_model)
+            save_object(
+                self.model_trainer_config.trained_model_file_path, best_model,
+                fmt=self.model_trainer_config.model_format, compress=self.model_trainer_config.compress,
+            )
             logging.info(f"Best model saved to {self.model_trainer_config.trained_model_file_path}")
 
             return best_model_r2
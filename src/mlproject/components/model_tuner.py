@@ -0,0 +1,146 @@
+import math
+import time
+from dataclasses import dataclass
+
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401  (enables the Halving*SearchCV imports)
+from sklearn.model_selection import HalvingGridSearchCV, HalvingRandomSearchCV, ParameterGrid
+
+from src.mlproject.logger import logger
+
+
+# ✅ Per-model search spaces. The budget parameter (see RESOURCE_PARAMS) lists the
+# values an exhaustive grid would try; halving only uses its min/max.
+PARAM_SPACES = {
+    "Random Forest": {
+        "max_depth": [None, 8, 16],
+        "max_features": [1.0, "sqrt", 0.5],
+        "min_samples_leaf": [1, 2, 4],
+        "n_estimators": [8, 32, 128, 256],
+    },
+    "Decision Tree": {
+        "criterion": ["squared_error", "absolute_error"],
+        "max_depth": [None, 4, 8, 16],
+        "min_samples_leaf": [1, 2, 4, 8],
+    },
+    "Gradient Boosting": {
+        "learning_rate": [0.1, 0.05, 0.01],
+        "subsample": [0.6, 0.8, 1.0],
+        "max_depth": [2, 3, 4],
+        "n_estimators": [32, 64, 128, 256],
+    },
+    "Linear Regression": {},
+    "XGBRegressor": {
+        "learning_rate": [0.1, 0.05, 0.01],
+        "max_depth": [3, 6, 8],
+        "subsample": [0.8, 1.0],
+        "n_estimators": [32, 64, 128, 256],
+    },
+    "CatBoosting Regressor": {
+        "depth": [4, 6, 8],
+        "learning_rate": [0.1, 0.05, 0.01],
+        "iterations": [30, 50, 100],
+    },
+    "AdaBoost Regressor": {
+        "learning_rate": [0.1, 0.01, 0.5, 1.0],
+        "loss": ["linear", "square", "exponential"],
+        "n_estimators": [8, 16, 32, 64, 128, 256],
+    },
+}
+
+# Budget that successive halving grows between rungs: number of boosting rounds/trees where the
+# estimator has one, training samples otherwise
+RESOURCE_PARAMS = {
+    "Random Forest": "n_estimators",
+    "Gradient Boosting": "n_estimators",
+    "XGBRegressor": "n_estimators",
+    "CatBoosting Regressor": "iterations",
+    "AdaBoost Regressor": "n_estimators",
+}
+
+# Built-in early stopping on an internal validation split (no eval_set needed). Only Gradient
+# Boosting has one: XGBoost/CatBoost stop early only against an eval_set passed to fit(), which
+# the CV search cannot supply per fold, and the other candidates have no stopping criterion.
+EARLY_STOPPING_PARAMS = {
+    "Gradient Boosting": lambda rounds: {"n_iter_no_change": rounds, "validation_fraction": 0.1},
+}
+
+
+@dataclass
+class ModelTunerConfig:
+    search: str = "halving_grid"  # "halving_grid" or "halving_random"
+    n_candidates: int = 20  # Only used by halving_random
+    factor: int = 3  # Candidates kept per rung = 1 / factor, budget grows by factor
+    cv: int = 3
+    scoring: str = "r2"
+    n_jobs: int = -1
+    early_stopping_rounds: int = 10
+    min_samples_per_fold: int = 10  # Floor for the first rung when halving on n_samples
+    random_state: int = 42
+
+
+class ModelTuner:
+    """
+    Successive halving (Hyperband-style) search over PARAM_SPACES.
+
+    All candidates start on a small budget; each rung keeps the best 1/factor
+    and multiplies their budget by factor. The search refits the winner on the
+    full training set, and that estimator is returned as-is instead of being
+    fitted again.
+    """
+
+    def __init__(self, config: ModelTunerConfig = None):
+        self.config = config or ModelTunerConfig()
+
+    def tune(self, model_name, model, X_train, y_train, n_jobs=None):
+        """Return (fitted_best_estimator, best_params, search_seconds)."""
+        config = self.config
+        space = dict(PARAM_SPACES.get(model_name, {}))
+        started = time.perf_counter()
+
+        early_stopping = EARLY_STOPPING_PARAMS.get(model_name)
+        if early_stopping is not None and config.early_stopping_rounds:
+            model.set_params(**early_stopping(config.early_stopping_rounds))
+
+        if not space:
+            model.fit(X_train, y_train)
+            return model, {}, time.perf_counter() - started
+
+        resource = RESOURCE_PARAMS.get(model_name, "n_samples")
+        search_kwargs = {
+            "factor": config.factor,
+            "cv": config.cv,
+            "scoring": config.scoring,
+            "n_jobs": n_jobs if n_jobs is not None else config.n_jobs,
+            "random_state": config.random_state,
+            "refit": True,
+            "min_resources": "exhaust",  # Start small enough that the last rung gets the full budget
+        }
+        if resource != "n_samples":
+            budget = space.pop(resource)
+            model.set_params(**{resource: max(budget)})  # Estimator must expose the resource param
+            search_kwargs.update(resource=resource, max_resources=max(budget))
+        else:
+            # ✅ "exhaust" can start rungs on a handful of rows, too few to score every CV fold (NaN)
+            search_kwargs["min_resources"] = self._min_samples(space, X_train.shape[0])
+
+        if config.search == "halving_random":
+            search = HalvingRandomSearchCV(model, space, n_candidates=config.n_candidates, **search_kwargs)
+        else:
+            search = HalvingGridSearchCV(model, space, **search_kwargs)
+
+        search.fit(X_train, y_train)
+        elapsed = time.perf_counter() - started
+
+        logger.info(
+            f"Tuned {model_name} in {elapsed:.2f}s over {search.n_iterations_} rung(s) "
+            f"({search.n_candidates_} candidates): {search.best_params_}, CV {config.scoring}={search.best_score_:.4f}"
+        )
+        return search.best_estimator_, search.best_params_, elapsed
+
+    def _min_samples(self, space, n_samples):
+        """First-rung sample count: what "exhaust" would pick, but at least min_samples_per_fold per CV fold."""
+        config = self.config
+        n_candidates = config.n_candidates if config.search == "halving_random" else len(ParameterGrid(space))
+        n_rungs = 1 + math.floor(math.log(max(n_candidates, 1), config.factor))
+        exhaust = n_samples // config.factor ** (n_rungs - 1)
+        return min(max(exhaust, config.cv * config.min_samples_per_fold), n_samples)
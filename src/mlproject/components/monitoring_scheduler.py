@@ -0,0 +1,142 @@
+import os
+import time
+import queue
+import threading
+from datetime import datetime, timezone
+from dataclasses import dataclass, field
+
+from src.mlproject.logger import logger
+from src.mlproject.components.data_ingestion import DataIngestionConfig
+
+
+@dataclass
+class MonitoringSchedulerConfig:
+    eval_data_path: str = field(default_factory=lambda: DataIngestionConfig().test_data_path)
+    interval_seconds: float = 300.0  # Periodic evaluation interval, 0 disables the timer
+    max_queue_size: int = 8  # Pending event-driven evaluations; extra triggers are dropped
+    retrain_data_path: str = None  # Newly labelled rows used by request_retrain (see ModelMonitoring.retrain_model)
+
+
+def _default_monitor_factory():
+    # Imported lazily so the serving process does not pay for MLflow until the first run
+    from src.mlproject.components.model_monitoring import ModelMonitoring
+    return ModelMonitoring()
+
+
+class MonitoringScheduler:
+    """
+    Runs ModelMonitoring.evaluate_model on a background worker thread.
+
+    Evaluations are started periodically and on demand through `trigger()`,
+    which never blocks: when the bounded queue is full the trigger is dropped.
+    The result of the most recent run is cached and served by `latest()`.
+    `request_retrain()` queues ModelMonitoring.retrain_model on the same worker
+    (e.g. from DriftMonitor window triggers); see `latest_retrain()`.
+    """
+
+    def __init__(self, config: MonitoringSchedulerConfig = None, monitor_factory=None):
+        self.config = config or MonitoringSchedulerConfig()
+        self.monitor_factory = monitor_factory or _default_monitor_factory
+        self._queue = queue.Queue(maxsize=self.config.max_queue_size)
+        self._latest = None
+        self._latest_retrain = None
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="model-monitoring", daemon=True)
+        self._thread.start()
+        logger.info("Model monitoring scheduler started.")
+
+    def stop(self, timeout=None):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def trigger(self, reason="manual") -> bool:
+        """Queue an evaluation. Returns False if the queue is full and the trigger was dropped."""
+        return self._put("evaluate", reason)
+
+    def request_retrain(self, reason="manual") -> bool:
+        """Queue a retrain on retrain_data_path. Returns False if the trigger was dropped."""
+        return self._put("retrain", reason)
+
+    def _put(self, action, reason):
+        try:
+            self._queue.put_nowait((action, reason))
+            return True
+        except queue.Full:
+            logger.warning(f"Monitoring queue is full, dropping '{reason}' {action} trigger.")
+            return False
+
+    def latest(self):
+        """Return the cached result of the last evaluation, or None if none has run yet."""
+        return self._latest
+
+    def latest_retrain(self):
+        """Return the cached result of the last retrain, or None if none has run yet."""
+        return self._latest_retrain
+
+    def _run(self):
+        interval = self.config.interval_seconds
+        next_periodic = time.monotonic() + interval if interval > 0 else None
+
+        while not self._stop_event.is_set():
+            timeout = 1.0 if next_periodic is None else max(0.0, min(1.0, next_periodic - time.monotonic()))
+            try:
+                action, reason = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                if next_periodic is None or time.monotonic() < next_periodic:
+                    continue
+                action, reason = "evaluate", "periodic"
+
+            if action == "retrain":
+                self._retrain(reason)
+                continue
+            self._evaluate(reason)
+            if next_periodic is not None:
+                next_periodic = time.monotonic() + interval
+
+    def _evaluate(self, reason):
+        started = time.perf_counter()
+        metrics, error = None, None
+        try:
+            monitor = self.monitor_factory()
+            metrics = monitor.evaluate_model(self.config.eval_data_path)
+        except Exception as e:
+            error = str(e)
+            logger.error(f"Background model monitoring failed: {error}")
+
+        self._latest = {
+            "metrics": metrics,
+            "error": error,
+            "trigger": reason,
+            "evaluated_at": datetime.now(timezone.utc).isoformat(),
+            "duration_seconds": round(time.perf_counter() - started, 4),
+        }
+
+    def _retrain(self, reason):
+        started = time.perf_counter()
+        result, error = None, None
+        path = self.config.retrain_data_path
+        if not path or not os.path.exists(path):
+            error = f"No labelled data at retrain_data_path={path!r}"
+            logger.warning(f"Skipping '{reason}' retrain: {error}")
+        else:
+            try:
+                result = self.monitor_factory().retrain_model(path)
+            except Exception as e:
+                error = str(e)
+                logger.error(f"Background retraining failed: {error}")
+
+        self._latest_retrain = {
+            "result": result,
+            "error": error,
+            "trigger": reason,
+            "retrained_at": datetime.now(timezone.utc).isoformat(),
+            "duration_seconds": round(time.perf_counter() - started, 4),
+        }
@@ -0,0 +1,271 @@
+"""
+Model monitoring as a service: the MonitoringScheduler (periodic evaluation, retraining)
+and the streaming DriftMonitor, behind the /monitor endpoints of app.py.
+
+Monitoring state must live in exactly one process: one drift monitor seeing every event,
+one periodic evaluation per interval, at most one retrain writing best_model.pkl. Under
+gunicorn the master therefore starts this module as a sidecar process (gunicorn.conf.py)
+and the workers forward /monitor requests to it through MonitoringClient:
+
+    python -m src.mlproject.components.monitoring_service --port 9090
+
+Without MONITOR_SERVICE_URL, app.py runs a MonitoringService in its own process instead
+(`python app.py`, a single worker).
+"""
+import os
+import sys
+import json
+import signal
+import argparse
+import http.client
+import threading
+from urllib.parse import urlparse
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+from src.mlproject.components.monitoring_scheduler import MonitoringScheduler, MonitoringSchedulerConfig
+from src.mlproject.components.drift_monitor import DriftMonitor, DriftMonitorConfig
+from src.mlproject.components.data_ingestion import DataIngestionConfig
+from src.mlproject.pipelines.prediction_pipeline import validate_record, rows_frame
+from src.mlproject.utils import load_frame
+from src.mlproject.logger import logger
+from src.mlproject.exception import CustomException
+
+DEFAULT_PORT = 9090
+
+
+@dataclass
+class MonitoringServiceConfig:
+    scheduler_config: MonitoringSchedulerConfig = field(default_factory=MonitoringSchedulerConfig)
+    drift_config: DriftMonitorConfig = field(default_factory=DriftMonitorConfig)
+    reference_data_path: str = field(default_factory=lambda: DataIngestionConfig().train_data_path)
+    # Artifacts watched by the sidecar; a change queues a "model_reloaded" evaluation
+    watch_paths: tuple = (os.path.join("artifacts", "best_model.pkl"), os.path.join("artifacts", "preprocessor.pkl"))
+    watch_interval_seconds: float = 5.0
+
+
+def service_config_from_env():
+    """MonitoringServiceConfig from the same environment variables app.py has always read."""
+    return MonitoringServiceConfig(
+        scheduler_config=MonitoringSchedulerConfig(
+            interval_seconds=float(os.getenv("MONITOR_INTERVAL_SECONDS", "300")),
+            retrain_data_path=os.getenv("RETRAIN_DATA_PATH"),
+        ),
+        drift_config=DriftMonitorConfig(
+            window_size=int(os.getenv("DRIFT_WINDOW_SIZE", "1000")),
+            slide=int(os.getenv("DRIFT_WINDOW_SLIDE", "0")) or None,
+        ),
+    )
+
+
+class MonitoringService:
+    """
+    The /monitor API over one MonitoringScheduler and one DriftMonitor.
+
+    `handle(method, path, payload)` answers a request as (status_code, JSON body), the
+    same whether it is called in-process by app.py or through the sidecar's HTTP server.
+    """
+
+    def __init__(self, config: MonitoringServiceConfig = None, monitor_factory=None):
+        self.config = config or MonitoringServiceConfig()
+        self.scheduler = MonitoringScheduler(self.config.scheduler_config, monitor_factory)
+        self.drift_monitor = None
+        if os.path.exists(self.config.reference_data_path):
+            self.drift_monitor = DriftMonitor.from_reference_frame(
+                load_frame(self.config.reference_data_path),
+                self.config.drift_config,
+                on_retrain=lambda report: self.scheduler.request_retrain("window_drift"),
+            )
+        self._stop_event = threading.Event()
+        self._watcher = None
+
+    def start(self, watch=False):
+        """Start the scheduler; with `watch`, also poll the artifacts for a new model."""
+        self.scheduler.start()
+        if watch and self._watcher is None:
+            self._watcher = threading.Thread(target=self._watch, name="monitoring-watch", daemon=True)
+            self._watcher.start()
+
+    def stop(self, timeout=None):
+        self._stop_event.set()
+        self.scheduler.stop(timeout)
+
+    def _fingerprint(self):
+        try:
+            return tuple((os.stat(path).st_mtime_ns, os.stat(path).st_size) for path in self.config.watch_paths)
+        except OSError:
+            return None  # Not trained yet, or being rewritten
+
+    def _watch(self):
+        # In-process, ModelRegistry's reload listener does this; the sidecar has no registry
+        seen = self._fingerprint()
+        while not self._stop_event.wait(self.config.watch_interval_seconds):
+            current = self._fingerprint()
+            if current is not None and current != seen:
+                seen = current
+                self.scheduler.trigger("model_reloaded")
+
+    def handle(self, method, path, payload=None):
+        if (method, path) == ("POST", "/monitor/events"):
+            return self.record_events(payload)
+        route = {
+            ("GET", "/monitor"): self.monitor_status,
+            ("POST", "/monitor"): self.trigger_evaluation,
+            ("GET", "/monitor/drift"): self.drift_status,
+        }.get((method, path))
+        if route is None:
+            return 404, {"error": f"No route {method} {path}."}
+        return route()
+
+    def monitor_status(self):
+        latest = self.scheduler.latest()
+        if latest is None:
+            return 200, {"metrics": None, "status": "pending"}
+        return 200, latest
+
+    def trigger_evaluation(self):
+        if not self.scheduler.trigger("manual"):
+            return 429, {"error": "Monitoring queue is full, try again later."}
+        return 202, {"status": "queued"}
+
+    def record_events(self, events):
+        """
+        Ingest (features, prediction, actual) events: a JSON object or array of objects holding
+        the input fields plus "prediction" and "actual" (null while the label is unknown).
+        """
+        if self.drift_monitor is None:
+            return 503, {"error": f"No reference data at {self.config.reference_data_path}."}
+        try:
+            events = [events] if isinstance(events, dict) else events
+            if not events or not isinstance(events, list):
+                raise CustomException("Expected a JSON object or array of events.", sys)
+
+            # ✅ The same checks as /predict, before anything reaches the window state
+            rows = []
+            for index, event in enumerate(events):
+                row, error = validate_record(event)
+                if error is not None:
+                    raise CustomException(f"Event {index}: {error}", sys)
+                rows.append(row)
+
+            df = pd.DataFrame(events)
+            if "prediction" not in df.columns:
+                raise CustomException("Every event needs a 'prediction'.", sys)
+            actuals = df["actual"] if "actual" in df.columns else [None] * len(df)
+            reports = self.drift_monitor.record(
+                rows_frame(rows),
+                pd.to_numeric(df["prediction"], errors="coerce"),
+                pd.to_numeric(pd.Series(actuals), errors="coerce"),
+            )
+            return 202, {"recorded": len(df), "windows": reports}
+
+        except CustomException as e:
+            logger.error("Monitoring Events Error: %s", e)
+            return 400, {"error": str(e)}
+
+    def drift_status(self):
+        if self.drift_monitor is None:
+            return 503, {"error": f"No reference data at {self.config.reference_data_path}."}
+        return 200, {
+            "events": self.drift_monitor.events,
+            "window": self.drift_monitor.latest(),
+            "retrain": self.scheduler.latest_retrain(),
+        }
+
+
+class MonitoringClient:
+    """MonitoringService.handle() of the sidecar at `url`, for the serving workers."""
+
+    def __init__(self, url, timeout=10.0):
+        parsed = urlparse(url)
+        self.host, self.port = parsed.hostname, parsed.port or 80
+        self.timeout = timeout
+        self._local = threading.local()  # One keep-alive connection per serving thread
+
+    def handle(self, method, path, payload=None):
+        body = json.dumps(payload).encode("utf-8") if payload is not None else None
+        for attempt in range(2):
+            connection = getattr(self._local, "connection", None)
+            reused = connection is not None
+            if not reused:
+                connection = self._local.connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                connection.request(method, path, body=body, headers={"Content-Type": "application/json"})
+                response = connection.getresponse()
+                return response.status, json.loads(response.read() or b"null")
+            except (OSError, http.client.HTTPException, ValueError) as e:
+                connection.close()
+                self._local.connection = None
+                if not attempt and self._can_retry(method, reused, e):
+                    continue
+                logger.error("Monitoring service unavailable: %s", e)
+                return 503, {"error": "Monitoring service unavailable."}
+
+    @staticmethod
+    def _can_retry(method, reused, error):
+        """
+        Resending is only safe if the sidecar cannot have acted on the request: a POST that
+        timed out or failed mid-response may already have recorded its events or queued
+        its evaluation. A keep-alive connection the sidecar closed while idle fails before
+        any response byte arrives; a GET may be repeated after anything but a timeout.
+        """
+        if isinstance(error, TimeoutError):
+            return False
+        if reused and isinstance(error, (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError)):
+            return True
+        return method == "GET"
+
+
+def make_server(service, host="127.0.0.1", port=DEFAULT_PORT):
+    """HTTP server answering every request with `service.handle`; call serve_forever() on it."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _answer(self, payload=None):
+            status, body = service.handle(self.command, self.path.split("?", 1)[0], payload)
+            data = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            self._answer()
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                payload = json.loads(self.rfile.read(length)) if length else None
+            except ValueError:
+                payload = None  # Rejected by record_events as "Expected a JSON object or array"
+            self._answer(payload)
+
+        def log_message(self, format, *args):
+            logger.debug("monitoring service: " + format, *args)
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run model monitoring, drift tracking and retraining as a sidecar.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=int(os.getenv("MONITOR_SERVICE_PORT", str(DEFAULT_PORT))))
+    args = parser.parse_args()
+
+    # gunicorn's master stops the sidecar with SIGTERM; exit through the finally below
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    monitoring_service = MonitoringService(service_config_from_env())
+    monitoring_service.start(watch=True)
+    server = make_server(monitoring_service, args.host, args.port)
+    logger.info("Monitoring service listening on %s:%s", args.host, args.port)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        monitoring_service.stop(timeout=5)
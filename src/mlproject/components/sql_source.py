@@ -0,0 +1,315 @@
+import os
+import re
+import sys
+import json
+import queue
+import threading
+from contextlib import closing, contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import pymysql
+
+from src.mlproject.logger import logger
+from src.mlproject.exception import CustomException
+from src.mlproject.utils import host, user, password, database
+
+PLACEHOLDERS = {"format": "%s", "pyformat": "%s", "qmark": "?"}
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)?$")
+
+
+@dataclass
+class SQLSourceConfig:
+    table: str = "student"
+    columns: tuple = None  # None selects every column
+    fetch_size: int = 10_000  # Rows per fetchmany() round trip, and per yielded DataFrame
+    pool_size: int = 4  # Connections kept open, shared by the partition workers
+    partition_column: str = None  # Numeric key for range-partitioned parallel reads
+    n_partitions: int = 4
+    max_workers: int = 4
+    watermark_column: str = None  # Monotonic column (auto-increment id, updated_at) for incremental pulls
+    watermark_path: str = os.path.join("artifacts", "sql_watermarks.json")
+    paramstyle: str = "format"  # DB-API paramstyle of the driver: "format" (pymysql) or "qmark" (sqlite3)
+
+
+def mysql_connect():
+    """Open a pymysql connection (credentials from .env) whose cursors stream rows server-side."""
+    return pymysql.connect(
+        host=host, user=user, password=password, database=database, cursorclass=pymysql.cursors.SSCursor,
+    )
+
+
+class ConnectionPool:
+    """Thread-safe pool of DB-API connections, opened lazily up to `size`."""
+
+    def __init__(self, connect, size=4):
+        self._connect = connect
+        self.size = size
+        self.created = 0
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._connections = []
+
+    @contextmanager
+    def connection(self):
+        self._slots.acquire()
+        try:
+            try:
+                connection = self._idle.get_nowait()
+            except queue.Empty:
+                connection = self._connect()
+                with self._lock:
+                    self._connections.append(connection)
+                    self.created += 1
+            try:
+                yield connection
+            except BaseException:
+                # Failed or abandoned mid-query (e.g. an unread streaming result): don't reuse it
+                self._discard(connection)
+                raise
+            self._idle.put(connection)
+        finally:
+            self._slots.release()
+
+    def _discard(self, connection):
+        with self._lock:
+            if connection in self._connections:
+                self._connections.remove(connection)
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def close(self):
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            try:
+                connection.close()
+            except Exception:
+                pass
+        self._idle = queue.LifoQueue()
+
+
+class SQLSource:
+    """
+    Reads a table in DataFrame chunks through a connection pool.
+
+    With `partition_column`, the key range is split into `n_partitions` ranges
+    (plus one for NULL keys) that worker threads read in parallel; chunks come
+    back in completion order. With `watermark_column`, each pull only returns
+    rows above the stored watermark. The watermark is only advanced by
+    commit_watermark(), which the caller runs once the pulled rows are saved.
+    """
+
+    def __init__(self, config: SQLSourceConfig = None, connect=None):
+        self.config = config or SQLSourceConfig()
+        for identifier in [self.config.table, self.config.partition_column, self.config.watermark_column,
+                           *(self.config.columns or ())]:
+            if identifier is not None and not _IDENTIFIER.match(identifier):
+                raise ValueError(f"Invalid SQL identifier: {identifier!r}")
+        self._placeholder = PLACEHOLDERS[self.config.paramstyle]
+        self.pool = ConnectionPool(connect or mysql_connect, self.config.pool_size)
+        self.pending_watermark = None  # Upper bound of the last fully read pull, not committed yet
+
+    def close(self):
+        self.pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    # Watermark state -------------------------------------------------------
+
+    def _watermark_key(self):
+        return f"{self.config.table}.{self.config.watermark_column}"
+
+    def _load_watermarks(self):
+        if not os.path.exists(self.config.watermark_path):
+            return {}
+        with open(self.config.watermark_path) as file_obj:
+            return json.load(file_obj)
+
+    def watermark(self):
+        """Highest watermark value already ingested, or None before the first pull."""
+        return self._load_watermarks().get(self._watermark_key())
+
+    def commit_watermark(self):
+        """Advance the stored watermark past the last fully read pull; call it once its rows are saved."""
+        if self.pending_watermark is None:
+            return
+        self._save_watermark(self.pending_watermark)
+        logger.info(f"Watermark {self._watermark_key()} advanced to {self.pending_watermark!r}")
+        self.pending_watermark = None
+
+    def _save_watermark(self, value):
+        watermarks = self._load_watermarks()
+        watermarks[self._watermark_key()] = value
+        os.makedirs(os.path.dirname(self.config.watermark_path) or ".", exist_ok=True)
+        tmp_path = f"{self.config.watermark_path}.tmp"
+        with open(tmp_path, "w") as file_obj:
+            json.dump(watermarks, file_obj, indent=2, default=str)
+        os.replace(tmp_path, self.config.watermark_path)
+
+    # Queries -----------------------------------------------------------------
+
+    def _query(self, sql, params=()):
+        """Yield the result of one query as DataFrames of fetch_size rows on a pooled connection."""
+        with self.pool.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(sql, tuple(params))
+                columns = [col[0] for col in cursor.description]
+                while True:
+                    rows = cursor.fetchmany(self.config.fetch_size)
+                    if not rows:
+                        break
+                    yield pd.DataFrame(rows, columns=columns)
+            finally:
+                cursor.close()
+
+    def _fetch_one(self, sql, params=()):
+        # Drain the (single-row) result so the connection goes back to the pool
+        chunks = list(self._query(sql, params))
+        return tuple(chunks[0].iloc[0]) if chunks else ()
+
+    def _watermark_filter(self, upper=None):
+        """WHERE conditions/params restricting rows to (stored watermark, upper]."""
+        conditions, params = [], []
+        column, lower = self.config.watermark_column, self.watermark()
+        if column is None:
+            return conditions, params
+        if lower is not None:
+            conditions.append(f"{column} > {self._placeholder}")
+            params.append(lower)
+        if upper is not None:
+            conditions.append(f"{column} <= {self._placeholder}")
+            params.append(upper)
+        return conditions, params
+
+    def _select(self, conditions):
+        columns = ", ".join(self.config.columns) if self.config.columns else "*"
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        return f"SELECT {columns} FROM {self.config.table}{where}"
+
+    def _partition_queries(self, base_conditions, base_params):
+        """One (sql, params) per key range, plus one for NULL keys."""
+        column, p = self.config.partition_column, self._placeholder
+        bounds = self._fetch_one(
+            f"SELECT MIN({column}), MAX({column}) FROM {self.config.table}"
+            + (f" WHERE {' AND '.join(base_conditions)}" if base_conditions else ""),
+            base_params,
+        )
+        queries = [(self._select(base_conditions + [f"{column} IS NULL"]), base_params)]
+        if not bounds or bounds[0] is None or pd.isna(bounds[0]):
+            return queries
+
+        low, high = bounds
+        edges = np.linspace(float(low), float(high), self.config.n_partitions + 1)
+        if isinstance(low, (int, np.integer)):
+            edges = np.unique(np.floor(edges).astype(np.int64))
+        edges = [edge.item() for edge in edges]
+
+        for i, lower in enumerate(edges[:-1]):
+            last = i == len(edges) - 2
+            conditions = [f"{column} >= {p}", f"{column} {'<=' if last else '<'} {p}"]
+            queries.append((self._select(base_conditions + conditions), base_params + [lower, edges[i + 1]]))
+        if len(edges) == 1:  # Single key value
+            queries.append((self._select(base_conditions + [f"{column} = {p}"]), base_params + [edges[0]]))
+        return queries
+
+    def _iter_parallel(self, queries):
+        """Run the queries on worker threads, yielding chunks through a bounded queue."""
+        results = queue.Queue(maxsize=2 * self.config.max_workers)
+        stop = threading.Event()
+        done = object()
+
+        def put(item):
+            while not stop.is_set():
+                try:
+                    results.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def worker(sql, params):
+            try:
+                with closing(self._query(sql, params)) as chunks:
+                    for chunk in chunks:
+                        if not put(chunk):
+                            return
+                put(done)
+            except Exception as e:
+                put(e)
+
+        with ThreadPoolExecutor(max_workers=self.config.max_workers, thread_name_prefix="sql-source") as executor:
+            for sql, params in queries:
+                executor.submit(worker, sql, params)
+            try:
+                remaining = len(queries)
+                while remaining:
+                    item = results.get()
+                    if item is done:
+                        remaining -= 1
+                    elif isinstance(item, Exception):
+                        raise item
+                    else:
+                        yield item
+            finally:
+                stop.set()
+
+    def iter_chunks(self):
+        """
+        Yield the (new) rows as DataFrames. Once the iterator is exhausted the pull's upper
+        bound becomes `pending_watermark`; until commit_watermark() the same rows are pulled
+        again, so rows that were read but never saved are not skipped.
+        """
+        try:
+            config = self.config
+            upper = None
+            self.pending_watermark = None
+            if config.watermark_column:
+                # Snapshot the upper bound so rows inserted during the pull wait for the next one
+                conditions, params = self._watermark_filter()
+                where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+                upper = self._fetch_one(f"SELECT MAX({config.watermark_column}) FROM {config.table}{where}", params)[0]
+                if upper is None or pd.isna(upper):
+                    logger.info(f"No new rows in {config.table} above watermark {self.watermark()!r}")
+                    return
+                upper = upper.item() if hasattr(upper, "item") else upper
+
+            conditions, params = self._watermark_filter(upper)
+            if config.partition_column:
+                queries = self._partition_queries(conditions, params)
+                logger.info(f"Reading {config.table} in {len(queries)} partitions on {config.max_workers} worker(s)")
+                chunks = self._iter_parallel(queries)
+            else:
+                chunks = self._query(self._select(conditions), params)
+
+            rows = 0
+            for chunk in chunks:
+                rows += len(chunk)
+                yield chunk
+
+            logger.info(f"Read {rows} rows from {config.table}")
+            self.pending_watermark = upper
+
+        except Exception as e:
+            logger.error(f"Error reading from SQL source: {str(e)}")
+            raise CustomException(e, sys)
+
+    def read(self):
+        """Read every (new) row into one DataFrame, ordered by the partition key if there is one."""
+        chunks = list(self.iter_chunks())
+        if not chunks:
+            return pd.DataFrame(columns=list(self.config.columns or []))
+        df = pd.concat(chunks, ignore_index=True)
+        if self.config.partition_column and self.config.partition_column in df.columns:
+            df = df.sort_values(self.config.partition_column, kind="stable", ignore_index=True)
+        return df
@@ -6,8 +6,14 @@ def error_message_detail(error, error_detail: sys):
     Capture detailed error information including file name, line number, and stack trace.
     """
     _, _, exc_tb = error_detail.exc_info()
-    file_name = exc_tb.tb_frame.f_code.co_filename  # File where error occurred
-    line_number = exc_tb.tb_lineno  # Line number where error occurred
+    if exc_tb is not None:
+        file_name = exc_tb.tb_frame.f_code.co_filename  # File where error occurred
+        line_number = exc_tb.tb_lineno  # Line number where error occurred
+    else:
+        # Raised directly rather than from an except block: report the caller's location
+        caller = sys._getframe(2)
+        file_name = caller.f_code.co_filename
+        line_number = caller.f_lineno
 
     # Structured error message
     error_message = (
@@ -1,5 +1,9 @@
 import logging
+import logging.handlers
 import os
+import json
+import queue
+import atexit
 from datetime import datetime
 from pathlib import Path
 
@@ -17,18 +21,111 @@ Path(log_folder).mkdir(parents=True, exist_ok=True)  # Ensure directory exists
 # Define log file path (logs/YYYY-MM-DD/HH-MM-SS.log)
 LOG_FILE_PATH = os.path.join(log_folder, f"{current_time}.log")
 
+# ✅ Configurable from the environment
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text")  # "text" or "json" (one object per line)
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 2 ** 20)))  # Rotate past this size
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+
+TEXT_FORMAT = "[ %(asctime)s ] %(lineno)d %(name)s - %(levelname)s - %(message)s"
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, for log shippers."""
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "module": record.module,
+            "line": record.lineno,
+            "process": record.process,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    Hands the record to the listener thread as is. The stdlib prepare() formats the whole
+    line in the caller; here only the %-style message is resolved (its args may change
+    later), timestamps, formatting and the file write happen on the listener thread.
+    """
+
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def _file_handler(path):
+    # delay: processes that never log (e.g. idle pool workers) create no file
+    handler = logging.handlers.RotatingFileHandler(
+        path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, delay=True,
+    )
+    handler.setFormatter(JsonFormatter() if LOG_FORMAT == "json" else logging.Formatter(TEXT_FORMAT))
+    return handler
+
+
+def _start_listener(path):
+    global _listener
+    log_queue = queue.SimpleQueue()
+    _listener = logging.handlers.QueueListener(log_queue, _file_handler(path))
+    _listener.start()
+    return log_queue
+
+
+def _restart_after_fork():
+    """
+    fork() keeps the queue handler but not the listener thread. Each child (gunicorn
+    worker, process pool worker) gets a fresh queue and listener writing its own file,
+    since RotatingFileHandler cannot rotate a file shared between processes.
+    """
+    root, extension = os.path.splitext(LOG_FILE_PATH)
+    queue_handler.queue = _start_listener(f"{root}-{os.getpid()}{extension}")
+
+
+def stop():
+    """Write out everything still queued (at exit, or before a test inspects the file)."""
+    if _listener is not None and _listener._thread is not None:
+        _listener.stop()
+
+
+def flush():
+    """Block until the records queued so far are written."""
+    if _listener is not None:
+        stop()
+        _listener.start()
+
+
+def stop_at_worker_exit():
+    """
+    ProcessPoolExecutor initializer. Pool workers leave through os._exit, which skips the
+    atexit stop(); multiprocessing still runs its own finalizers first, so stop there.
+    (gunicorn workers call stop() from the worker_exit hook in gunicorn.conf.py.)
+    """
+    import multiprocessing.util
+    multiprocessing.util.Finalize(None, stop, exitpriority=0)
+
+
 # Create logger (use a separate variable instead of overwriting `logging`)
 logger = logging.getLogger("mlproject_logger")
-logger.setLevel(logging.INFO)  # Set logging level
+logger.setLevel(LOG_LEVEL)  # Set logging level
+
+_listener = None
+queue_handler = None
 
 # Prevent duplicate logs
 if not logger.hasHandlers():
-    # Create file handler
-    file_handler = logging.FileHandler(LOG_FILE_PATH)
-    file_handler.setFormatter(logging.Formatter("[ %(asctime)s ] %(lineno)d %(name)s - %(levelname)s - %(message)s"))
-
-    # Add handler to logger
-    logger.addHandler(file_handler)
+    # ✅ Callers only enqueue; a background QueueListener formats and writes the rotating file
+    queue_handler = _QueueHandler(_start_listener(LOG_FILE_PATH))
+    logger.addHandler(queue_handler)
+    atexit.register(stop)
+    os.register_at_fork(after_in_child=_restart_after_fork)
 
     # Prevent log propagation to root logger
     logger.propagate = False
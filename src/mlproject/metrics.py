@@ -0,0 +1,178 @@
+import os
+import time
+import functools
+import bisect
+import threading
+import contextlib
+
+from src.mlproject.logger import logger
+
+# 🔹 In-process timing metrics, rendered in the Prometheus text format by /metrics
+#
+# Disabled unless METRICS_ENABLED=1 (or enable() is called): span() then returns one
+# shared no-op context manager, so instrumented hot paths pay a function call and a
+# flag check. Each process (e.g. each gunicorn worker) keeps its own counters.
+DEFAULT_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+_enabled = os.getenv("METRICS_ENABLED", "0") == "1"
+_NOOP = contextlib.nullcontext()
+
+
+def _format_labels(names, values):
+    if not names:
+        return ""
+    escaped = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for v in values)
+    return "{" + ",".join(f'{name}="{value}"' for name, value in zip(names, escaped)) + "}"
+
+
+class Histogram:
+    """Cumulative-bucket histogram with one series per label-value tuple."""
+
+    def __init__(self, name, documentation, label_names=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._series = {}  # labels -> [count per bucket (+Inf last), sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value, *labels):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def clear(self):
+        with self._lock:
+            self._series.clear()
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = {labels: (list(counts), total) for labels, (counts, total) in self._series.items()}
+        for labels, (counts, total) in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f"{self.name}_bucket{_format_labels(self.label_names + ('le',), labels + (le,))} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, labels)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, labels)} {cumulative}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name, documentation, label_names=()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *labels, amount=1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = dict(self._values)
+        for labels, value in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(self.label_names, labels)} {value}")
+        return lines
+
+
+class _Span:
+    __slots__ = ("name", "started")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        SPAN_SECONDS.observe(time.perf_counter() - self.started, self.name)
+        if exc_type is not None:
+            SPAN_ERRORS.inc(self.name)
+        return False
+
+
+SPAN_SECONDS = Histogram("mlproject_span_seconds", "Wall time of instrumented operations.", ("span",))
+SPAN_ERRORS = Counter("mlproject_span_errors_total", "Instrumented operations that raised.", ("span",))
+_metrics = [SPAN_SECONDS, SPAN_ERRORS]
+_collectors = []
+
+
+def enabled():
+    return _enabled
+
+
+def enable(flag=True):
+    global _enabled
+    _enabled = flag
+
+
+def span(name):
+    """`with span("predict"): ...` records the block's duration, or does nothing while disabled."""
+    if not _enabled:
+        return _NOOP
+    return _Span(name)
+
+
+def timed(name):
+    """Decorator form of span(), e.g. for Flask views."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def register_collector(collect):
+    """`collect()` returns {name: (kind, help, value)}, sampled at every scrape (e.g. cache gauges)."""
+    _collectors.append(collect)
+
+
+def render():
+    """All metrics in the Prometheus text exposition format."""
+    lines = []
+    for metric in _metrics:
+        lines.extend(metric.render())
+    for collect in _collectors:
+        try:
+            samples = collect()
+        except Exception as e:
+            logger.error("Metrics collector failed: %s", e)
+            continue
+        for name, (kind, documentation, value) in samples.items():
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name} {float(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def reset():
+    """Drop every recorded sample (tests, benchmarks); registered collectors are kept."""
+    for metric in _metrics:
+        metric.clear()
+
+
+def write_textfile(file_path):
+    """Write render() atomically, for batch jobs (training) that have no /metrics to scrape."""
+    tmp_path = f"{file_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w") as file_obj:
+        file_obj.write(render())
+    os.replace(tmp_path, file_path)
@@ -0,0 +1,88 @@
+import os
+import asyncio
+import threading
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+
+from src.mlproject.logger import logger
+
+
+@dataclass
+class InferenceExecutorConfig:
+    max_workers: int = None  # Threads running predictions (defaults to os.cpu_count())
+    max_queue_size: int = None  # Admitted requests waiting for a thread (defaults to 4 * max_workers)
+    timeout_seconds: float = 2.0  # Per request, queueing included
+
+
+class InferenceOverloaded(Exception):
+    """Raised instead of queueing when every worker thread and queue slot is taken."""
+
+
+class InferenceExecutor:
+    """
+    Runs blocking prediction work for an asyncio server on a sized thread pool.
+
+    At most max_workers + max_queue_size requests are admitted at once; anything
+    beyond that fails fast with InferenceOverloaded (-> 503) instead of piling up.
+    Each request gets `timeout_seconds`: a request still queued at its deadline is
+    cancelled and never runs, one already running keeps its slot until it finishes,
+    so the admission limit always reflects the real CPU backlog.
+    """
+
+    def __init__(self, config: InferenceExecutorConfig = None):
+        self.config = config or InferenceExecutorConfig()
+        self.max_workers = self.config.max_workers or os.cpu_count() or 1
+        self.capacity = self.max_workers + (
+            self.config.max_queue_size if self.config.max_queue_size is not None else 4 * self.max_workers
+        )
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="inference")
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.stats = {"completed": 0, "rejected": 0, "timeouts": 0, "errors": 0}
+
+    def _acquire(self):
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                self.stats["rejected"] += 1
+                return False
+            self._in_flight += 1
+            return True
+
+    def _release(self, _future=None):
+        with self._lock:
+            self._in_flight -= 1
+
+    async def run(self, fn, *args, submit=None):
+        """
+        Await fn(*args) on the pool. `submit` replaces the pool with any callable returning a
+        concurrent.futures.Future (e.g. MicroBatcher.submit), under the same limits.
+        """
+        if not self._acquire():
+            raise InferenceOverloaded(f"All {self.capacity} inference slots are busy.")
+        try:
+            future = submit() if submit is not None else self._pool.submit(fn, *args)
+        except BaseException:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+
+        try:
+            # Timing out cancels the wrapped future, which drops it if it has not started yet
+            result = await asyncio.wait_for(asyncio.wrap_future(future), self.config.timeout_seconds)
+        except asyncio.TimeoutError:
+            self.stats["timeouts"] += 1
+            raise TimeoutError(f"Prediction did not finish within {self.config.timeout_seconds}s.")
+        except Exception:
+            self.stats["errors"] += 1
+            raise
+        self.stats["completed"] += 1
+        return result
+
+    def snapshot(self):
+        with self._lock:
+            in_flight = self._in_flight
+        return {"max_workers": self.max_workers, "capacity": self.capacity, "in_flight": in_flight, **self.stats}
+
+    def shutdown(self, wait=True):
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+        logger.info("Inference executor stopped.")
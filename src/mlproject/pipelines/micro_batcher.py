@@ -0,0 +1,164 @@
+import sys
+import time
+import queue
+import threading
+from dataclasses import dataclass
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+import numpy as np
+import pandas as pd
+
+from src.mlproject.logger import logger
+from src.mlproject.exception import CustomException
+
+
+@dataclass
+class MicroBatcherConfig:
+    max_batch_size: int = 64  # Max rows per coalesced predict call
+    max_wait_ms: float = 5.0  # How long the first request in a batch waits for company
+    request_timeout_seconds: float = 10.0
+
+
+class _PendingRequest:
+    __slots__ = ("input_data", "future", "deadline")
+
+    def __init__(self, input_data: pd.DataFrame, timeout: float):
+        self.input_data = input_data
+        self.future = Future()
+        self.deadline = time.monotonic() + timeout  # The caller has given up by then
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent PredictionPipeline.predict calls into one vectorized
+    preprocessor.transform + model.predict.
+
+    A worker thread takes the first queued request, keeps collecting until
+    max_batch_size rows or max_wait_ms have been reached, scores the batch and
+    fans the predictions back out to each waiting caller.
+    """
+
+    def __init__(self, pipeline_provider, config: MicroBatcherConfig = None):
+        # pipeline_provider is called once per batch, e.g. ModelRegistry.get, so hot swaps apply
+        self.pipeline_provider = pipeline_provider
+        self.config = config or MicroBatcherConfig()
+        self._queue = queue.Queue()
+        self._stop_event = threading.Event()
+        self._thread = None
+        self.stats = {"batches": 0, "requests": 0, "rows": 0}
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+        logger.info(
+            f"Micro-batching enabled: max_batch_size={self.config.max_batch_size}, "
+            f"max_wait_ms={self.config.max_wait_ms}"
+        )
+
+    def stop(self, timeout=None):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def submit(self, input_data: pd.DataFrame, timeout: float = None) -> Future:
+        """Queue a request; it is dropped unscored if it is still queued after `timeout` seconds."""
+        request = _PendingRequest(input_data, self.config.request_timeout_seconds if timeout is None else timeout)
+        self._queue.put(request)
+        return request.future
+
+    def predict(self, input_data: pd.DataFrame):
+        """Drop-in replacement for PredictionPipeline.predict that goes through the batcher."""
+        future = self.submit(input_data)
+        try:
+            return future.result(timeout=self.config.request_timeout_seconds)
+        except CustomException:
+            raise
+        except FutureTimeoutError:
+            future.cancel()  # Not scored if it is still queued
+            raise CustomException(f"Prediction did not finish within {self.config.request_timeout_seconds}s.", sys)
+        except Exception as e:
+            raise CustomException(e, sys)
+
+    def _run(self):
+        max_wait = self.config.max_wait_ms / 1000.0
+
+        while not self._stop_event.is_set():
+            try:
+                first = self._queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+            batch = [first]
+            rows = len(first.input_data)
+            deadline = time.monotonic() + max_wait
+
+            while rows < self.config.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    request = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                batch.append(request)
+                rows += len(request.input_data)
+
+            self._process(batch)
+
+    def _process(self, batch):
+        # ✅ Requests whose caller timed out while they were queued are dropped, not scored
+        now = time.monotonic()
+        for request in batch:
+            if request.deadline <= now:
+                request.future.cancel()
+        batch = [request for request in batch if request.future.set_running_or_notify_cancel()]
+        if not batch:
+            return
+        try:
+            pipeline = self.pipeline_provider()
+        except Exception as e:
+            for request in batch:
+                request.future.set_exception(e)
+            return
+
+        self.stats["batches"] += 1
+        self.stats["requests"] += len(batch)
+        self.stats["rows"] += sum(len(request.input_data) for request in batch)
+
+        # Only requests with the same columns are concatenated, so a missing field
+        # still fails that request instead of being imputed as NaN
+        groups = {}
+        for request in batch:
+            groups.setdefault(tuple(request.input_data.columns), []).append(request)
+
+        for requests in groups.values():
+            self._predict_group(pipeline, requests)
+
+    def _predict_group(self, pipeline, requests):
+        if len(requests) == 1:
+            self._predict_single(pipeline, requests[0])
+            return
+
+        try:
+            combined = pd.concat([request.input_data for request in requests], ignore_index=True)
+            offsets = np.cumsum([len(request.input_data) for request in requests])[:-1]
+            predictions = np.split(pipeline.predict(combined), offsets)
+        except Exception:
+            # One bad request must not fail its neighbours: score them one by one
+            for request in requests:
+                self._predict_single(pipeline, request)
+            return
+
+        for request, prediction in zip(requests, predictions):
+            request.future.set_result(prediction)
+
+    @staticmethod
+    def _predict_single(pipeline, request):
+        try:
+            request.future.set_result(pipeline.predict(request.input_data))
+        except Exception as e:
+            request.future.set_exception(e)
@@ -0,0 +1,186 @@
+import os
+import sys
+import time
+import hashlib
+import threading
+from dataclasses import dataclass
+
+from src.mlproject.pipelines.prediction_pipeline import PredictionPipeline
+from src.mlproject.pipelines.prediction_cache import PredictionCache, PredictionCacheConfig
+from src.mlproject.components.lookup_table import LookupTable, metadata_path
+from src.mlproject.serialization import read_release, release_path_for, artifact_digest
+from src.mlproject.logger import logger
+from src.mlproject.exception import CustomException
+
+
+@dataclass
+class ModelRegistryConfig:
+    model_path: str = os.path.join("artifacts", "best_model.pkl")
+    preprocessor_path: str = os.path.join("artifacts", "preprocessor.pkl")
+    check_interval_seconds: float = 2.0  # How often artifacts are stat()-ed for changes
+    use_content_hash: bool = False  # Compare sha256 instead of (mtime, size)
+    cache_config: PredictionCacheConfig = None  # None disables the prediction cache
+    lookup_table_path: str = None  # Exported LookupTable; used only if it was exported from the current artifacts
+    release_path: str = None  # Release naming the model/preprocessor pair; defaults to release.json next to the model
+
+
+class ModelRegistry:
+    """
+    Keeps one warm PredictionPipeline per process and hot-swaps it when the
+    model or preprocessor artifact changes on disk.
+
+    The pipeline and its version are published together as a single tuple, so a
+    request always gets a fully loaded model/preprocessor pair. Requests already
+    holding the old pipeline finish with it.
+
+    When training has written a release (serialization.write_release), the version is
+    the release and a new pair is only published once both files match it: a model
+    saved while the preprocessor of the same run is not (or no longer) on disk is
+    never served. Without a release file, any change to either file is loaded. With `cache_config`, every pipeline
+    shares one PredictionCache, which is emptied when a new version is loaded.
+    """
+
+    def __init__(self, config: ModelRegistryConfig = None):
+        self.config = config or ModelRegistryConfig()
+        self._state = (None, None)  # (pipeline, version)
+        self._last_check = 0.0
+        self._reload_lock = threading.Lock()
+        self._listeners = []
+        self._unreleased = None  # (release, file fingerprint) whose files did not match the release
+        self.cache = PredictionCache(self.config.cache_config) if self.config.cache_config else None
+
+    @property
+    def version(self):
+        return self._state[1]
+
+    def add_reload_listener(self, callback):
+        """Register `callback(pipeline, version)` to be called after every successful load."""
+        self._listeners.append(callback)
+
+    def _file_fingerprint(self, path):
+        if self.config.use_content_hash:
+            digest = hashlib.sha256()
+            with open(path, "rb") as file_obj:
+                for block in iter(lambda: file_obj.read(1 << 20), b""):
+                    digest.update(block)
+            return digest.hexdigest()
+
+        stat = os.stat(path)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _fingerprint(self):
+        return (
+            self._file_fingerprint(self.config.model_path),
+            self._file_fingerprint(self.config.preprocessor_path),
+        )
+
+    def _release(self):
+        """(model sha256, preprocessor sha256) of the current release, or None if nothing was released."""
+        release = read_release(self.config.release_path or release_path_for(self.config.model_path))
+        if release is None:
+            return None
+        return (release["model"]["sha256"], release["preprocessor"]["sha256"])
+
+    def _matches_release(self, release):
+        return (artifact_digest(self.config.model_path), artifact_digest(self.config.preprocessor_path)) == release
+
+    def get(self) -> PredictionPipeline:
+        """Return the current warm pipeline, reloading it first if the artifacts changed."""
+        pipeline, _ = self._state
+        if pipeline is not None and time.monotonic() - self._last_check < self.config.check_interval_seconds:
+            return pipeline
+
+        # Only one thread checks/reloads; everyone else keeps serving the current pipeline.
+        if not self._reload_lock.acquire(blocking=pipeline is None):
+            return pipeline
+        try:
+            return self._refresh()
+        finally:
+            self._reload_lock.release()
+
+    def reload(self) -> PredictionPipeline:
+        """Force a reload from disk regardless of the artifact fingerprint."""
+        with self._reload_lock:
+            self._state = (self._state[0], None)
+            return self._refresh()
+
+    def _attach_lookup_table(self, pipeline):
+        path = self.config.lookup_table_path
+        if not path or not os.path.exists(metadata_path(path)):
+            return
+        try:
+            table = LookupTable.load(path)
+            if table.matches(self.config.model_path, self.config.preprocessor_path):
+                pipeline.attach_lookup_table(table)
+                logger.info("Serving in-domain predictions from lookup table %s", path)
+            else:
+                logger.warning("Lookup table %s was exported from other artifacts, using the live model.", path)
+        except Exception as e:
+            logger.error("Failed to load lookup table, using the live model: %s", e)
+
+    def _refresh(self) -> PredictionPipeline:
+        pipeline, version = self._state
+        self._last_check = time.monotonic()
+
+        try:
+            fingerprint = self._fingerprint()
+            release = self._release()
+        except FileNotFoundError as e:
+            if pipeline is not None:
+                logger.warning("Model artifact missing, keeping current model: %s", e)
+                return pipeline
+            raise CustomException("Model not found. Please train the model first.", sys)
+
+        new_version = fingerprint if release is None else release
+        if pipeline is not None and new_version == version:
+            return pipeline
+
+        try:
+            if release is not None and (release, fingerprint) != self._unreleased and not self._matches_release(release):
+                self._unreleased = (release, fingerprint)  # Hashed again only once the files or the release change
+            if release is not None and (release, fingerprint) == self._unreleased:
+                if pipeline is not None:
+                    return pipeline  # Training is between writing the two files; wait for its release
+                logger.warning("Artifacts do not match their release, serving them unversioned until the next release.")
+                new_version = None
+
+            new_pipeline = PredictionPipeline(self.config.model_path, self.config.preprocessor_path)
+            self._attach_lookup_table(new_pipeline)
+            # An artifact rewritten while we were reading it may be half of a new pair
+            if self._fingerprint() != fingerprint or self._release() != release:
+                if pipeline is not None:
+                    return pipeline  # Retried on the next check
+                new_version = None
+        except Exception as e:
+            if pipeline is not None:
+                logger.error("Failed to reload model, keeping current model: %s", e)
+                return pipeline
+            raise CustomException(e, sys)
+
+        if self.cache is not None:
+            new_pipeline.attach_cache(self.cache, new_version)  # A None version leaves caching off
+            self.cache.invalidate(new_version)
+        self._state = (new_pipeline, new_version)
+        logger.info("Model registry loaded a new model version: %s", new_version)
+
+        for callback in self._listeners:
+            try:
+                callback(new_pipeline, new_version)
+            except Exception as e:
+                logger.error("Model reload listener failed: %s", e)
+
+        return new_pipeline
+
+
+_registry = None
+_registry_lock = threading.Lock()
+
+
+def get_model_registry(config: ModelRegistryConfig = None) -> ModelRegistry:
+    """Return the process-wide registry, creating it on first use."""
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = ModelRegistry(config)
+    return _registry
@@ -0,0 +1,121 @@
+import time
+import math
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+
+@dataclass
+class PredictionCacheConfig:
+    max_entries: int = 10_000  # LRU bound; the least recently used prediction is evicted beyond it
+    ttl_seconds: float = 3600.0  # Entry lifetime, None or 0 keeps entries until evicted
+
+
+def canonical_key(row, columns):
+    """
+    Hashable key of a validated row (see validate_record): values in `columns` order,
+    numbers already coerced to float so "72", 72 and 72.0 share a key, NaN as None.
+    """
+    key = []
+    for column in columns:
+        value = row[column]
+        if isinstance(value, float) and math.isnan(value):
+            value = None
+        key.append(value)
+    return tuple(key)
+
+
+class PredictionCache:
+    """
+    Thread-safe LRU/TTL cache of single-row predictions for one model version at a time.
+
+    Lookups and stores carry the version of the pipeline that produced them (the
+    ModelRegistry fingerprint of best_model.pkl + preprocessor.pkl). `invalidate`
+    drops every entry and moves the cache to a new version; lookups and stores
+    from a pipeline still finishing a request on an older version bypass it.
+    """
+
+    def __init__(self, config: PredictionCacheConfig = None):
+        self.config = config or PredictionCacheConfig()
+        self._entries = OrderedDict()  # key -> (expires_at, prediction)
+        self._version = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def invalidate(self, version=None):
+        """Drop every entry and start caching for `version`."""
+        with self._lock:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self._version = version
+
+    def get_many(self, keys, version):
+        """Return the cached prediction (or None) for each key."""
+        now = time.monotonic()
+        results = []
+        with self._lock:
+            if self._version is None:
+                self._version = version
+            elif version != self._version:
+                self.misses += len(keys)
+                return [None] * len(keys)
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] is not None and entry[0] <= now:
+                    del self._entries[key]
+                    self.expirations += 1
+                    entry = None
+                if entry is None:
+                    self.misses += 1
+                    results.append(None)
+                else:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    results.append(entry[1])
+        return results
+
+    def put_many(self, keys, predictions, version):
+        ttl = self.config.ttl_seconds
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            if self._version is None:
+                self._version = version
+            elif version != self._version:
+                return  # Computed by a pipeline that has since been replaced
+            for key, prediction in zip(keys, predictions):
+                self._entries[key] = (expires_at, prediction)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.config.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.config.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+                "version": str(self._version) if self._version is not None else None,
+            }
+
+    def metrics(self):
+        """stats() as samples for metrics.register_collector."""
+        stats = self.stats()
+        return {
+            "mlproject_prediction_cache_entries": ("gauge", "Cached predictions.", stats["size"]),
+            "mlproject_prediction_cache_hits_total": ("counter", "Cache hits.", stats["hits"]),
+            "mlproject_prediction_cache_misses_total": ("counter", "Cache misses.", stats["misses"]),
+            "mlproject_prediction_cache_evictions_total": ("counter", "LRU evictions.", stats["evictions"]),
+            "mlproject_prediction_cache_expirations_total": ("counter", "TTL expirations.", stats["expirations"]),
+        }
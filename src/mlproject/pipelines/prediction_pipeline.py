@@ -1,12 +1,95 @@
 import sys
 import os
+import io
+import csv
+import json
 import pandas as pd
 import pickle
 import numpy as np
 
-from src.mlproject.utils import load_object
+from src.mlproject.utils import load_object, model_input
+from src.mlproject import metrics
 from src.mlproject.logger import logger
 from src.mlproject.exception import CustomException
+from src.mlproject.components.data_transformation import NUMERICAL_COLUMNS, CATEGORICAL_COLUMNS
+from src.mlproject.components.compiled_preprocessor import CompiledPreprocessor
+from src.mlproject.pipelines.prediction_cache import canonical_key
+
+INPUT_COLUMNS = NUMERICAL_COLUMNS + CATEGORICAL_COLUMNS
+DEFAULT_BATCH_CHUNK_SIZE = 1000
+
+
+def validate_record(record):
+    """
+    Check a single raw input record and normalise it into a row for the preprocessor.
+    Returns (row, None) on success or (None, error_message).
+    """
+    if isinstance(record, Exception):
+        return None, str(record)
+    if not isinstance(record, dict):
+        return None, "Expected an object with the student features."
+
+    missing = [column for column in INPUT_COLUMNS if column not in record]
+    if missing:
+        return None, f"Missing fields: {', '.join(missing)}"
+
+    row = {}
+    for column in NUMERICAL_COLUMNS:
+        value = record[column]
+        if value is None or value == "":
+            row[column] = np.nan  # Imputed by the preprocessor
+            continue
+        if isinstance(value, bool):
+            return None, f"Field '{column}' must be numeric."
+        try:
+            row[column] = float(value)
+        except (TypeError, ValueError):
+            return None, f"Field '{column}' must be numeric."
+
+    for column in CATEGORICAL_COLUMNS:
+        value = record[column]
+        if value is None or value == "":
+            row[column] = np.nan
+        elif isinstance(value, str):
+            row[column] = value
+        else:
+            return None, f"Field '{column}' must be a string."
+
+    return row, None
+
+
+def rows_frame(rows):
+    """DataFrame of validated rows in INPUT_COLUMNS order, as the preprocessor expects it."""
+    df = pd.DataFrame(rows, columns=INPUT_COLUMNS)
+    df[CATEGORICAL_COLUMNS] = df[CATEGORICAL_COLUMNS].astype(object)
+    return df
+
+
+def parse_batch_payload(body: bytes, content_type: str):
+    """
+    Yield raw records from a JSON array, NDJSON or CSV request body.
+    Unparseable NDJSON lines are yielded as ValueError instances so they are reported per row.
+    """
+    content_type = (content_type or "").split(";")[0].strip().lower()
+    text = body.decode("utf-8")
+
+    if content_type in ("application/x-ndjson", "application/ndjson", "application/jsonl"):
+        for line in text.splitlines():
+            if not line.strip():
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError as e:
+                yield ValueError(f"Invalid JSON line: {str(e)}")
+
+    elif content_type == "text/csv":
+        yield from csv.DictReader(io.StringIO(text))
+
+    else:
+        records = json.loads(text)
+        if not isinstance(records, list):
+            raise ValueError("Expected a JSON array of records.")
+        yield from records
 
 class PredictionPipeline:
     def __init__(self, model_path: str, preprocessor_path: str):
@@ -16,23 +99,181 @@ class PredictionPipeline:
             self.preprocessor = load_object(preprocessor_path)
             logger.info("Model and preprocessor loaded successfully!")
         except Exception as e:
-            logger.error(f"Error loading model or preprocessor: {str(e)}")
+            logger.error("Error loading model or preprocessor: %s", e)
             raise CustomException(e, sys)
 
+        # ✅ Fast path for single records; falls back to preprocessor.transform if the shape is unsupported
+        try:
+            self.compiled_preprocessor = CompiledPreprocessor.compile(self.preprocessor)
+        except ValueError as e:
+            logger.warning("Preprocessor could not be compiled, using the DataFrame path: %s", e)
+            self.compiled_preprocessor = None
+
+        # Optional shared PredictionCache, set by the ModelRegistry together with this model's version
+        self.cache = None
+        self.version = None
+        # Optional precomputed LookupTable of this model over the discrete input grid
+        self.lookup_table = None
+
+    def attach_cache(self, cache, version):
+        """Serve repeated records from `cache`; `version` identifies this model/preprocessor pair."""
+        self.cache, self.version = cache, version
+
+    def attach_lookup_table(self, table):
+        """Answer in-domain records from `table` (exported from this very model) instead of the estimator."""
+        self.lookup_table = table
+
+    @property
+    def _caching(self):
+        return self.cache is not None and self.version is not None
+
     def predict(self, input_data: pd.DataFrame):
+        if self.lookup_table is not None:
+            # ✅ One vectorised table read for in-domain rows; only the rest reach the cache/model
+            predictions, found = self.lookup_table.lookup_frame(input_data)
+            if found.all():
+                return predictions
+            if found.any():
+                predictions[~found] = self._predict_frame(input_data[~found])
+                return predictions
+        return self._predict_frame(input_data)
+
+    def _predict_frame(self, input_data):
+        if self._caching:
+            rows = [validate_record(record) for record in input_data.to_dict("records")]
+            if all(error is None for _, error in rows):
+                try:
+                    return self._predict_rows([row for row, _ in rows], use_table=False)
+                except Exception as e:
+                    logger.error("Error during prediction: %s", e)
+                    raise CustomException(e, sys)
+
         try:
             logger.info("Applying preprocessing to input data...")
-            transformed_data = self.preprocessor.transform(input_data)
+            with metrics.span("preprocess"):
+                transformed_data = self.preprocessor.transform(input_data)
             
             logger.info("Generating predictions...")
-            predictions = self.model.predict(transformed_data)
+            with metrics.span("predict"):
+                predictions = self.model.predict(model_input(self.model, transformed_data))
 
             return predictions
         
         except Exception as e:
-            logger.error(f"Error during prediction: {str(e)}")
+            logger.error("Error during prediction: %s", e)
+            raise CustomException(e, sys)
+
+    def predict_record(self, record: dict):
+        """
+        Predict a single raw record without building a DataFrame when possible.
+        Raises CustomException for a record validate_record rejects (missing field, bad type).
+        """
+        row, error = validate_record(record)
+        if error is not None:
+            raise CustomException(error, sys)
+
+        if self.lookup_table is not None:
+            prediction = self.lookup_table.lookup(row)
+            if prediction is not None:
+                return np.array([prediction])
+        if self._caching:
+            key = canonical_key(row, INPUT_COLUMNS)
+            cached = self.cache.get_many([key], self.version)[0]
+            if cached is not None:
+                return np.array([cached])
+            prediction = self._predict_record(row)
+            self.cache.put_many([key], prediction, self.version)
+            return prediction
+        return self._predict_record(row)
+
+    def _predict_record(self, row):
+        try:
+            if self.compiled_preprocessor is None:
+                return self._transform_and_predict([row])
+            with metrics.span("preprocess"):
+                features = self.compiled_preprocessor.transform_record(row).reshape(1, -1)
+            with metrics.span("predict"):
+                return self.model.predict(features)
+        except Exception as e:
+            logger.error("Error during prediction: %s", e)
             raise CustomException(e, sys)
 
+    def predict_batch(self, records, chunk_size: int = DEFAULT_BATCH_CHUNK_SIZE):
+        """
+        Score an iterable of raw records, one preprocessor.transform and model.predict per chunk.
+        Yields {"index", "prediction"} or {"index", "error"} per record, in input order.
+        """
+        chunk_size = max(1, int(chunk_size))
+        chunk = []
+
+        for index, record in enumerate(records):
+            chunk.append((index, record))
+            if len(chunk) >= chunk_size:
+                yield from self._predict_chunk(chunk)
+                chunk = []
+
+        if chunk:
+            yield from self._predict_chunk(chunk)
+
+    def _predict_chunk(self, chunk):
+        results = {}
+        valid_indices, valid_rows = [], []
+
+        for index, record in chunk:
+            row, error = validate_record(record)
+            if error is not None:
+                results[index] = {"index": index, "error": error}
+            else:
+                valid_indices.append(index)
+                valid_rows.append(row)
+
+        if valid_rows:
+            try:
+                predictions = self._predict_rows(valid_rows)
+                for index, prediction in zip(valid_indices, predictions):
+                    results[index] = {"index": index, "prediction": float(prediction)}
+            except Exception:
+                # Isolate the failing rows instead of failing the whole chunk
+                for index, row in zip(valid_indices, valid_rows):
+                    try:
+                        results[index] = {"index": index, "prediction": float(self._predict_rows([row])[0])}
+                    except Exception as e:
+                        results[index] = {"index": index, "error": str(e)}
+
+        for index, _ in chunk:
+            yield results[index]
+
+    def _predict_rows(self, rows, use_table=True):
+        """Predict validated rows: lookup table first, then the cache, the model only for what is left."""
+        use_table = use_table and self.lookup_table is not None
+        if not self._caching and not use_table:
+            return self._transform_and_predict(rows)
+
+        predictions = self.lookup_table.lookup_rows(rows) if use_table else [None] * len(rows)
+        pending = [i for i, prediction in enumerate(predictions) if prediction is None]
+
+        keys = {}
+        if pending and self._caching:
+            keys = {i: canonical_key(rows[i], INPUT_COLUMNS) for i in pending}
+            for i, prediction in zip(pending, self.cache.get_many(list(keys.values()), self.version)):
+                predictions[i] = prediction
+            pending = [i for i in pending if predictions[i] is None]
+
+        if pending:
+            computed = self._transform_and_predict([rows[i] for i in pending])
+            if keys:
+                self.cache.put_many([keys[i] for i in pending], computed, self.version)
+            for i, prediction in zip(pending, computed):
+                predictions[i] = prediction
+        return np.asarray(predictions, dtype=float)
+
+    def _transform_and_predict(self, rows):
+        df = rows_frame(rows)
+        with metrics.span("preprocess"):
+            features = model_input(self.model, self.preprocessor.transform(df))
+        with metrics.span("predict"):
+            return self.model.predict(features)
+
 # if __name__ == "__main__":
 #     try:
 #         # Example Input Data (Modify this based on your dataset)
@@ -0,0 +1,105 @@
+import os
+import json
+import hashlib
+import inspect
+from dataclasses import dataclass
+
+from src.mlproject.logger import logger
+
+
+@dataclass
+class StageCacheConfig:
+    cache_dir: str = os.path.join("artifacts", ".stage_cache")
+
+
+def file_digest(path):
+    """sha256 of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as file_obj:
+        for block in iter(lambda: file_obj.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def code_digest(*objects):
+    """sha256 of the source code of the given modules/classes/functions."""
+    digest = hashlib.sha256()
+    for obj in objects:
+        digest.update(inspect.getsource(obj).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class StageCache:
+    """
+    In-process equivalent of DVC stages for the training pipeline.
+
+    A stage's fingerprint is the hash of its input files, its config and the
+    source code that implements it. If the fingerprint matches the last
+    successful run and the recorded outputs are still on disk unchanged, the
+    stage is skipped and its stored result reused.
+    """
+
+    def __init__(self, config: StageCacheConfig = None):
+        self.config = config or StageCacheConfig()
+
+    def _manifest_path(self, stage):
+        return os.path.join(self.config.cache_dir, f"{stage}.json")
+
+    def fingerprint(self, inputs=(), config=None, code=()):
+        digest = hashlib.sha256()
+        for path in inputs:
+            digest.update(path.encode("utf-8"))
+            digest.update(file_digest(path).encode("utf-8"))
+        digest.update(json.dumps(config or {}, sort_keys=True, default=str).encode("utf-8"))
+        digest.update(code_digest(*code).encode("utf-8") if code else b"")
+        return digest.hexdigest()
+
+    def lookup(self, stage, fingerprint):
+        """Return the stored result for a cache hit, or None."""
+        path = self._manifest_path(stage)
+        if not os.path.exists(path):
+            return None
+
+        with open(path) as file_obj:
+            manifest = json.load(file_obj)
+
+        if manifest.get("fingerprint") != fingerprint:
+            return None
+        for output, recorded in manifest.get("outputs", {}).items():
+            if not os.path.exists(output) or file_digest(output) != recorded:
+                return None
+        return manifest
+
+    def store(self, stage, fingerprint, outputs=(), result=None):
+        os.makedirs(self.config.cache_dir, exist_ok=True)
+        manifest = {
+            "stage": stage,
+            "fingerprint": fingerprint,
+            "outputs": {output: file_digest(output) for output in outputs},
+            "result": result,
+        }
+        tmp_path = f"{self._manifest_path(stage)}.tmp"
+        with open(tmp_path, "w") as file_obj:
+            json.dump(manifest, file_obj, indent=2, default=str)
+        os.replace(tmp_path, self._manifest_path(stage))
+
+    def run(self, stage, compute, inputs=(), config=None, code=(), outputs=(), force=False):
+        """
+        Run `compute()` unless the stage is cached. `compute` returns a JSON-serialisable
+        result, which is also what a cache hit returns. `outputs` may be a callable that
+        maps that result to the output paths, for stages whose file names depend on the data.
+        """
+        fingerprint = self.fingerprint(inputs, config, code)
+
+        if not force:
+            manifest = self.lookup(stage, fingerprint)
+            if manifest is not None:
+                logger.info(f"[stage cache] {stage}: HIT ({fingerprint[:12]}), reusing stored outputs")
+                return manifest["result"]
+            logger.info(f"[stage cache] {stage}: MISS ({fingerprint[:12]})")
+        else:
+            logger.info(f"[stage cache] {stage}: FORCED ({fingerprint[:12]})")
+
+        result = compute()
+        self.store(stage, fingerprint, outputs(result) if callable(outputs) else outputs, result)
+        return result
@@ -1,31 +1,119 @@
+import os
 import sys
+import argparse
+from dataclasses import asdict
+
+import numpy as np
+
+from src.mlproject.components import (
+    data_ingestion, data_transformation, incremental_preprocessor, model_trainer, model_tuner, sql_source,
+)
 from src.mlproject.components.data_ingestion import DataIngestion
 from src.mlproject.components.data_transformation import DataTransformation
 from src.mlproject.components.model_trainer import ModelTrainer
+from src.mlproject.pipelines.stage_cache import StageCache
+from src.mlproject.serialization import write_release
+from src.mlproject.utils import load_features
+from src.mlproject import metrics
 from src.mlproject.logger import logger
 from src.mlproject.exception import CustomException
 
-def run_training_pipeline():
+STAGES = ("ingestion", "transformation", "training")
+
+
+def run_training_pipeline(force=(), use_cache=True):
+    """
+    Run ingestion -> transformation -> training. Each stage is skipped when its inputs,
+    config and code are unchanged since the last run (see StageCache); `force` lists
+    stages to rerun anyway ("all" for every stage).
+    """
     try:
         logger.info(">>>>> Training Pipeline Started <<<<<")
+        force = set(STAGES) if "all" in force else set(force)
+        cache = StageCache()
+
+        def run_stage(stage, compute, **fingerprint):
+            with metrics.span(f"training.{stage}"):
+                if not use_cache:
+                    return compute()
+                return cache.run(stage, compute, force=stage in force, **fingerprint)
 
         # Step 1: Data Ingestion
-        data_ingestion = DataIngestion()
-        train_path, test_path = data_ingestion.initiate_data_ingestion()
+        data_ingestion_obj = DataIngestion()
+        ingestion_config = data_ingestion_obj.ingestion_config
+        if ingestion_config.source != "file":
+            force.add("ingestion")  # A database table can change without any fingerprinted input changing
+        train_path, test_path = run_stage(
+            "ingestion",
+            lambda: list(data_ingestion_obj.initiate_data_ingestion()),
+            inputs=[ingestion_config.source_data_path],
+            config=asdict(ingestion_config),
+            code=[data_ingestion, sql_source],
+            outputs=[ingestion_config.raw_data_path, ingestion_config.train_data_path, ingestion_config.test_data_path]
+            + ingestion_config.csv_export_paths,
+        )
 
         # Step 2: Data Transformation
-        data_transformation = DataTransformation()
-        train_array, test_array, preprocessor_path = data_transformation.initiate_data_transformation(train_path, test_path)
+        data_transformation_obj = DataTransformation()
+        transformation_config = data_transformation_obj.data_transformation_config
+
+        def transform():
+            data_transformation_obj.initiate_data_transformation(train_path, test_path)
+            return data_transformation_obj.artifact_paths
+
+        artifact_paths = run_stage(
+            "transformation",
+            transform,
+            inputs=[train_path, test_path],
+            config=asdict(transformation_config),
+            code=[data_transformation, incremental_preprocessor],
+            outputs=lambda paths: list(paths.values()),  # Features are .npz (CSR) or .npy (dense)
+        )
+        # Sparse features load as CSR, dense ones memory-mapped
+        X_train = load_features(artifact_paths["train_features"])
+        X_test = load_features(artifact_paths["test_features"])
+        y_train = np.load(artifact_paths["train_target"])
+        y_test = np.load(artifact_paths["test_target"])
 
         # Step 3: Model Training
-        model_trainer = ModelTrainer()
-        model_score = model_trainer.initiate_model_trainer(train_array, test_array)
+        model_trainer_obj = ModelTrainer()
+        trainer_config = model_trainer_obj.model_trainer_config
+        model_score = run_stage(
+            "training",
+            lambda: model_trainer_obj.initiate_model_trainer(X_train, y_train, X_test, y_test),
+            inputs=[artifact_paths[name] for name in ("train_features", "train_target", "test_features", "test_target")],
+            config=asdict(trainer_config),
+            code=[model_trainer, model_tuner],
+            outputs=[trainer_config.trained_model_file_path],
+        )
+        # ✅ Written last: ModelRegistry only serves a model/preprocessor pair named by a release
+        write_release(trainer_config.trained_model_file_path, transformation_config.preprocessor_obj_file_path)
 
         logger.info(f">>>>> Training Pipeline Completed Successfully with R2 Score: {model_score} <<<<<")
-    
+        return model_score
+
     except Exception as e:
         logger.error(f"Training Pipeline Failed: {str(e)}")
         raise CustomException(e, sys)
 
+
 if __name__ == "__main__":
-    run_training_pipeline()
+    parser = argparse.ArgumentParser(description="Run the training pipeline.")
+    parser.add_argument(
+        "--force", nargs="*", default=[], choices=STAGES + ("all",),
+        help="Rerun these stages even if their cached outputs are up to date",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Ignore the stage cache entirely")
+    parser.add_argument(
+        "--metrics-file", default=os.getenv("METRICS_FILE"),
+        help="Write stage timings here in the Prometheus text format (e.g. for node_exporter's textfile collector)",
+    )
+    args = parser.parse_args()
+
+    if args.metrics_file:
+        metrics.enable()
+    try:
+        run_training_pipeline(force=args.force, use_cache=not args.no_cache)
+    finally:
+        if args.metrics_file:
+            metrics.write_textfile(args.metrics_file)
@@ -0,0 +1,279 @@
+import os
+import json
+import time
+import pickle
+import hashlib
+import platform
+import importlib
+
+from src.mlproject.logger import logger
+
+# 🔹 Model/preprocessor artifacts
+#
+# "pickle" writes a plain pickle at the artifact path, exactly as before. Every other
+# format writes its payload to a content-addressed file next to the artifact path and
+# then atomically replaces the artifact path with a JSON manifest (format, payload
+# file, sha256, library versions). Readers therefore always see a manifest whose
+# payload is complete, and anything that watches the artifact path (ModelRegistry,
+# StageCache, LookupTable digests) notices a new payload through its checksum. The
+# previous payload is kept for one more generation, so a process that read the old
+# manifest just before the switch can still open it.
+OBJECT_FORMATS = ("pickle", "joblib", "native", "auto")
+NATIVE_EXTENSIONS = {"xgboost": ".ubj", "catboost": ".cbm"}
+MANIFEST_VERSION = 1
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as file_obj:
+        for block in iter(lambda: file_obj.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _library(obj):
+    return type(obj).__module__.split(".")[0]
+
+
+def _versions(obj):
+    """Versions of Python and of every library the object's class may depend on."""
+    versions = {"python": platform.python_version()}
+    for name in ("numpy", "sklearn", "joblib", _library(obj)):
+        try:
+            versions[name] = importlib.import_module(name).__version__
+        except (ImportError, AttributeError):
+            pass
+    return versions
+
+
+def _json_params(obj):
+    """The estimator's get_params() that survive JSON (native files hold the booster, not these)."""
+    params = {}
+    for name, value in obj.get_params().items():
+        try:
+            json.dumps(value)
+        except (TypeError, ValueError):
+            logger.warning("Not storing %s=%r of %s in the manifest", name, value, type(obj).__name__)
+            continue
+        params[name] = value
+    return params
+
+
+def resolve_format(obj, fmt):
+    """"auto" -> the library's own format for XGBoost/CatBoost models, joblib for everything else."""
+    if fmt not in OBJECT_FORMATS:
+        raise ValueError(f"Unsupported object format '{fmt}', expected one of {list(OBJECT_FORMATS)}")
+    if fmt in ("auto", "native"):
+        if _library(obj) in NATIVE_EXTENSIONS:
+            return "native"
+        if fmt == "native":
+            raise ValueError(f"{type(obj).__name__} has no native format, use 'joblib' or 'pickle'.")
+        return "joblib"
+    return fmt
+
+
+def read_manifest(file_path):
+    """The manifest stored at `file_path`, or None if it holds a plain pickle."""
+    with open(file_path, "rb") as file_obj:
+        if file_obj.read(1) != b"{":  # Pickles start with the PROTO opcode, never "{"
+            return None
+        file_obj.seek(0)
+        return json.load(file_obj)
+
+
+def artifact_format(file_path):
+    """Format of an existing artifact ("pickle" if it is missing or a plain pickle)."""
+    if not os.path.exists(file_path):
+        return "pickle"
+    manifest = read_manifest(file_path)
+    return "pickle" if manifest is None else manifest["format"]
+
+
+def _write_payload(obj, fmt, tmp_path, compress):
+    if fmt == "joblib":
+        import joblib
+        joblib.dump(obj, tmp_path, compress=compress)
+    elif _library(obj) == "xgboost":
+        obj.save_model(tmp_path)
+    else:
+        obj.save_model(tmp_path, format="cbm")
+
+
+def dump_object(file_path, obj, fmt="pickle", compress=0):
+    """
+    Save `obj` at `file_path` in `fmt` ("pickle", "joblib", "native" or "auto").
+    `compress` is the joblib compression level (0-9); compressed files cannot be memory-mapped.
+    Returns the manifest, or None for plain pickles.
+    """
+    os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+    fmt = resolve_format(obj, fmt)
+    previous = read_manifest(file_path) if os.path.exists(file_path) else None
+
+    if fmt == "pickle":
+        tmp_path = f"{file_path}.tmp"
+        with open(tmp_path, "wb") as file_obj:
+            pickle.dump(obj, file_obj)
+        os.replace(tmp_path, file_path)
+        manifest = None
+    else:
+        extension = NATIVE_EXTENSIONS[_library(obj)] if fmt == "native" else ".joblib"
+        tmp_path = f"{file_path}.tmp{extension}"  # XGBoost picks JSON vs UBJ from the extension
+        _write_payload(obj, fmt, tmp_path, compress)
+        checksum = _sha256(tmp_path)
+        payload = f"{os.path.basename(file_path)}.{checksum[:12]}{extension}"
+        os.replace(tmp_path, os.path.join(os.path.dirname(file_path), payload))
+
+        manifest = {
+            "manifest_version": MANIFEST_VERSION,
+            "format": fmt,
+            "payload": payload,
+            "sha256": checksum,
+            "size_bytes": os.path.getsize(os.path.join(os.path.dirname(file_path), payload)),
+            "compress": compress if fmt == "joblib" else None,
+            "class": f"{type(obj).__module__}.{type(obj).__qualname__}",
+            "params": _json_params(obj) if fmt == "native" else None,
+            "versions": _versions(obj),
+            "previous_payload": previous["payload"] if previous and previous["payload"] != payload else None,
+            "created_at": time.time(),
+        }
+        tmp_path = f"{file_path}.tmp"
+        with open(tmp_path, "w") as file_obj:
+            json.dump(manifest, file_obj, indent=2)
+        os.replace(tmp_path, file_path)
+
+    _remove_stale_payloads(file_path, previous, manifest)
+    return manifest
+
+
+def _remove_stale_payloads(file_path, previous, manifest):
+    """After `file_path` switched from `previous` to `manifest` (None for plain pickles)."""
+    # ✅ Readers of the previous manifest may still be opening its payload; the one before that is stale
+    current = {(manifest or {}).get("payload"), (manifest or {}).get("previous_payload")}
+    stale = [previous.get("previous_payload")] if previous is not None else []
+    if manifest is None and previous is not None:
+        stale.append(previous["payload"])  # A plain pickle cannot name a previous payload to keep
+    for stale_payload in stale:
+        stale_path = os.path.join(os.path.dirname(file_path), stale_payload or "")
+        if stale_payload and stale_payload not in current and os.path.exists(stale_path):
+            os.remove(stale_path)
+
+
+def promote_object(staged_path, file_path):
+    """
+    Move an artifact saved with dump_object at `staged_path` (in the same directory) to
+    `file_path`, as if it had been saved there: the switch is one os.replace and the
+    replaced payload is kept for one generation.
+    """
+    previous = read_manifest(file_path) if os.path.exists(file_path) else None
+    manifest = read_manifest(staged_path)
+    if manifest is None:
+        os.replace(staged_path, file_path)
+    else:
+        manifest["previous_payload"] = previous["payload"] if previous and previous["payload"] != manifest["payload"] else None
+        tmp_path = f"{file_path}.tmp"
+        with open(tmp_path, "w") as file_obj:
+            json.dump(manifest, file_obj, indent=2)
+        os.replace(tmp_path, file_path)
+        os.remove(staged_path)
+    _remove_stale_payloads(file_path, previous, manifest)
+    return manifest
+
+
+def discard_object(file_path):
+    """Delete an artifact written by dump_object and the payload its manifest names."""
+    if not os.path.exists(file_path):
+        return
+    manifest = read_manifest(file_path)
+    if manifest is not None:
+        payload_path = os.path.join(os.path.dirname(file_path), manifest["payload"])
+        if os.path.exists(payload_path):
+            os.remove(payload_path)
+    os.remove(file_path)
+
+
+def _load_native(manifest, payload_path):
+    module_name, _, class_name = manifest["class"].rpartition(".")
+    model = getattr(importlib.import_module(module_name), class_name)()
+    # The tuned hyperparameters, so continue_training boosts more rounds with them, not the defaults
+    model.set_params(**(manifest.get("params") or {}))
+    model.load_model(payload_path)
+    return model
+
+
+def _check_versions(manifest, file_path):
+    saved = manifest.get("versions", {})
+    for name, version in saved.items():
+        if name == "python":
+            current = platform.python_version()
+        else:
+            try:
+                current = importlib.import_module(name).__version__
+            except (ImportError, AttributeError):
+                continue
+        if current != version:
+            logger.warning("%s was saved with %s %s, loading with %s", file_path, name, version, current)
+
+
+def read_object(file_path, mmap=True, verify=True):
+    """
+    Load an artifact written by dump_object (or any plain pickle).
+    Uncompressed joblib payloads are memory-mapped read-only when `mmap` is set;
+    `verify` checks the payload against the manifest's sha256 first.
+    """
+    manifest = read_manifest(file_path)
+    if manifest is None:
+        with open(file_path, "rb") as file_obj:
+            return pickle.load(file_obj)
+
+    payload_path = os.path.join(os.path.dirname(file_path), manifest["payload"])
+    if verify and _sha256(payload_path) != manifest["sha256"]:
+        raise ValueError(f"Checksum mismatch for {payload_path}, the artifact is corrupt or was modified.")
+    _check_versions(manifest, file_path)
+
+    if manifest["format"] == "joblib":
+        import joblib
+        return joblib.load(payload_path, mmap_mode="r" if mmap and not manifest.get("compress") else None)
+    return _load_native(manifest, payload_path)
+
+
+# 🔹 Releases: the model and preprocessor that belong together
+#
+# Training writes the preprocessor and the model at different times, so watching the two
+# files cannot tell a finished pair from a half-written one. Whatever trains (the training
+# pipeline, ModelMonitoring's retrain) calls write_release once both are saved; the release
+# file is written last and names the sha256 of each artifact file. ModelRegistry only
+# publishes a pair whose files still match the release it loaded them for.
+RELEASE_FILE_NAME = "release.json"
+
+
+def release_path_for(model_path):
+    return os.path.join(os.path.dirname(model_path), RELEASE_FILE_NAME)
+
+
+def artifact_digest(file_path):
+    """sha256 of the artifact file itself (the manifest for manifest formats, which names its payload's sha256)."""
+    return _sha256(file_path)
+
+
+def write_release(model_path, preprocessor_path, release_path=None):
+    """Record the current model/preprocessor files as one release; returns the release."""
+    release = {
+        "model": {"path": os.path.basename(model_path), "sha256": artifact_digest(model_path)},
+        "preprocessor": {"path": os.path.basename(preprocessor_path), "sha256": artifact_digest(preprocessor_path)},
+        "created_at": time.time(),
+    }
+    release_path = release_path or release_path_for(model_path)
+    tmp_path = f"{release_path}.tmp"
+    with open(tmp_path, "w") as file_obj:
+        json.dump(release, file_obj, indent=2)
+    os.replace(tmp_path, release_path)
+    return release
+
+
+def read_release(release_path):
+    """The release at `release_path`, or None if nothing has been released there."""
+    try:
+        with open(release_path) as file_obj:
+            return json.load(file_obj)
+    except FileNotFoundError:
+        return None
@@ -0,0 +1,329 @@
+import os
+import sys
+import json
+import time
+import uuid
+import queue
+import atexit
+import shutil
+import threading
+from dataclasses import dataclass
+
+from src.mlproject.logger import logger
+from src.mlproject import metrics
+
+DEFAULT_REGISTRY_URI = "https://dagshub.com/SHAIK-07/practice.mlflow"
+
+
+@dataclass
+class TrackingConfig:
+    tracking_uri: str = None  # None uses MLflow's default / MLFLOW_TRACKING_URI
+    registry_uri: str = None  # None uses MLflow's default registry
+    spool_dir: str = os.path.join("artifacts", "mlflow_spool")
+    max_queue_size: int = 256  # Runs waiting for upload; beyond this they are spooled to disk
+    max_batch_runs: int = 16  # Runs drained from the queue per worker cycle
+    replay_on_start: bool = True
+
+
+class _RunRecord:
+    """Everything needed to log one MLflow run, independent of any active run context."""
+
+    def __init__(self, experiment_name, run_name, params=None, metrics=None, tags=None,
+                 model=None, model_dir=None, artifact_path="model", registered_model_name=None,
+                 signature=None, input_example=None, record_id=None):
+        self.record_id = record_id or uuid.uuid4().hex
+        self.experiment_name = experiment_name
+        self.run_name = run_name
+        self.params = {str(k): str(v) for k, v in (params or {}).items()}
+        self.metrics = {str(k): float(v) for k, v in (metrics or {}).items()}
+        self.tags = {str(k): str(v) for k, v in (tags or {}).items()}
+        self.timestamp_ms = int(time.time() * 1000)
+        self.model = model
+        self.model_dir = model_dir  # Locally saved MLflow model, set once the model is serialized
+        self.artifact_path = artifact_path
+        self.registered_model_name = registered_model_name
+        self.signature = signature
+        self.input_example = input_example
+        self.spool_path = None  # The spooled JSON this record was replayed from, removed once it is logged
+
+    def to_json(self):
+        return {
+            "record_id": self.record_id,
+            "experiment_name": self.experiment_name,
+            "run_name": self.run_name,
+            "params": self.params,
+            "metrics": self.metrics,
+            "tags": self.tags,
+            "timestamp_ms": self.timestamp_ms,
+            "artifact_path": self.artifact_path,
+            "registered_model_name": self.registered_model_name,
+            "signature": self.signature.to_dict() if self.signature is not None else None,
+            "input_example": _example_to_json(self.input_example),
+        }
+
+    @classmethod
+    def from_json(cls, data, model_dir=None):
+        signature = None
+        if data.get("signature"):
+            from mlflow.models import ModelSignature
+            signature = ModelSignature.from_dict(data["signature"])
+        record = cls(
+            data["experiment_name"], data["run_name"], params=data["params"],
+            metrics=data["metrics"], tags=data["tags"], model_dir=model_dir,
+            artifact_path=data["artifact_path"], registered_model_name=data["registered_model_name"],
+            signature=signature, input_example=_example_from_json(data.get("input_example")),
+            record_id=data["record_id"],
+        )
+        record.timestamp_ms = data["timestamp_ms"]
+        return record
+
+
+def _example_to_json(example):
+    """An input example as JSON: DataFrames in pandas' "split" layout, arrays as nested lists."""
+    if example is None:
+        return None
+    import numpy as np
+    import pandas as pd
+    if isinstance(example, pd.DataFrame):
+        return {"type": "dataframe", "data": json.loads(example.to_json(orient="split", index=False))}
+    if isinstance(example, np.ndarray):
+        return {"type": "ndarray", "data": example.tolist(), "dtype": str(example.dtype)}
+    return {"type": "json", "data": example}
+
+
+def _example_from_json(data):
+    if data is None:
+        return None
+    import numpy as np
+    import pandas as pd
+    if data["type"] == "dataframe":
+        return pd.DataFrame(data["data"]["data"], columns=data["data"]["columns"])
+    if data["type"] == "ndarray":
+        return np.asarray(data["data"], dtype=data["dtype"])
+    return data["data"]
+
+
+class AsyncTracker:
+    """
+    Background MLflow sink.
+
+    `log_run` only enqueues. A worker thread creates each run, sends its params
+    and metrics in a single log_batch call and uploads the model artifacts.
+    If the tracking server is unreachable the run is spooled to
+    `spool_dir` (JSON + locally saved model) and can be replayed later.
+    """
+
+    def __init__(self, config: TrackingConfig = None):
+        self.config = config or TrackingConfig()
+        self._queue = queue.Queue(maxsize=self.config.max_queue_size)
+        self._experiment_ids = {}
+        self._client = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._replaying = set()  # Record ids queued from the spool and not logged yet
+
+    @property
+    def client(self):
+        if self._client is None:
+            from mlflow import MlflowClient
+            self._client = MlflowClient(tracking_uri=self.config.tracking_uri, registry_uri=self.config.registry_uri)
+        return self._client
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run, name="mlflow-tracker", daemon=True)
+            self._thread.start()
+        if self.config.replay_on_start:
+            self.replay_spool()
+
+    def log_run(self, experiment_name, run_name, params=None, metrics=None, tags=None, model=None,
+                artifact_path="model", registered_model_name=None, signature=None, input_example=None):
+        """Queue a run for background logging. Never waits on the network."""
+        record = _RunRecord(
+            experiment_name, run_name, params=params, metrics=metrics, tags=tags, model=model,
+            artifact_path=artifact_path, registered_model_name=registered_model_name,
+            signature=signature, input_example=input_example,
+        )
+        self.start()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            logger.warning(f"MLflow queue is full, spooling run '{run_name}' to disk.")
+            self._spool(record)
+        return record.record_id
+
+    def flush(self, timeout=None) -> bool:
+        """Wait until every queued run has been logged or spooled. Returns False on timeout."""
+        if self._thread is None:
+            return True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+    def replay_spool(self) -> int:
+        """Re-queue runs spooled by earlier failures. Returns how many were queued."""
+        if not os.path.isdir(self.config.spool_dir):
+            return 0
+
+        replayed = 0
+        for file_name in sorted(os.listdir(self.config.spool_dir)):
+            if not file_name.endswith(".json"):
+                continue
+            path = os.path.join(self.config.spool_dir, file_name)
+            try:
+                with open(path) as file_obj:
+                    data = json.load(file_obj)
+                with self._lock:
+                    if data["record_id"] in self._replaying:
+                        continue  # Queued by an earlier replay, not logged yet
+                    self._replaying.add(data["record_id"])
+                model_dir = os.path.join(self.config.spool_dir, data["record_id"])  # See _model_dir
+                record = _RunRecord.from_json(data, model_dir if os.path.isdir(model_dir) else None)
+                # ✅ The spooled file stays until the run is logged; a crash before that replays it again
+                record.spool_path = path
+                try:
+                    self._queue.put_nowait(record)
+                except queue.Full:
+                    self._replaying.discard(record.record_id)
+                    raise
+                replayed += 1
+            except queue.Full:
+                break
+            except Exception as e:
+                logger.error(f"Could not replay spooled MLflow run {file_name}: {str(e)}")
+
+        if replayed:
+            self.start()
+            logger.info(f"Replaying {replayed} spooled MLflow run(s).")
+        return replayed
+
+    def _run(self):
+        while True:
+            records = [self._queue.get()]
+            while len(records) < self.config.max_batch_runs:
+                try:
+                    records.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            for record in records:
+                try:
+                    self._log(record)
+                except Exception as e:
+                    logger.warning(f"MLflow logging failed for run '{record.run_name}', spooling to disk: {str(e)}")
+                    self._spool(record)  # Same record id: overwrites its earlier spool file, if any
+                finally:
+                    self._replaying.discard(record.record_id)
+                    self._queue.task_done()
+
+    def _experiment_id(self, name):
+        if name not in self._experiment_ids:
+            experiment = self.client.get_experiment_by_name(name)
+            self._experiment_ids[name] = experiment.experiment_id if experiment else self.client.create_experiment(name)
+        return self._experiment_ids[name]
+
+    def _save_model(self, record, target_dir):
+        import mlflow.sklearn
+        shutil.rmtree(target_dir, ignore_errors=True)  # Left over from an interrupted attempt
+        # cloudpickle: MLflow 3's skops default refuses tree estimators (untrusted sklearn.tree._tree.Tree)
+        with metrics.span("mlflow.save_model"):
+            mlflow.sklearn.save_model(
+                record.model, target_dir, signature=record.signature, input_example=record.input_example,
+                serialization_format="cloudpickle",
+            )
+        record.model_dir = target_dir
+        record.model = None
+
+    def _log(self, record):
+        from mlflow.entities import Metric, Param, RunTag
+
+        client = self.client
+        run = client.create_run(self._experiment_id(record.experiment_name), run_name=record.run_name)
+        run_id = run.info.run_id
+
+        try:
+            # ✅ Params, metrics and tags in a single request instead of one call each
+            with metrics.span("mlflow.log_batch"):
+                client.log_batch(
+                    run_id,
+                    metrics=[Metric(key, value, record.timestamp_ms, 0) for key, value in record.metrics.items()],
+                    params=[Param(key, value) for key, value in record.params.items()],
+                    tags=[RunTag(key, value) for key, value in record.tags.items()],
+                )
+
+            if record.model is not None:
+                self._save_model(record, self._model_dir(record))
+            if record.model_dir is not None:
+                with metrics.span("mlflow.log_artifacts"):
+                    client.log_artifacts(run_id, record.model_dir, record.artifact_path)
+                if record.registered_model_name:
+                    with metrics.span("mlflow.register"):
+                        self._register(run_id, record)
+
+            client.set_terminated(run_id)
+        except Exception:
+            client.set_terminated(run_id, status="FAILED")
+            raise
+
+        # Uploaded, the spooled record and the local copy of the model are no longer needed
+        if record.spool_path is not None and os.path.exists(record.spool_path):
+            os.remove(record.spool_path)
+        if record.model_dir is not None:
+            shutil.rmtree(record.model_dir, ignore_errors=True)
+
+    def _register(self, run_id, record):
+        from mlflow.exceptions import MlflowException
+
+        client = self.client
+        try:
+            client.create_registered_model(record.registered_model_name)
+        except MlflowException:
+            pass  # Already registered
+        client.create_model_version(
+            record.registered_model_name, f"runs:/{run_id}/{record.artifact_path}", run_id=run_id,
+        )
+
+    def _model_dir(self, record):
+        return os.path.join(self.config.spool_dir, record.record_id)
+
+    def _spool(self, record):
+        try:
+            os.makedirs(self.config.spool_dir, exist_ok=True)
+            if record.model is not None:
+                self._save_model(record, self._model_dir(record))
+
+            tmp_path = os.path.join(self.config.spool_dir, f"{record.record_id}.json.tmp")
+            with open(tmp_path, "w") as file_obj:
+                json.dump(record.to_json(), file_obj)
+            os.replace(tmp_path, os.path.join(self.config.spool_dir, f"{record.record_id}.json"))
+        except Exception as e:
+            logger.error(f"Could not spool MLflow run '{record.run_name}': {str(e)}")
+
+
+_tracker = None
+_tracker_lock = threading.Lock()
+
+
+def get_tracker(config: TrackingConfig = None) -> AsyncTracker:
+    """Return the process-wide tracker; pending runs are flushed at interpreter exit."""
+    global _tracker
+    if _tracker is None:
+        with _tracker_lock:
+            if _tracker is None:
+                _tracker = AsyncTracker(config or TrackingConfig(registry_uri=os.getenv("MLFLOW_REGISTRY_URI", DEFAULT_REGISTRY_URI)))
+                atexit.register(_tracker.flush, 60)
+    return _tracker
+
+
+if __name__ == "__main__":
+    # python -m src.mlproject.tracking  ->  upload runs spooled while the server was unreachable
+    tracker = get_tracker()
+    count = tracker.replay_spool()
+    tracker.flush()
+    print(f"Replayed {count} spooled run(s).")
+    sys.exit(0)
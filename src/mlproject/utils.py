@@ -7,8 +7,10 @@ import requests
 from dotenv import load_dotenv
 from src.mlproject.logger import logger
 from src.mlproject.exception import CustomException
-import pickle
+from src.mlproject.serialization import dump_object, read_object
+from src.mlproject import metrics
 import numpy as np
+from scipy import sparse
 from sklearn.model_selection import GridSearchCV
 from sklearn.metrics import r2_score
 
@@ -22,9 +24,10 @@ password = os.getenv("password")
 database = os.getenv("db")  # ✅ Ensure correct env variable name
 
 # 🔹 **1️⃣ Read from MySQL Database (Default)**
-def read_mysql_data():
+def read_mysql_data(chunk_size=None):
     """
-    Reads data from MySQL Database using mysql.connector
+    Reads data from MySQL Database using mysql.connector.
+    With chunk_size, returns an iterator of DataFrames streamed through an unbuffered cursor.
     """
     logger.info("Reading from MySQL")
     try:
@@ -37,7 +40,13 @@ def read_mysql_data():
         logger.info("Connection established successfully!")
 
         query = "SELECT * FROM student"
-        df = pd.read_sql(query, mydb)
+        if chunk_size:
+            return stream_query(mydb, mydb.cursor(buffered=False), query, chunk_size)
+
+        try:
+            df = pd.read_sql(query, mydb)
+        finally:
+            mydb.close()
 
         logger.info("Data fetched successfully from MySQL")
         preview_data(df)
@@ -47,78 +56,287 @@ def read_mysql_data():
         logger.error(f"Error in read_sql_data: {str(e)}")
         raise CustomException(e, sys)
 
-def save_object(file_path, obj):
+def stream_query(connection, cursor, query, chunk_size):
+    """
+    Yield the result of `query` as DataFrames of chunk_size rows. The cursor must be unbuffered
+    (server-side) so rows are pulled from the server as they are consumed. Closes the connection.
+    """
+    try:
+        cursor.execute(query)
+        columns = [col[0] for col in cursor.description]
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            yield pd.DataFrame(rows, columns=columns)
+    except Exception as e:
+        logger.error(f"Error streaming query results: {str(e)}")
+        raise CustomException(e, sys)
+    finally:
+        cursor.close()
+        connection.close()
+
+def save_object(file_path, obj, fmt="pickle", compress=0):
+    """
+    Save an object atomically. `fmt` is "pickle", "joblib", "native" (XGBoost UBJ /
+    CatBoost cbm) or "auto"; see src.mlproject.serialization for the on-disk layout.
+    """
     try:
         logger.info(f"Saving object at path: {file_path}")
-        os.makedirs(os.path.dirname(file_path), exist_ok=True)
-        with open(file_path, "wb") as file_obj:
-            pickle.dump(obj, file_obj)
-        logger.info(f"Object saved at path: {file_path}")
+        # Writes go to a temp file and are renamed, so readers never see a half-written artifact
+        manifest = dump_object(file_path, obj, fmt=fmt, compress=compress)
+        logger.info(f"Object saved at path: {file_path}" + (f" ({manifest['format']}, {manifest['payload']})" if manifest else ""))
     except Exception as e:
         raise CustomException(e, sys)   
 
-def load_object(file_path):
+def load_object(file_path, mmap=True, verify=True):
     try:
-        with open(file_path, "rb") as file_obj:
-            return pickle.load(file_obj)
+        with metrics.span("load_object"):
+            return read_object(file_path, mmap=mmap, verify=verify)
 
     except Exception as e:
         raise CustomException(e, sys)
 
 
+# 🔹 Tabular artifacts passed between pipeline stages
+ARTIFACT_FORMATS = {"csv": ".csv", "parquet": ".parquet", "feather": ".feather"}
 
+def frame_format(file_path):
+    """Return the artifact format implied by a file extension."""
+    extension = os.path.splitext(file_path)[1].lower()
+    for fmt, fmt_extension in ARTIFACT_FORMATS.items():
+        if extension == fmt_extension:
+            return fmt
+    raise ValueError(f"Unsupported artifact extension '{extension}', expected one of {list(ARTIFACT_FORMATS.values())}")
 
-def evaluate_models(X_train, y_train,X_test,y_test,models,param):
+def save_frame(df, file_path):
+    """
+    Save a DataFrame in the format given by its extension. Parquet and Feather keep the
+    column dtypes; Feather is written uncompressed so it can be memory-mapped on load.
+    """
     try:
-        report = {}
-
-        for i in range(len(list(models))):
-            model = list(models.values())[i]
-            para=param[list(models.keys())[i]]
-
-            gs = GridSearchCV(model,para,cv=3)
-            gs.fit(X_train,y_train)
-
-            model.set_params(**gs.best_params_)
-            model.fit(X_train,y_train)
-
-            #model.fit(X_train, y_train)  # Train model
-
-            y_train_pred = model.predict(X_train)
-
-            y_test_pred = model.predict(X_test)
-
-            train_model_score = r2_score(y_train, y_train_pred)
-
-            test_model_score = r2_score(y_test, y_test_pred)
-
-            report[list(models.keys())[i]] = test_model_score
+        fmt = frame_format(file_path)
+        os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+
+        tmp_path = f"{file_path}.tmp"
+        if fmt == "csv":
+            df.to_csv(tmp_path, index=False)
+        elif fmt == "parquet":
+            df.to_parquet(tmp_path, index=False)
+        else:
+            df.reset_index(drop=True).to_feather(tmp_path, compression="uncompressed")
+        os.replace(tmp_path, file_path)
+    except Exception as e:
+        raise CustomException(e, sys)
 
-        return report
+def load_frame(file_path, columns=None):
+    """Load a DataFrame saved by save_frame, memory-mapping Parquet/Feather files."""
+    try:
+        fmt = frame_format(file_path)
+        if fmt == "csv":
+            return pd.read_csv(file_path, usecols=columns)
+        if fmt == "parquet":
+            return pd.read_parquet(file_path, columns=columns, memory_map=True)
+
+        import pyarrow.feather as feather
+        return feather.read_table(file_path, columns=columns, memory_map=True).to_pandas()
+    except Exception as e:
+        raise CustomException(e, sys)
 
+# 🔹 Transformed feature matrices: CSR stays sparse (.npz), dense arrays are memory-mappable (.npy)
+def save_features(X, path_stem):
+    """Save a feature matrix as <path_stem>.npz (sparse) or <path_stem>.npy (dense); return the path."""
+    try:
+        os.makedirs(os.path.dirname(path_stem) or ".", exist_ok=True)
+        is_sparse = sparse.issparse(X)
+        file_path = f"{path_stem}.npz" if is_sparse else f"{path_stem}.npy"
+        stale_path = f"{path_stem}.npy" if is_sparse else f"{path_stem}.npz"
+
+        tmp_path = f"{file_path}.tmp"
+        with open(tmp_path, "wb") as file_obj:
+            if is_sparse:
+                sparse.save_npz(file_obj, X.tocsr(), compressed=False)
+            else:
+                np.save(file_obj, np.asarray(X))
+        os.replace(tmp_path, file_path)
+        if os.path.exists(stale_path):
+            os.remove(stale_path)
+        return file_path
     except Exception as e:
         raise CustomException(e, sys)
 
+def load_features(file_path):
+    """Load a matrix saved by save_features: CSR for .npz, a read-only memory map for .npy."""
+    try:
+        if file_path.endswith(".npz"):
+            return sparse.load_npz(file_path).tocsr()
+        return np.load(file_path, mmap_mode="r")
+    except Exception as e:
+        raise CustomException(e, sys)
 
+def accepts_sparse(model):
+    """Whether an estimator takes scipy.sparse input, from its sklearn tags."""
+    try:
+        from sklearn.utils import get_tags
+        return bool(get_tags(model).input_tags.sparse)
+    except Exception:
+        return False
+
+def model_input(model, X):
+    """Densify X only when it is sparse and the estimator cannot take sparse input."""
+    if sparse.issparse(X) and not accepts_sparse(model):
+        return X.toarray()
+    return X
+
+def iter_frame_chunks(file_path, chunk_size, dtype=None):
+    """Yield a CSV/Parquet/Feather file as DataFrames of at most chunk_size rows."""
+    fmt = frame_format(file_path)
+    if fmt == "csv":
+        yield from pd.read_csv(file_path, chunksize=chunk_size, dtype=dtype)
+        return
+
+    import pyarrow.parquet as pq
+    import pyarrow.feather as feather
+    if fmt == "parquet":
+        batches = pq.ParquetFile(file_path, memory_map=True).iter_batches(batch_size=chunk_size)
+    else:
+        batches = feather.read_table(file_path, memory_map=True).to_batches(max_chunksize=chunk_size)
+    for batch in batches:
+        chunk = batch.to_pandas()
+        yield chunk.astype({column: dtype[column] for column in chunk.columns if column in dtype}) if dtype else chunk
 
+class FrameWriter:
+    """
+    Append DataFrame chunks to a CSV/Parquet/Feather file (format from the extension, as in
+    save_frame) so large outputs are written incrementally. Every chunk must have the schema
+    of the first one. The file is moved into place on close.
+    """
 
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.format = frame_format(file_path)
+        self.tmp_path = f"{file_path}.tmp"
+        self.rows = 0
+        self._schema = None
+        self._writer = None
+        self._empty = None
+
+    def write(self, df):
+        if self._schema is None and df.empty:
+            # An empty frame says nothing about column types (Arrow infers null), keep it aside
+            self._empty = df
+            return
+        if self._schema is None:
+            os.makedirs(os.path.dirname(self.file_path) or ".", exist_ok=True)
+
+        if self.format == "csv":
+            if self._schema is None:
+                df.to_csv(self.tmp_path, index=False)
+                self._schema = list(df.columns)
+            else:
+                df[self._schema].to_csv(self.tmp_path, mode="a", header=False, index=False)
+        else:
+            import pyarrow as pa
+            table = pa.Table.from_pandas(df, schema=self._schema, preserve_index=False)
+            if self._writer is None:
+                self._schema = table.schema
+                if self.format == "parquet":
+                    import pyarrow.parquet as pq
+                    self._writer = pq.ParquetWriter(self.tmp_path, self._schema)
+                else:
+                    self._writer = pa.ipc.new_file(self.tmp_path, self._schema)  # Feather V2 == Arrow IPC file
+            self._writer.write_table(table)
+        self.rows += len(df)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+        if self._schema is None:
+            if self._empty is None:
+                raise ValueError(f"No data was written to {self.file_path}")
+            save_frame(self._empty, self.file_path)
+            return
+        os.replace(self.tmp_path, self.file_path)
+
+    def abort(self):
+        if self._writer is not None:
+            self._writer.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+
+
+def evaluate_models(X_train, y_train,X_test,y_test,models,param,n_jobs=None):
+    """
+    Exhaustive GridSearchCV per model. See components/model_tuner.py for the
+    successive-halving search used by ModelTrainer.
+    """
+    try:
+        report = {}
 
+        for model_name, model in models.items():
+            para = param[model_name]
 
+            gs = GridSearchCV(model, para, cv=3, n_jobs=n_jobs)
+            gs.fit(X_train,y_train)
 
+            # GridSearchCV already refit the best params on the full training set
+            model = gs.best_estimator_
 
+            y_test_pred = model.predict(X_test)
 
+            test_model_score = r2_score(y_test, y_test_pred)
 
+            report[model_name] = test_model_score
 
+        return report
 
+    except Exception as e:
+        raise CustomException(e, sys)
 
 
+# 🔹 Synthetic data for tests and benchmarks
+STUDENT_CATEGORIES = {
+    "gender": ["female", "male"],
+    "race_ethnicity": ["group A", "group B", "group C", "group D", "group E"],
+    "parental_level_of_education": [
+        "some high school", "high school", "some college",
+        "associate's degree", "bachelor's degree", "master's degree",
+    ],
+    "lunch": ["standard", "free/reduced"],
+    "test_preparation_course": ["none", "completed"],
+}
 
+def generate_student_data(n_rows, random_state=0):
+    """
+    Generate a synthetic student dataset with the same schema as stud.csv
+    """
+    rng = np.random.default_rng(random_state)
+    df = pd.DataFrame({
+        column: rng.choice(categories, n_rows) for column, categories in STUDENT_CATEGORIES.items()
+    })
+    df["reading_score"] = rng.integers(0, 101, n_rows)
+    df["writing_score"] = rng.integers(0, 101, n_rows)
+    noise = rng.normal(0, 5, n_rows)
+    df["math_score"] = np.clip(0.5 * df["reading_score"] + 0.4 * df["writing_score"] + noise, 0, 100).round()
+    return df
 
 
 # 🔹 **2️⃣ Read from SQL Database using  (Default)**
-def read_pymysql_data():
+def read_pymysql_data(chunk_size=None):
     """
-    Reads data from MySQL Database using pymysql
+    Reads data from MySQL Database using pymysql.
+    With chunk_size, returns an iterator of DataFrames streamed through a server-side cursor.
     """
     logger.info("Reading from pymysql")
     try:
@@ -130,14 +348,20 @@ def read_pymysql_data():
         )
         logger.info("Connection established successfully!")
 
+        if chunk_size:
+            return stream_query(mydb, mydb.cursor(pymysql.cursors.SSCursor), "SELECT * FROM student", chunk_size)
+
         # Using cursor for execution
-        with mydb.cursor() as cursor:
-            cursor.execute("SELECT * FROM student")
-            data = cursor.fetchall()
-            df = pd.DataFrame(data, columns=[col[0] for col in cursor.description]) 
+        try:
+            with mydb.cursor() as cursor:
+                cursor.execute("SELECT * FROM student")
+                data = cursor.fetchall()
+                df = pd.DataFrame(data, columns=[col[0] for col in cursor.description]) 
+        finally:
+            mydb.close()
 
         logger.info("Data fetched successfully using pymysql")
-        print(df.head(5))
+        logger.debug(f"First rows:\n{df.head(5)}")
         return df
         
     except Exception as e:
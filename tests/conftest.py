@@ -0,0 +1,45 @@
+import os
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from src.mlproject.components.data_transformation import DataTransformation, DataTransformationConfig
+from src.mlproject.utils import save_object, generate_student_data
+
+
+def make_student_frame(n_rows=200, seed=0):
+    """Build a synthetic student dataset with the same schema as stud.csv."""
+    return generate_student_data(n_rows, random_state=seed)
+
+
+@pytest.fixture
+def student_df():
+    return make_student_frame()
+
+
+@pytest.fixture
+def trained_artifacts(tmp_path, student_df):
+    """Fit a preprocessor and a small model on synthetic data and save both to tmp_path."""
+    preprocessor = DataTransformation().get_data_transform_object()
+    X = preprocessor.fit_transform(student_df.drop(columns=["math_score"]))
+    model = LinearRegression().fit(X, student_df["math_score"])
+
+    model_path = os.path.join(tmp_path, "best_model.pkl")
+    preprocessor_path = os.path.join(tmp_path, "preprocessor.pkl")
+    save_object(model_path, model)
+    save_object(preprocessor_path, preprocessor)
+    return model_path, preprocessor_path
+
+
+@pytest.fixture
+def transformation_config():
+    """Factory for a DataTransformationConfig writing every artifact under a directory."""
+    def make(directory, **kwargs):
+        return DataTransformationConfig(
+            preprocessor_obj_file_path=os.path.join(directory, "preprocessor.pkl"),
+            train_features_path=os.path.join(directory, "train_features"),
+            test_features_path=os.path.join(directory, "test_features"),
+            train_target_path=os.path.join(directory, "train_target.npy"),
+            test_target_path=os.path.join(directory, "test_target.npy"),
+            **kwargs,
+        )
+    return make
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+from scipy import sparse
+
+from src.mlproject.components.compiled_preprocessor import CompiledPreprocessor
+from src.mlproject.components.data_transformation import DataTransformation
+from src.mlproject.pipelines.prediction_pipeline import PredictionPipeline
+
+
+@pytest.fixture
+def fitted_preprocessor(student_df):
+    features = student_df.drop(columns=["math_score"])
+    return DataTransformation().get_data_transform_object().fit(features)
+
+
+def _dense(X):
+    return X.toarray() if sparse.issparse(X) else X
+
+
+def test_compiled_matches_column_transformer(fitted_preprocessor, student_df):
+    """The compiled preprocessor reproduces preprocessor.transform to float tolerance."""
+    features = student_df.drop(columns=["math_score"]).astype({"gender": object})
+    features.iloc[0, features.columns.get_loc("writing_score")] = np.nan
+    features.iloc[1, features.columns.get_loc("gender")] = np.nan
+    features.iloc[2, features.columns.get_loc("race_ethnicity")] = "group Z"  # unseen category
+
+    compiled = CompiledPreprocessor.compile(fitted_preprocessor)
+    expected = _dense(fitted_preprocessor.transform(features))
+    actual = compiled.transform_records(features.to_dict(orient="records"))
+
+    assert actual.shape == expected.shape == (len(features), compiled.n_features)
+    np.testing.assert_allclose(actual, expected, rtol=1e-12, atol=1e-12)
+
+
+def test_predict_record_matches_predict(trained_artifacts, student_df):
+    """PredictionPipeline.predict_record uses the compiled path and agrees with predict()."""
+    pipeline = PredictionPipeline(*trained_artifacts)
+    assert pipeline.compiled_preprocessor is not None
+
+    features = student_df.drop(columns=["math_score"]).head(5)
+    for i, record in enumerate(features.to_dict(orient="records")):
+        np.testing.assert_allclose(pipeline.predict_record(record), pipeline.predict(features.iloc[[i]]))
+
+
+def test_compile_rejects_unfitted_preprocessor():
+    with pytest.raises(ValueError):
+        CompiledPreprocessor.compile(DataTransformation().get_data_transform_object())
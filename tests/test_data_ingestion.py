@@ -0,0 +1,107 @@
+import os
+import sqlite3
+import pytest
+import pandas as pd
+
+from src.mlproject.components.data_ingestion import DataIngestion, DataIngestionConfig, hash_split
+from src.mlproject.components.data_transformation import DataTransformation
+from src.mlproject.utils import ARTIFACT_FORMATS, generate_student_data, save_frame, load_frame, stream_query
+
+
+@pytest.mark.parametrize("fmt", sorted(ARTIFACT_FORMATS))
+def test_save_and_load_frame_round_trip(tmp_path, student_df, fmt):
+    path = os.path.join(tmp_path, f"frame{ARTIFACT_FORMATS[fmt]}")
+    save_frame(student_df.iloc[10:50], path)
+
+    loaded = load_frame(path)
+
+    pd.testing.assert_frame_equal(loaded, student_df.iloc[10:50].reset_index(drop=True), check_dtype=fmt != "csv")
+
+
+def test_typed_schema_is_preserved(tmp_path, student_df):
+    df = student_df.astype({"gender": "category", "reading_score": "int16"})
+    for fmt in ("parquet", "feather"):
+        path = os.path.join(tmp_path, f"frame{ARTIFACT_FORMATS[fmt]}")
+        save_frame(df, path)
+        assert load_frame(path).dtypes.to_dict() == df.dtypes.to_dict()
+
+
+def test_ingestion_writes_selected_format_and_csv_export(tmp_path, student_df, transformation_config):
+    source = os.path.join(tmp_path, "stud.csv")
+    student_df.to_csv(source, index=False)
+    artifacts = os.path.join(tmp_path, "artifacts")
+    config = DataIngestionConfig(
+        source_data_path=source, artifact_format="feather", export_csv=True,
+        train_data_path=os.path.join(artifacts, "train.feather"),
+        test_data_path=os.path.join(artifacts, "test.feather"),
+        raw_data_path=os.path.join(artifacts, "raw.feather"),
+    )
+
+    train_path, test_path = DataIngestion(config).initiate_data_ingestion()
+
+    assert sorted(os.listdir(artifacts)) == [
+        "raw.csv", "raw.feather", "test.csv", "test.feather", "train.csv", "train.feather",
+    ]
+    assert len(load_frame(train_path)) + len(load_frame(test_path)) == len(student_df)
+
+    transformation = DataTransformation(transformation_config(artifacts))
+    X_train, y_train, X_test, y_test, _ = transformation.initiate_data_transformation(train_path, test_path)
+    assert X_train.shape[0] == len(y_train) == 160 and X_test.shape[0] == len(y_test) == 40
+
+
+def test_default_paths_follow_the_artifact_format():
+    assert DataIngestionConfig().train_data_path == os.path.join("artifacts", "train.parquet")
+    assert DataIngestionConfig(artifact_format="csv").test_data_path == os.path.join("artifacts", "test.csv")
+    # The DVC-tracked CSVs keep being written next to the parquet artifacts
+    assert DataIngestionConfig().csv_export_paths == [os.path.join("artifacts", f"{name}.csv") for name in ("raw", "train", "test")]
+    assert DataIngestionConfig(artifact_format="csv").csv_export_paths == []
+    with pytest.raises(ValueError):
+        DataIngestionConfig(artifact_format="xlsx")
+
+
+def _streaming_config(tmp_path, source, chunk_size, fmt="parquet"):
+    artifacts = os.path.join(tmp_path, f"artifacts_{chunk_size}")
+    extension = ARTIFACT_FORMATS[fmt]
+    return DataIngestionConfig(
+        source_data_path=source, artifact_format=fmt, chunk_size=chunk_size,
+        train_data_path=os.path.join(artifacts, f"train{extension}"),
+        test_data_path=os.path.join(artifacts, f"test{extension}"),
+        raw_data_path=os.path.join(artifacts, f"raw{extension}"),
+    )
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "feather", "csv"])
+def test_streaming_split_does_not_depend_on_chunk_size(tmp_path, fmt):
+    source = os.path.join(tmp_path, "stud.csv")
+    generate_student_data(2000).to_csv(source, index=False)
+
+    splits = []
+    for chunk_size in (3, 128, 5000):
+        train_path, test_path = DataIngestion(_streaming_config(tmp_path, source, chunk_size, fmt)).initiate_data_ingestion()
+        splits.append((load_frame(train_path), load_frame(test_path)))
+
+    for train_df, test_df in splits[1:]:
+        pd.testing.assert_frame_equal(train_df, splits[0][0])
+        pd.testing.assert_frame_equal(test_df, splits[0][1])
+
+    train_df, test_df = splits[0]
+    assert len(train_df) + len(test_df) == 2000
+    assert 0.15 < len(test_df) / 2000 < 0.25
+    assert len(pd.merge(train_df, test_df)) == 0  # Identical rows always land on the same side
+
+
+def test_hash_split_depends_on_seed(student_df):
+    assert (hash_split(student_df, seed=1) != hash_split(student_df, seed=2)).any()
+    assert (hash_split(student_df.iloc[::-1], seed=1)[::-1] == hash_split(student_df, seed=1)).all()
+
+
+def test_stream_query_yields_chunks_and_closes_connection(student_df):
+    connection = sqlite3.connect(":memory:")
+    student_df.to_sql("student", connection, index=False)
+
+    chunks = list(stream_query(connection, connection.cursor(), "SELECT * FROM student", 64))
+
+    assert [len(chunk) for chunk in chunks] == [64, 64, 64, 8]
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), student_df)
+    with pytest.raises(sqlite3.ProgrammingError):
+        connection.execute("SELECT 1")
@@ -0,0 +1,82 @@
+import os
+import numpy as np
+import pytest
+from scipy import sparse
+from sklearn.ensemble import HistGradientBoostingRegressor
+from sklearn.linear_model import LinearRegression
+
+from src.mlproject.components.data_transformation import DataTransformation, CATEGORICAL_COLUMNS, TARGET_COLUMN
+from src.mlproject.components.model_trainer import train_candidate
+from src.mlproject.utils import save_frame, load_frame, load_object, load_features, model_input
+
+
+@pytest.fixture
+def split_files(tmp_path, student_df):
+    train_path, test_path = os.path.join(tmp_path, "train.parquet"), os.path.join(tmp_path, "test.parquet")
+    save_frame(student_df.iloc[:160], train_path)
+    save_frame(student_df.iloc[160:], test_path)
+    return train_path, test_path
+
+
+def test_dense_output_is_saved_as_memory_mappable_npy(tmp_path, split_files, transformation_config):
+    transformation = DataTransformation(transformation_config(os.path.join(tmp_path, "out")))
+    X_train, y_train, _, _, _ = transformation.initiate_data_transformation(*split_files)
+
+    assert isinstance(X_train, np.ndarray) and y_train.shape == (160,)
+    assert transformation.artifact_paths["train_features"].endswith(".npy")
+    assert isinstance(load_features(transformation.artifact_paths["train_features"]), np.memmap)
+
+
+@pytest.mark.parametrize("chunk_size", [None, 30])
+def test_sparse_output_stays_csr_end_to_end(tmp_path, split_files, transformation_config, chunk_size):
+    """Below sparse_threshold density the features are never densified, in memory or out of core."""
+    out = os.path.join(tmp_path, "out")
+    transformation = DataTransformation(transformation_config(out, sparse_threshold=1.0, chunk_size=chunk_size))
+    X_train, y_train, X_test, y_test, _ = transformation.initiate_data_transformation(*split_files)
+
+    assert sparse.issparse(X_train) and X_train.format == "csr"
+    assert sorted(os.listdir(out)) == [
+        "preprocessor.pkl", "test_features.npz", "test_target.npy", "train_features.npz", "train_target.npy",
+    ]
+    loaded = load_features(transformation.artifact_paths["train_features"])
+    assert sparse.issparse(loaded) and (loaded != X_train).nnz == 0
+
+    result = train_candidate("Linear Regression", {}, LinearRegression(), X_train, y_train, X_test, y_test)
+    dense = train_candidate("Linear Regression", {}, LinearRegression(), X_train.toarray(), y_train, X_test.toarray(), y_test)
+    assert result["r2"] == pytest.approx(dense["r2"], abs=1e-6)
+
+
+class PerChunkThreshold:
+    """Applies sparse_threshold to each transform call instead of once at fit time."""
+    def __init__(self, preprocessor, sparse_threshold):
+        self.preprocessor, self.sparse_threshold = preprocessor, sparse_threshold
+
+    def transform(self, X):
+        features = np.asarray(self.preprocessor.transform(X))
+        return sparse.csr_matrix(features) if np.count_nonzero(features) / features.size < self.sparse_threshold else features
+
+
+def test_chunks_on_both_sides_of_sparse_threshold_keep_every_row(tmp_path, split_files, transformation_config):
+    """Unseen categories one-hot to zeros, so only the second test chunk falls below the threshold."""
+    train_path, test_path = split_files
+    out = os.path.join(tmp_path, "out")
+    transformation = DataTransformation(transformation_config(out, chunk_size=20))
+    _, _, _, _, preprocessor_path = transformation.initiate_data_transformation(train_path, test_path)
+    test_df = load_frame(test_path)
+    test_df.iloc[20:, test_df.columns.get_indexer(CATEGORICAL_COLUMNS)] = "unseen"
+    save_frame(test_df, test_path)
+
+    preprocessor = PerChunkThreshold(load_object(preprocessor_path), sparse_threshold=0.3)
+    X_test, y_test = transformation._transform_in_chunks(preprocessor, test_path, os.path.join(out, "mixed"))
+
+    assert sparse.issparse(X_test) and X_test.shape[0] == len(y_test) == 40
+    expected = preprocessor.preprocessor.transform(test_df.drop(columns=[TARGET_COLUMN]))
+    np.testing.assert_allclose(X_test.toarray(), np.asarray(expected))
+    np.testing.assert_array_equal(y_test, test_df[TARGET_COLUMN].to_numpy())
+
+
+def test_model_input_densifies_only_when_required():
+    X = sparse.random(10, 5, density=0.2, format="csr", random_state=0)
+
+    assert model_input(LinearRegression(), X) is X
+    assert isinstance(model_input(HistGradientBoostingRegressor(), X), np.ndarray)
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
+
+from src.mlproject.components.drift_monitor import DriftMonitor, DriftMonitorConfig, RegressionAccumulator
+from src.mlproject.utils import generate_student_data
+
+
+def test_accumulator_merges_to_the_batch_metrics():
+    rng = np.random.default_rng(0)
+    y_true, y_pred = rng.normal(60, 15, 1000), rng.normal(60, 15, 1000)
+
+    merged = RegressionAccumulator()
+    for start in range(0, 1000, 37):
+        merged.merge(RegressionAccumulator().update(y_true[start:start + 37], y_pred[start:start + 37]))
+    metrics = merged.metrics()
+
+    assert metrics["rmse"] == pytest.approx(np.sqrt(mean_squared_error(y_true, y_pred)))
+    assert metrics["mae"] == pytest.approx(mean_absolute_error(y_true, y_pred))
+    assert metrics["r2"] == pytest.approx(r2_score(y_true, y_pred))
+
+
+def _events(n_rows, random_state, shift=0):
+    df = generate_student_data(n_rows, random_state=random_state)
+    df["reading_score"] = (df["reading_score"] + shift).clip(0, 100)
+    predictions = 0.5 * df["reading_score"] + 0.4 * df["writing_score"]
+    return df.drop(columns=["math_score"]), predictions, df["math_score"]
+
+
+@pytest.mark.parametrize("slide, expected_windows", [(None, 4), (100, 13)])
+def test_tumbling_and_sliding_windows(slide, expected_windows):
+    monitor = DriftMonitor.from_reference_frame(
+        generate_student_data(2000), DriftMonitorConfig(window_size=400, slide=slide),
+    )
+    features, predictions, actuals = _events(1600, random_state=1)
+    reports = []
+    for start in range(0, 1600, 150):  # Batches that straddle pane boundaries
+        reports += monitor.record(features.iloc[start:start + 150], predictions[start:start + 150], actuals[start:start + 150])
+
+    assert len(reports) == expected_windows
+    assert all(report["events"] == 400 for report in reports)
+    assert [report["window_end"] for report in reports][-1] == 1600
+    assert not any(report["retrain"] for report in reports)
+    assert reports[-1]["r2"] > 0.6
+
+
+def test_drifted_window_triggers_retrain_once_per_cooldown():
+    triggered = []
+    monitor = DriftMonitor.from_reference_frame(
+        generate_student_data(2000), DriftMonitorConfig(window_size=200, cooldown_windows=2), on_retrain=triggered.append,
+    )
+    features, predictions, actuals = _events(1000, random_state=1, shift=-40)
+    features["lunch"] = "free"
+
+    reports = monitor.record(features, predictions, actuals)
+
+    assert [report["retrain"] for report in reports] == [True, False, False, True, False]
+    assert len(triggered) == 2
+    assert reports[0]["psi"]["reading_score"] > 0.2 and reports[0]["psi"]["lunch"] > 0.2
+    assert reports[0]["ks"]["reading_score"] > 0.2 and reports[0]["ks"]["writing_score"] < 0.2
+
+
+def test_window_must_be_a_multiple_of_slide():
+    with pytest.raises(ValueError):
+        DriftMonitor.from_reference_frame(generate_student_data(100), DriftMonitorConfig(window_size=100, slide=30))
+
+
+def test_unlabelled_events_and_bad_predictions_are_left_out_of_the_metrics():
+    monitor = DriftMonitor.from_reference_frame(generate_student_data(2000), DriftMonitorConfig(window_size=100))
+    features, predictions, actuals = _events(200, random_state=1)
+    predictions = predictions.to_numpy().copy()
+    predictions[3] = np.nan  # e.g. an unparseable "prediction" coerced by /monitor/events
+
+    unlabelled, labelled = monitor.record(features, predictions, np.r_[np.full(100, np.nan), actuals[100:]])
+
+    assert (unlabelled["labelled"], unlabelled["rmse"], unlabelled["mae"], unlabelled["r2"]) == (0, None, None, None)
+    assert labelled["labelled"] == 100 and np.isfinite(labelled["rmse"])
+    monitor.record(features.iloc[:100], predictions[:100], actuals[:100])
+    assert monitor.latest()["labelled"] == 99
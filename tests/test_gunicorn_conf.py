@@ -0,0 +1,44 @@
+import os
+import signal
+import importlib.util
+from types import SimpleNamespace
+
+
+def load_conf(monkeypatch):
+    monkeypatch.setenv("GUNICORN_PRELOAD", "0")  # Importing with preload would disable gc in the test process
+    monkeypatch.setenv("MONITOR_SERVICE_URL", "http://127.0.0.1:9")  # Keeps the sidecar setup out of os.environ
+    path = os.path.join(os.path.dirname(os.path.dirname(__file__)), "gunicorn.conf.py")
+    spec = importlib.util.spec_from_file_location("gunicorn_conf", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_master_is_asked_to_reload_once_per_new_version(monkeypatch, tmp_path):
+    conf = load_conf(monkeypatch)
+    monkeypatch.setattr(conf.tempfile, "gettempdir", lambda: str(tmp_path))
+    signals = []
+    monkeypatch.setattr(conf.os, "kill", lambda pid, sig: signals.append((pid, sig)))
+    workers = [SimpleNamespace(ppid=4242, log=SimpleNamespace(info=lambda message: None)) for _ in range(3)]
+
+    for worker in workers:
+        conf._request_master_reload(worker, "v1", "v1")  # Still the preloaded model
+        conf._request_master_reload(worker, "v1", None)  # Artifact rewritten mid-read, retried later
+    assert signals == []
+
+    for worker in workers:
+        conf._request_master_reload(worker, "v1", "v2")
+    conf._request_master_reload(workers[0], "v1", "v3")
+    assert signals == [(4242, signal.SIGHUP), (4242, signal.SIGHUP)]
+
+    conf.on_exit(SimpleNamespace(pid=4242))
+    assert os.listdir(tmp_path) == []
+
+
+def test_worker_exit_writes_out_queued_log_records(monkeypatch):
+    conf = load_conf(monkeypatch)
+    from src.mlproject import logger as mlproject_logger
+    stopped = []
+    monkeypatch.setattr(mlproject_logger, "stop", lambda: stopped.append(True))
+    conf.worker_exit(None, None)
+    assert stopped == [True]
@@ -0,0 +1,64 @@
+import os
+import numpy as np
+import pytest
+
+from src.mlproject.components.data_transformation import DataTransformation
+from src.mlproject.components.incremental_preprocessor import IncrementalPreprocessor, QuantileSketch
+from src.mlproject.utils import save_frame
+
+
+@pytest.fixture
+def frame_with_missing(student_df):
+    df = student_df.drop(columns=["math_score"]).astype({"reading_score": float})
+    rng = np.random.default_rng(1)
+    df.loc[rng.random(len(df)) < 0.1, "reading_score"] = np.nan
+    df.loc[rng.random(len(df)) < 0.1, "lunch"] = np.nan
+    return df
+
+
+@pytest.mark.parametrize("chunk_size", [1, 37, 1000])
+def test_matches_in_memory_fit(frame_with_missing, chunk_size):
+    df = frame_with_missing
+    expected = DataTransformation().get_data_transform_object().fit(df)
+
+    incremental = IncrementalPreprocessor(DataTransformation().get_data_transform_object())
+    for start in range(0, len(df), chunk_size):
+        incremental.partial_fit(df.iloc[start:start + chunk_size])
+    fitted = incremental.to_column_transformer()
+
+    for (_, expected_pipeline, _), (_, pipeline, _) in zip(expected.transformers_, fitted.transformers_):
+        np.testing.assert_array_equal(pipeline["imputer"].statistics_, expected_pipeline["imputer"].statistics_)
+        np.testing.assert_allclose(pipeline["scaler"].scale_, expected_pipeline["scaler"].scale_)
+    np.testing.assert_array_equal(fitted.get_feature_names_out(), expected.get_feature_names_out())
+    np.testing.assert_allclose(fitted.transform(df), expected.transform(df), atol=1e-12)
+
+
+def test_quantile_sketch_is_exact_for_few_distinct_values_and_close_otherwise():
+    rng = np.random.default_rng(0)
+    scores = rng.integers(0, 101, 10_001).astype(float)
+    sketch = QuantileSketch(max_bins=256)
+    for chunk in np.array_split(scores, 13):
+        sketch.update(chunk)
+    assert sketch.exact and sketch.quantile(0.5) == np.median(scores)
+
+    values = rng.normal(size=100_000)
+    sketch = QuantileSketch(max_bins=1024)
+    for chunk in np.array_split(values, 50):
+        sketch.update(chunk)
+    assert not sketch.exact and len(sketch.values) <= 1024
+    assert abs(sketch.quantile(0.5) - np.median(values)) < 0.01
+
+
+def test_chunked_transformation_matches_in_memory(tmp_path, student_df, transformation_config):
+    train_path, test_path = os.path.join(tmp_path, "train.parquet"), os.path.join(tmp_path, "test.parquet")
+    save_frame(student_df.iloc[:160], train_path)
+    save_frame(student_df.iloc[160:], test_path)
+
+    expected = DataTransformation(transformation_config(os.path.join(tmp_path, "memory"))) \
+        .initiate_data_transformation(train_path, test_path)
+    chunked = DataTransformation(transformation_config(os.path.join(tmp_path, "chunked"), chunk_size=25)) \
+        .initiate_data_transformation(train_path, test_path)
+
+    assert isinstance(chunked[0], np.memmap)
+    for actual, wanted in zip(chunked[:4], expected[:4]):
+        np.testing.assert_allclose(actual, wanted, atol=1e-12)
@@ -0,0 +1,89 @@
+import json
+import time
+import asyncio
+import threading
+
+import pytest
+
+import asgi
+from src.mlproject.pipelines.inference_executor import InferenceExecutor, InferenceExecutorConfig, InferenceOverloaded
+from src.mlproject.pipelines.model_registry import ModelRegistry, ModelRegistryConfig
+
+
+def test_full_executor_rejects_and_queued_requests_time_out():
+    release = threading.Event()
+    ran = []
+
+    def work(name):
+        ran.append(name)
+        release.wait(5)
+        return name
+
+    async def scenario():
+        executor = InferenceExecutor(InferenceExecutorConfig(max_workers=1, max_queue_size=1, timeout_seconds=0.2))
+        running = asyncio.ensure_future(executor.run(work, "running"))
+        queued = asyncio.ensure_future(executor.run(work, "queued"))
+        await asyncio.sleep(0.05)
+
+        with pytest.raises(InferenceOverloaded):
+            await executor.run(work, "rejected")
+        for task in (running, queued):
+            with pytest.raises(TimeoutError):
+                await task
+
+        # The queued request was cancelled before it ran and freed its slot at once;
+        # the running one keeps its slot until it actually finishes
+        assert executor.snapshot()["in_flight"] == 1
+        release.set()
+        await asyncio.sleep(0.1)
+        assert await executor.run(lambda: "ok") == "ok"
+        assert ran == ["running"]
+        stats = executor.snapshot()
+        assert (stats["in_flight"], stats["rejected"], stats["timeouts"], stats["completed"]) == (0, 1, 2, 1)
+        executor.shutdown()
+
+    asyncio.run(scenario())
+
+
+async def post(app, path, body, content_type="application/json"):
+    """Drive one request through the ASGI app, return (status, json body)."""
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+    scope = {
+        "type": "http", "http_version": "1.1", "method": "POST", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "headers": [(b"content-type", content_type.encode())], "scheme": "http",
+        "server": ("test", 80), "client": ("test", 1234), "root_path": "",
+    }
+    sent = []
+
+    async def receive():
+        return messages.pop(0) if messages else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    await app(scope, receive, send)
+    status = next(m["status"] for m in sent if m["type"] == "http.response.start")
+    return status, json.loads(b"".join(m.get("body", b"") for m in sent if m["type"] == "http.response.body"))
+
+
+def test_asgi_predict_contract_and_backpressure(monkeypatch, trained_artifacts, student_df):
+    model_path, preprocessor_path = trained_artifacts
+    registry = ModelRegistry(ModelRegistryConfig(model_path=model_path, preprocessor_path=preprocessor_path))
+    monkeypatch.setattr(asgi, "registry", registry)
+    record = student_df.drop(columns=["math_score"]).iloc[0].to_dict()
+    expected = registry.get().predict_record(record).tolist()
+
+    async def scenario():
+        monkeypatch.setattr(asgi, "executor", InferenceExecutor(InferenceExecutorConfig(max_workers=2)))
+        assert await post(asgi.app, "/predict", json.dumps(record).encode()) == (200, {"prediction": expected})
+        assert (await post(asgi.app, "/predict", b"gender=female", "text/plain"))[0] == 400
+        assert (await post(asgi.app, "/predict", json.dumps({**record, "reading_score": "n/a"}).encode()))[0] == 400
+
+        slow = InferenceExecutor(InferenceExecutorConfig(max_workers=1, max_queue_size=0, timeout_seconds=0.1))
+        monkeypatch.setattr(asgi, "executor", slow)
+        monkeypatch.setattr(asgi, "predict_record", lambda data: time.sleep(0.3))
+        statuses = await asyncio.gather(*[post(asgi.app, "/predict", json.dumps(record).encode()) for _ in range(3)])
+        assert sorted(status for status, _ in statuses) == [503, 503, 504]
+        slow.shutdown()
+
+    asyncio.run(scenario())
@@ -0,0 +1,88 @@
+import os
+import json
+import time
+import queue
+import logging
+import logging.handlers
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from src.mlproject import logger as mlproject_logger
+
+
+def test_queue_handler_snapshots_the_message_and_the_listener_writes_it(tmp_path):
+    path = os.path.join(tmp_path, "app.log")
+    file_handler = mlproject_logger._file_handler(path)
+    file_handler.setFormatter(mlproject_logger.JsonFormatter())
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, file_handler)
+    listener.start()
+
+    test_logger = logging.getLogger("test_logger.queue")
+    test_logger.propagate = False
+    test_logger.setLevel(logging.INFO)
+    test_logger.addHandler(mlproject_logger._QueueHandler(log_queue))
+    try:
+        shape = [10, 3]
+        test_logger.info("input shape %s", shape)
+        shape.append(99)  # Mutated before the listener runs: the queued message must not change
+        test_logger.debug("filtered %s", shape)
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            test_logger.exception("failed")
+    finally:
+        listener.stop()
+        file_handler.close()
+        test_logger.handlers.clear()
+
+    with open(path) as file_obj:
+        entries = [json.loads(line) for line in file_obj]
+    assert [(e["level"], e["message"]) for e in entries] == [("INFO", "input shape [10, 3]"), ("ERROR", "failed")]
+    assert entries[0]["process"] == os.getpid()
+    assert "ValueError: boom" in entries[1]["exc_info"]
+
+
+def test_forked_child_gets_its_own_listener_and_file():
+    mlproject_logger.logger.info("parent before fork")
+    pid = os.fork()
+    if pid == 0:
+        try:
+            mlproject_logger.logger.info("child %s", os.getpid())
+            mlproject_logger.stop()
+        finally:
+            os._exit(0)
+    os.waitpid(pid, 0)
+    mlproject_logger.flush()
+
+    root, extension = os.path.splitext(mlproject_logger.LOG_FILE_PATH)
+    child_path = f"{root}-{pid}{extension}"
+    try:
+        with open(child_path) as file_obj:
+            assert f"child {pid}" in file_obj.read()
+    finally:
+        os.remove(child_path)
+
+
+def _log_in_pool_worker(n_records):
+    handler = mlproject_logger._listener.handlers[0]
+    emit = handler.emit
+    handler.emit = lambda record: time.sleep(0.002) or emit(record)  # A slow disk: still writing at exit
+    for i in range(n_records):
+        mlproject_logger.logger.info("pool record %s", i)
+    return os.getpid()
+
+
+def test_pool_worker_logs_survive_os_exit():
+    """Pool workers skip atexit; the initializer still writes out their queued records."""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("fork"),
+                             initializer=mlproject_logger.stop_at_worker_exit) as pool:
+        pid = pool.submit(_log_in_pool_worker, 200).result()
+
+    root, extension = os.path.splitext(mlproject_logger.LOG_FILE_PATH)
+    child_path = f"{root}-{pid}{extension}"
+    try:
+        with open(child_path) as file_obj:
+            assert "pool record 199" in file_obj.read()
+    finally:
+        os.remove(child_path)
@@ -0,0 +1,104 @@
+import os
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from src.mlproject.components.lookup_table import LookupTable, LookupTableConfig, LookupTableExporter
+from src.mlproject.pipelines.model_registry import ModelRegistry, ModelRegistryConfig
+from src.mlproject.pipelines.prediction_pipeline import PredictionPipeline, validate_record
+from src.mlproject.utils import save_object
+
+
+@pytest.fixture
+def exported_table(tmp_path, trained_artifacts):
+    model_path, preprocessor_path = trained_artifacts
+    config = LookupTableConfig(
+        model_path=model_path, preprocessor_path=preprocessor_path,
+        table_path=os.path.join(tmp_path, "prediction_table.npy"),
+        score_range=(40, 60), categories={"gender": ["female"]}, batch_size=1000,
+    )
+    return LookupTableExporter(config).initiate_export()
+
+
+def test_table_matches_live_model_inside_the_grid(exported_table, trained_artifacts, student_df):
+    table = LookupTable.load(exported_table)
+    pipeline = PredictionPipeline(*trained_artifacts)
+    assert table.table.shape == (1, 5, 6, 2, 2, 21, 21) and isinstance(table.table, np.memmap)
+    assert table.table.dtype == np.float64
+
+    records = student_df.drop(columns=["math_score"]).assign(gender="female")
+    records = records[records["reading_score"].between(40, 60) & records["writing_score"].between(40, 60)]
+    rows = [validate_record(record)[0] for record in records.to_dict("records")]
+
+    np.testing.assert_allclose(table.lookup_rows(rows), pipeline.predict(records), rtol=1e-12)
+
+    row = rows[0]
+    for outside in ({"gender": "male"}, {"reading_score": 61.0}, {"reading_score": 50.5},
+                    {"writing_score": np.nan}, {"lunch": "unknown"}):
+        assert table.lookup({**row, **outside}) is None
+
+
+def test_registry_serves_from_a_matching_table_and_falls_back(exported_table, trained_artifacts, student_df):
+    model_path, preprocessor_path = trained_artifacts
+    registry = ModelRegistry(ModelRegistryConfig(
+        model_path=model_path, preprocessor_path=preprocessor_path, check_interval_seconds=0,
+        lookup_table_path=exported_table,
+    ))
+    pipeline = registry.get()
+    assert pipeline.lookup_table is not None
+
+    record = dict(student_df.drop(columns=["math_score"]).iloc[0], gender="female", reading_score=50, writing_score=45)
+    live = PredictionPipeline(model_path, preprocessor_path).predict_record(record)
+    calls = []
+    predict = pipeline.model.predict
+    pipeline.model.predict = lambda X: calls.append(len(X)) or predict(X)
+
+    np.testing.assert_allclose(pipeline.predict_record(record), live, rtol=1e-5)
+    assert calls == []
+    pipeline.predict_record(dict(record, reading_score=70))  # Outside the grid -> live model
+    assert calls == [1]
+
+    # A model replaced after the export no longer matches the table
+    X = pipeline.preprocessor.transform(student_df.drop(columns=["math_score"]))
+    save_object(model_path, LinearRegression().fit(X, student_df["reading_score"]))
+    os.utime(model_path, ns=(1, 1))
+    assert registry.get().lookup_table is None
+
+
+def test_frame_lookup_matches_row_lookup_and_flags_misses(exported_table, student_df):
+    table = LookupTable.load(exported_table)
+    frame = student_df.drop(columns=["math_score"]).assign(gender="female", writing_score=50).astype({"reading_score": object})
+    frame.loc[frame.index[:3], "reading_score"] = ["55", 50.5, None]
+
+    predictions, found = table.lookup_frame(frame)
+
+    rows = [validate_record(record)[0] for record in frame.to_dict("records")]
+    expected = [table.lookup(row) for row in rows]
+    assert found.tolist() == [value is not None for value in expected]
+    assert found[0] and not found[1] and not found[2]
+    np.testing.assert_array_equal(predictions[found], [value for value in expected if value is not None])
+
+
+def test_export_switches_tables_through_the_metadata(exported_table, trained_artifacts, student_df, tmp_path):
+    """Each export writes its own table file; the metadata is replaced last and names it."""
+    model_path, preprocessor_path = trained_artifacts
+    config = LookupTableConfig(
+        model_path=model_path, preprocessor_path=preprocessor_path, table_path=exported_table,
+        score_range=(40, 60), categories={"gender": ["female"]}, batch_size=1000,
+    )
+    first = LookupTable.load(exported_table)
+    pipeline = PredictionPipeline(model_path, preprocessor_path)
+    X = pipeline.preprocessor.transform(student_df.drop(columns=["math_score"]))
+
+    tables = [first.metadata["table_file"]]
+    for target in ("reading_score", "writing_score"):
+        save_object(model_path, LinearRegression().fit(X, student_df[target]))
+        LookupTableExporter(config).initiate_export()
+        tables.append(LookupTable.load(exported_table).metadata["table_file"])
+
+    assert len(set(tables)) == 3 and not os.path.exists(os.path.join(tmp_path, "prediction_table.json.tmp"))
+    # The table of the previous metadata is kept for readers that just read it, the one before is removed
+    on_disk = sorted(name for name in os.listdir(tmp_path) if name.startswith("prediction_table.") and name.endswith(".npy"))
+    assert on_disk == sorted(tables[1:])
+    assert LookupTable.load(exported_table).matches(model_path, preprocessor_path)
+    assert not first.matches(model_path, preprocessor_path)
@@ -0,0 +1,54 @@
+import pytest
+
+from src.mlproject import metrics
+from src.mlproject.pipelines.prediction_pipeline import PredictionPipeline
+
+
+@pytest.fixture
+def enabled_metrics():
+    metrics.reset()
+    metrics.enable(True)
+    yield metrics
+    metrics.enable(False)
+    metrics.reset()
+
+
+def test_disabled_spans_record_nothing():
+    metrics.reset()
+    metrics.enable(False)
+    with metrics.span("predict"):
+        pass
+    assert metrics.span("predict") is metrics.span("preprocess")  # One shared no-op object
+    assert "mlproject_span_seconds_count" not in metrics.render()
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = metrics.Histogram("demo_seconds", "Demo.", ("span",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 5.0):
+        histogram.observe(value, 'a"b')
+
+    assert histogram.render() == [
+        "# HELP demo_seconds Demo.",
+        "# TYPE demo_seconds histogram",
+        'demo_seconds_bucket{span="a\\"b",le="0.1"} 1',
+        'demo_seconds_bucket{span="a\\"b",le="1.0"} 3',
+        'demo_seconds_bucket{span="a\\"b",le="+Inf"} 4',
+        'demo_seconds_sum{span="a\\"b"} 6.05',
+        'demo_seconds_count{span="a\\"b"} 4',
+    ]
+
+
+def test_spans_time_the_prediction_path_and_count_errors(enabled_metrics, trained_artifacts, student_df, monkeypatch):
+    monkeypatch.setattr(metrics, "_collectors", [])
+    pipeline = PredictionPipeline(*trained_artifacts)
+    pipeline.predict(student_df.drop(columns=["math_score"]).head(5))
+    with pytest.raises(ValueError):
+        metrics.timed("failing")(int)("x")
+    metrics.register_collector(lambda: {"demo_gauge": ("gauge", "Demo.", 3)})
+
+    text = metrics.render()
+    assert 'mlproject_span_seconds_count{span="load_object"} 2' in text
+    assert 'mlproject_span_seconds_count{span="preprocess"} 1' in text
+    assert 'mlproject_span_seconds_count{span="predict"} 1' in text
+    assert 'mlproject_span_errors_total{span="failing"} 1' in text
+    assert "# TYPE demo_gauge gauge\ndemo_gauge 3.0" in text
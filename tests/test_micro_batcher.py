@@ -0,0 +1,66 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from src.mlproject.pipelines.micro_batcher import MicroBatcher, MicroBatcherConfig
+from src.mlproject.pipelines.prediction_pipeline import PredictionPipeline
+
+
+@pytest.fixture
+def pipeline(trained_artifacts):
+    model_path, preprocessor_path = trained_artifacts
+    return PredictionPipeline(model_path, preprocessor_path)
+
+
+def test_concurrent_requests_are_coalesced(pipeline, student_df):
+    """Concurrent single-row requests share model calls and get their own predictions back."""
+    features = student_df.drop(columns=["math_score"]).head(40)
+    expected = pipeline.predict(features)
+
+    batcher = MicroBatcher(lambda: pipeline, MicroBatcherConfig(max_batch_size=16, max_wait_ms=50))
+    batcher.start()
+    try:
+        rows = [features.iloc[[i]] for i in range(len(features))]
+        with ThreadPoolExecutor(max_workers=40) as pool:
+            results = list(pool.map(batcher.predict, rows))
+    finally:
+        batcher.stop(timeout=5)
+
+    np.testing.assert_allclose(np.concatenate(results), expected)
+    assert batcher.stats["requests"] == 40
+    assert batcher.stats["batches"] < 40
+
+
+def test_bad_request_does_not_fail_batch(pipeline, student_df):
+    """A request missing a column fails alone; the others in its batch still succeed."""
+    features = student_df.drop(columns=["math_score"]).head(3)
+    batcher = MicroBatcher(lambda: pipeline, MicroBatcherConfig(max_batch_size=8, max_wait_ms=50))
+    batcher.start()
+    try:
+        good = [batcher.submit(features.iloc[[0]]), batcher.submit(features.iloc[[1]])]
+        bad = batcher.submit(features.iloc[[2]].drop(columns=["gender"]))
+
+        assert len(good[0].result(timeout=5)) == 1
+        assert len(good[1].result(timeout=5)) == 1
+        with pytest.raises(Exception):
+            bad.result(timeout=5)
+    finally:
+        batcher.stop(timeout=5)
+
+
+def test_expired_requests_are_not_scored(pipeline, student_df):
+    """A request whose caller has given up while it was queued is dropped from the batch."""
+    features = student_df.drop(columns=["math_score"]).head(2)
+    batcher = MicroBatcher(lambda: pipeline, MicroBatcherConfig(max_batch_size=8, max_wait_ms=20))
+    expired = batcher.submit(features.iloc[[0]], timeout=0.01)
+    time.sleep(0.05)
+    live = batcher.submit(features.iloc[[1]])
+    batcher.start()
+    try:
+        assert len(live.result(timeout=5)) == 1
+        assert expired.cancelled()
+        assert batcher.stats["requests"] == 1
+    finally:
+        batcher.stop(timeout=5)
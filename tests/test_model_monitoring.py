@@ -0,0 +1,149 @@
+import os
+import sys
+import pytest
+from catboost import CatBoostRegressor
+from sklearn.ensemble import GradientBoostingRegressor
+from sklearn.metrics import r2_score
+from xgboost import XGBRegressor
+
+from src.mlproject import tracking
+from src.mlproject.exception import CustomException
+from src.mlproject.components.data_transformation import DataTransformation, TARGET_COLUMN
+from src.mlproject.components.model_monitoring import (
+    ModelMonitoring, RetrainConfig, continue_training, population_stability_index,
+)
+from src.mlproject.components.model_trainer import ModelTrainer, ModelTrainerConfig
+from src.mlproject.utils import generate_student_data, save_frame, save_object, load_frame, load_object
+
+
+class RecordingTracker:
+    def __init__(self):
+        self.runs = []
+
+    def log_run(self, experiment_name, run_name, **kwargs):
+        self.runs.append((experiment_name, run_name, kwargs))
+
+
+@pytest.fixture
+def monitored_model(tmp_path, monkeypatch, transformation_config):
+    """Train/test artifacts, a fitted preprocessor and an XGBoost model under tmp_path."""
+    monkeypatch.setattr(tracking, "_tracker", RecordingTracker())
+    df = generate_student_data(600)
+    train_df, test_df = df.iloc[:500], df.iloc[500:]
+    paths = {name: os.path.join(tmp_path, f"{name}.parquet") for name in ("train", "test")}
+    save_frame(train_df, paths["train"])
+    save_frame(test_df, paths["test"])
+
+    preprocessor = DataTransformation().get_data_transform_object()
+    X = preprocessor.fit_transform(train_df.drop(columns=[TARGET_COLUMN]))
+    model = XGBRegressor(n_estimators=20, random_state=42).fit(X, train_df[TARGET_COLUMN])
+    paths["model"], paths["preprocessor"] = os.path.join(tmp_path, "best_model.pkl"), os.path.join(tmp_path, "preprocessor.pkl")
+    save_object(paths["model"], model)
+    save_object(paths["preprocessor"], preprocessor)
+
+    config = RetrainConfig(
+        train_data_path=paths["train"], test_data_path=paths["test"], extra_rounds=10,
+        transformation_config=transformation_config(tmp_path),
+        trainer_config=ModelTrainerConfig(trained_model_file_path=paths["model"]),
+    )
+    return ModelMonitoring(paths["model"], paths["preprocessor"]), config, paths
+
+
+def test_incremental_retrain_continues_boosting_and_keeps_preprocessor(tmp_path, monitored_model):
+    monitor, config, paths = monitored_model
+    preprocessor = monitor.preprocessor
+    new_path = os.path.join(tmp_path, "new.parquet")
+    save_frame(generate_student_data(100, random_state=1), new_path)
+
+    result = monitor.retrain_model(new_path, config)
+
+    assert result["mode"] == "incremental" and result["strategy"] == "xgb_model"
+    assert result["seconds"] > 0 and result["r2"] > 0.6
+    assert monitor.preprocessor is preprocessor
+    assert load_object(paths["model"]).get_booster().num_boosted_rounds() == 30
+    assert len(load_frame(paths["train"])) == 600
+
+
+def test_new_rows_are_committed_once_and_only_with_a_saved_model(tmp_path, monitored_model, monkeypatch):
+    monitor, config, paths = monitored_model
+    new_path = os.path.join(tmp_path, "new.parquet")
+    save_frame(generate_student_data(100, random_state=1), new_path)
+
+    def fail(train_df, config):
+        raise RuntimeError("training crashed")
+    with monkeypatch.context() as patch:
+        patch.setattr(monitor, "_retrain_incremental", fail)
+        with pytest.raises(CustomException):
+            monitor.retrain_model(new_path, config)
+    assert len(load_frame(paths["train"])) == 500
+    assert not any(".retrain" in name for name in os.listdir(tmp_path))
+
+    assert monitor.retrain_model(new_path, config)["mode"] == "incremental"
+    assert monitor.retrain_model(new_path, config)["mode"] == "skipped"  # Same file triggered again
+    assert len(load_frame(paths["train"])) == 600
+
+
+def test_drift_falls_back_to_full_retrain(tmp_path, monitored_model):
+    monitor, config, paths = monitored_model
+    drifted = generate_student_data(100, random_state=1)
+    drifted["lunch"] = "free"  # A category the encoder has never seen
+    new_path = os.path.join(tmp_path, "new.parquet")
+    save_frame(drifted, new_path)
+
+    result = monitor.retrain_model(new_path, config)
+
+    assert result["mode"] == "full" and "drift" in result["reason"]
+    assert result["drift"]["unseen_categories"] == {"lunch": ["free"]}
+    assert "free" in monitor.preprocessor.named_transformers_["cat_pipeline"]["one_hot_encoder"].categories_[3]
+    assert result["seconds"] > 0
+
+
+def test_rejected_full_retrain_keeps_the_live_preprocessor(tmp_path, monitored_model, monkeypatch):
+    """The refit preprocessor only replaces preprocessor.pkl together with an accepted model."""
+    monitor, config, paths = monitored_model
+    drifted = generate_student_data(100, random_state=1)
+    drifted["lunch"] = "free"
+    new_path = os.path.join(tmp_path, "new.parquet")
+    save_frame(drifted, new_path)
+    before = {name: _read_bytes(paths[name]) for name in ("model", "preprocessor")}
+
+    def reject(self, X_train, y_train, X_test, y_test):
+        raise CustomException("No best model found with an acceptable R2 score.", sys)
+    monkeypatch.setattr(ModelTrainer, "initiate_model_trainer", reject)
+    with pytest.raises(CustomException):
+        monitor.retrain_model(new_path, config)
+
+    assert {name: _read_bytes(paths[name]) for name in ("model", "preprocessor")} == before
+    assert not any(".retrain" in name for name in os.listdir(tmp_path))
+    assert not os.path.exists(os.path.join(tmp_path, "release.json"))
+
+
+def _read_bytes(path):
+    with open(path, "rb") as file_obj:
+        return file_obj.read()
+
+
+def test_continue_training_strategies_and_psi():
+    df = generate_student_data(300)
+    X, y = df[["reading_score", "writing_score"]].to_numpy(), df[TARGET_COLUMN].to_numpy()
+    model, strategy = continue_training(GradientBoostingRegressor(n_estimators=10).fit(X, y), X, y, extra_rounds=5)
+    assert strategy == "warm_start" and len(model.estimators_) == 15
+
+    catboost = CatBoostRegressor(iterations=10, verbose=False, allow_writing_files=False).fit(X, y)
+    model, strategy = continue_training(catboost, X, y, extra_rounds=5)
+    assert strategy == "init_model" and model.tree_count_ == 15
+
+    assert population_stability_index(df["reading_score"], df["reading_score"]) == pytest.approx(0.0)
+    assert population_stability_index(df["reading_score"], df["reading_score"] * 0.3) > 0.2
+
+
+@pytest.mark.parametrize("chunk_size", [7, 50_000])
+def test_evaluate_model_streams_chunks(monitored_model, chunk_size):
+    monitor, config, paths = monitored_model
+    test_df = load_frame(paths["test"])
+    expected = monitor.model.predict(monitor.preprocessor.transform(test_df.drop(columns=[TARGET_COLUMN])))
+
+    result = monitor.evaluate_model(paths["test"], chunk_size=chunk_size)
+
+    assert result["r2"] == pytest.approx(r2_score(test_df[TARGET_COLUMN], expected))
+    assert result["retrain_required"] is False
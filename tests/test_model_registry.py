@@ -0,0 +1,88 @@
+import os
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from src.mlproject.pipelines.model_registry import ModelRegistry, ModelRegistryConfig
+from src.mlproject.utils import save_object
+from src.mlproject.serialization import write_release
+from src.mlproject.exception import CustomException
+
+
+@pytest.fixture
+def registry(trained_artifacts):
+    model_path, preprocessor_path = trained_artifacts
+    return ModelRegistry(ModelRegistryConfig(
+        model_path=model_path,
+        preprocessor_path=preprocessor_path,
+        check_interval_seconds=0,
+    ))
+
+
+def test_registry_reuses_warm_pipeline(registry, student_df):
+    """The same pipeline is handed out while the artifacts are unchanged."""
+    first = registry.get()
+    second = registry.get()
+    assert first is second
+    assert len(first.predict(student_df.drop(columns=["math_score"]).head(3))) == 3
+
+
+def test_registry_hot_swaps_on_artifact_change(registry, trained_artifacts, student_df):
+    """Replacing best_model.pkl swaps in a new pipeline and notifies listeners."""
+    model_path, _ = trained_artifacts
+    reloads = []
+    registry.add_reload_listener(lambda pipeline, version: reloads.append(version))
+
+    old_pipeline = registry.get()
+    old_version = registry.version
+
+    X = old_pipeline.preprocessor.transform(student_df.drop(columns=["math_score"]))
+    save_object(model_path, LinearRegression(fit_intercept=False).fit(X, student_df["math_score"]))
+    stat = os.stat(model_path)
+    os.utime(model_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    new_pipeline = registry.get()
+    assert new_pipeline is not old_pipeline
+    assert registry.version != old_version
+    assert new_pipeline.model.fit_intercept is False
+    assert old_pipeline.model.fit_intercept is True  # in-flight holders keep a consistent pair
+    assert reloads == [old_version, registry.version]
+
+
+def test_registry_keeps_serving_when_reload_fails(registry, trained_artifacts):
+    """A corrupt artifact on disk does not replace the working pipeline."""
+    model_path, _ = trained_artifacts
+    pipeline = registry.get()
+
+    with open(model_path, "wb") as file_obj:
+        file_obj.write(b"not a pickle")
+
+    assert registry.get() is pipeline
+
+
+def test_registry_raises_without_model(tmp_path):
+    """Without trained artifacts the registry raises CustomException."""
+    registry = ModelRegistry(ModelRegistryConfig(
+        model_path=os.path.join(tmp_path, "missing.pkl"),
+        preprocessor_path=os.path.join(tmp_path, "missing_preprocessor.pkl"),
+    ))
+    with pytest.raises(CustomException):
+        registry.get()
+
+
+def test_registry_waits_for_the_release_of_a_new_pair(registry, trained_artifacts, student_df):
+    """A model saved without its release (preprocessor not rewritten yet) is not served."""
+    model_path, preprocessor_path = trained_artifacts
+    write_release(model_path, preprocessor_path)
+    old_pipeline = registry.get()
+    released_version = registry.version
+
+    X = old_pipeline.preprocessor.transform(student_df.drop(columns=["math_score"]))
+    save_object(model_path, LinearRegression(fit_intercept=False).fit(X, student_df["math_score"]))
+    assert registry.get() is old_pipeline
+    assert registry.version == released_version
+
+    write_release(model_path, preprocessor_path)
+    new_pipeline = registry.get()
+    assert new_pipeline is not old_pipeline
+    assert new_pipeline.model.fit_intercept is False
+    assert registry.version != released_version
@@ -1,6 +1,7 @@
 import os
 import pytest
-from src.mlproject.components.model_trainer import ModelTrainer
+from src.mlproject.components.model_trainer import ModelTrainer, ModelTrainerConfig, select_best_model
+from src.mlproject.components.data_transformation import DataTransformation
 from src.mlproject.utils import load_object
 from src.mlproject.exception import CustomException
 
@@ -24,3 +25,27 @@ def test_best_model_exists():
     model = load_object(model_path)
     assert model is not None, "Failed to load the best model!"
 
+
+@pytest.fixture
+def training_arrays(student_df):
+    preprocessor = DataTransformation().get_data_transform_object()
+    train_df, test_df = student_df.iloc[:160], student_df.iloc[160:]
+    X_train = preprocessor.fit_transform(train_df.drop(columns=["math_score"]))
+    X_test = preprocessor.transform(test_df.drop(columns=["math_score"]))
+    return X_train, train_df["math_score"].to_numpy(), X_test, test_df["math_score"].to_numpy()
+
+
+@pytest.mark.parametrize("backend", ["thread", "process"])
+def test_parallel_backends_match_serial(training_arrays, backend):
+    """Concurrent candidate training selects the same best model with the same scores as serial mode."""
+    serial = ModelTrainer(ModelTrainerConfig(execution_backend="serial", cpu_budget=2)).train_candidates(*training_arrays)
+    parallel = ModelTrainer(ModelTrainerConfig(execution_backend=backend, cpu_budget=4)).train_candidates(*training_arrays)
+
+    assert [r["model_name"] for r in parallel] == [r["model_name"] for r in serial]
+    assert [r["r2"] for r in parallel] == pytest.approx([r["r2"] for r in serial])
+    assert select_best_model(parallel)["model_name"] == select_best_model(serial)["model_name"]
+
+
+def test_unknown_backend_rejected(training_arrays):
+    with pytest.raises(ValueError):
+        ModelTrainer(ModelTrainerConfig(execution_backend="gpu")).train_candidates(*training_arrays)
@@ -0,0 +1,64 @@
+import warnings
+
+from sklearn.ensemble import GradientBoostingRegressor
+from sklearn.tree import DecisionTreeRegressor
+from sklearn.utils.validation import check_is_fitted
+from xgboost import XGBRegressor
+
+from src.mlproject.components.data_transformation import DataTransformation
+from src.mlproject.components.model_trainer import ModelTrainer, ModelTrainerConfig
+from src.mlproject.components.model_tuner import ModelTuner, ModelTunerConfig
+
+
+def _arrays(student_df):
+    preprocessor = DataTransformation().get_data_transform_object()
+    X = preprocessor.fit_transform(student_df.drop(columns=["math_score"]))
+    return X, student_df["math_score"].to_numpy()
+
+
+def test_halving_grows_the_budget_and_returns_fitted_estimator(student_df):
+    """Rungs run on increasing n_estimators and the refit best estimator is returned fitted."""
+    X, y = _arrays(student_df)
+    tuner = ModelTuner(ModelTunerConfig(search="halving_random", n_candidates=6, n_jobs=1))
+
+    best, best_params, seconds = tuner.tune("XGBRegressor", XGBRegressor(n_jobs=1), X, y)
+
+    check_is_fitted(best)
+    assert best_params["n_estimators"] <= 256
+    assert best.get_params()["n_estimators"] == best_params["n_estimators"]
+    assert seconds > 0
+
+
+def test_early_stopping_enabled_for_gradient_boosting(student_df):
+    X, y = _arrays(student_df)
+    best, _, _ = ModelTuner(ModelTunerConfig(search="halving_random", n_candidates=6, n_jobs=1, early_stopping_rounds=5)).tune(
+        "Gradient Boosting", GradientBoostingRegressor(random_state=0), X, y,
+    )
+    assert best.n_iter_no_change == 5
+    assert best.n_estimators_ <= best.n_estimators
+
+
+def test_model_trainer_uses_tuned_models(student_df):
+    """With tune_hyperparameters the logged params include the searched values."""
+    X, y = _arrays(student_df)
+    trainer = ModelTrainer(ModelTrainerConfig(tune_hyperparameters=True, cpu_budget=2))
+    models = [(name, params, model) for name, params, model in trainer.get_candidate_models()
+              if name in ("Decision Tree", "Linear Regression")]
+
+    results = trainer.train_candidates(X[:160], y[:160], X[160:], y[160:], models=models)
+
+    assert [r["model_name"] for r in results] == ["Decision Tree", "Linear Regression"]
+    assert "min_samples_leaf" in results[0]["params"]
+    check_is_fitted(results[1]["model"])
+
+
+def test_sample_halving_starts_with_enough_rows_per_fold(student_df):
+    """Halving on n_samples never scores a rung too small for CV (NaN scores warn)."""
+    X, y = _arrays(student_df)
+    tuner = ModelTuner(ModelTunerConfig(n_jobs=1))
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", UserWarning)
+        best, best_params, _ = tuner.tune("Decision Tree", DecisionTreeRegressor(random_state=0), X[:160], y[:160])
+
+    check_is_fitted(best)
+    assert "min_samples_leaf" in best_params
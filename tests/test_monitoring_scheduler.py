@@ -0,0 +1,114 @@
+import time
+import threading
+
+from src.mlproject.components.monitoring_scheduler import MonitoringScheduler, MonitoringSchedulerConfig
+
+
+class FakeMonitor:
+    def __init__(self, release=None):
+        self.release = release
+        self.calls = 0
+
+    def evaluate_model(self, new_data_path):
+        if self.release is not None:
+            self.release.wait(5)
+        self.calls += 1
+        return {"rmse": 1.0, "mae": 0.5, "r2": 0.9, "retrain_required": False}
+
+
+def wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_trigger_runs_evaluation_in_background():
+    """A trigger is evaluated on the worker thread and its result cached."""
+    monitor = FakeMonitor()
+    scheduler = MonitoringScheduler(MonitoringSchedulerConfig(interval_seconds=0), monitor_factory=lambda: monitor)
+    scheduler.start()
+    try:
+        assert scheduler.latest() is None
+        assert scheduler.trigger("manual")
+        assert wait_for(lambda: scheduler.latest() is not None)
+        latest = scheduler.latest()
+        assert latest["metrics"]["r2"] == 0.9
+        assert latest["trigger"] == "manual"
+        assert latest["error"] is None
+    finally:
+        scheduler.stop(timeout=5)
+
+
+def test_periodic_evaluation():
+    """With an interval set, evaluations run without any trigger."""
+    monitor = FakeMonitor()
+    scheduler = MonitoringScheduler(MonitoringSchedulerConfig(interval_seconds=0.05), monitor_factory=lambda: monitor)
+    scheduler.start()
+    try:
+        assert wait_for(lambda: monitor.calls >= 2)
+        assert scheduler.latest()["trigger"] == "periodic"
+    finally:
+        scheduler.stop(timeout=5)
+
+
+def test_full_queue_drops_triggers():
+    """Triggers beyond max_queue_size are rejected instead of blocking the caller."""
+    release = threading.Event()
+    monitor = FakeMonitor(release)
+    scheduler = MonitoringScheduler(
+        MonitoringSchedulerConfig(interval_seconds=0, max_queue_size=1),
+        monitor_factory=lambda: monitor,
+    )
+    scheduler.start()
+    try:
+        assert scheduler.trigger()
+        assert wait_for(lambda: scheduler._queue.empty())  # worker picked it up and is blocked
+        assert scheduler.trigger()
+        assert not scheduler.trigger()
+    finally:
+        release.set()
+        scheduler.stop(timeout=5)
+
+
+def test_failed_evaluation_is_reported():
+    """Errors in the background job are cached instead of crashing the worker."""
+    def broken_factory():
+        raise RuntimeError("artifacts missing")
+
+    scheduler = MonitoringScheduler(MonitoringSchedulerConfig(interval_seconds=0), monitor_factory=broken_factory)
+    scheduler.start()
+    try:
+        scheduler.trigger()
+        assert wait_for(lambda: scheduler.latest() is not None)
+        assert "artifacts missing" in scheduler.latest()["error"]
+    finally:
+        scheduler.stop(timeout=5)
+
+
+def test_retrain_request_runs_on_the_worker(tmp_path):
+    """request_retrain calls retrain_model with the labelled data path; a missing file is reported."""
+    class RetrainingMonitor(FakeMonitor):
+        def retrain_model(self, new_data_path):
+            return {"mode": "incremental", "path": new_data_path}
+
+    labelled = tmp_path / "labelled.parquet"
+    scheduler = MonitoringScheduler(
+        MonitoringSchedulerConfig(interval_seconds=0, retrain_data_path=str(labelled)),
+        monitor_factory=RetrainingMonitor,
+    )
+    scheduler.start()
+    try:
+        assert scheduler.request_retrain("window_drift")
+        assert wait_for(lambda: scheduler.latest_retrain() is not None)
+        assert scheduler.latest_retrain()["result"] is None and "No labelled data" in scheduler.latest_retrain()["error"]
+
+        labelled.write_bytes(b"")
+        assert scheduler.request_retrain("window_drift")
+        assert wait_for(lambda: scheduler.latest_retrain()["result"] is not None)
+        assert scheduler.latest_retrain()["result"]["path"] == str(labelled)
+        assert scheduler.latest() is None  # Retrains don't count as evaluations
+    finally:
+        scheduler.stop(timeout=5)
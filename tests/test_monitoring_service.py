@@ -0,0 +1,105 @@
+import os
+import time
+import threading
+import socketserver
+
+import numpy as np
+
+from src.mlproject.components.data_transformation import TARGET_COLUMN
+from src.mlproject.components.drift_monitor import DriftMonitorConfig
+from src.mlproject.components.monitoring_scheduler import MonitoringSchedulerConfig
+from src.mlproject.components.monitoring_service import (
+    MonitoringService, MonitoringServiceConfig, MonitoringClient, make_server,
+)
+from src.mlproject.utils import generate_student_data, save_frame
+
+
+def make_service(tmp_path):
+    reference_path = os.path.join(tmp_path, "train.csv")
+    save_frame(generate_student_data(500), reference_path)
+    return MonitoringService(MonitoringServiceConfig(
+        scheduler_config=MonitoringSchedulerConfig(interval_seconds=0),
+        drift_config=DriftMonitorConfig(window_size=100),
+        reference_data_path=reference_path,
+    ))
+
+
+def test_sidecar_answers_like_the_in_process_service(tmp_path):
+    """Workers reach one shared service over HTTP; its answers match the in-process ones."""
+    service = make_service(tmp_path)
+    server = make_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_port}"
+    client = MonitoringClient(url)
+
+    events = generate_student_data(60, random_state=3)
+    events["prediction"] = events[TARGET_COLUMN]
+    events = events.drop(columns=[TARGET_COLUMN]).to_dict(orient="records")
+    try:
+        assert client.handle("GET", "/monitor") == (200, {"metrics": None, "status": "pending"})
+        for _ in range(2):  # 2 x 60 events from two "workers" -> one full window of 100
+            assert client.handle("POST", "/monitor/events", events)[0] == 202
+        assert service.handle("POST", "/monitor/events", events[:10])[0] == 202
+
+        status, drift = client.handle("GET", "/monitor/drift")
+        assert (status, drift["events"]) == (200, 130)
+        assert drift == service.handle("GET", "/monitor/drift")[1]  # Unlabelled window: metrics are null, not NaN
+        assert drift["window"]["rmse"] is None
+        assert client.handle("POST", "/monitor/events", {"reading_score": 1})[0] == 400
+        assert client.handle("POST", "/monitor/events", dict(events[0], writing_score="abc"))[0] == 400
+        assert client.handle("GET", "/monitor/drift")[1]["events"] == 130
+        assert client.handle("GET", "/nope")[0] == 404
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert MonitoringClient(url).handle("GET", "/monitor") == (503, {"error": "Monitoring service unavailable."})
+
+
+class _RecordingServer(socketserver.ThreadingTCPServer):
+    """Counts the requests it receives; `respond` answers each one and then closes the connection."""
+    daemon_threads = True
+
+    def __init__(self, respond):
+        self.requests, self.respond = [], respond
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(handler):
+                handler.rfile.readline()
+                length = 0
+                for line in iter(handler.rfile.readline, b"\r\n"):
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":")[1])
+                self.requests.append(handler.rfile.read(length))
+                if self.respond:
+                    handler.wfile.write(b"HTTP/1.1 202 Accepted\r\nContent-Length: 2\r\n\r\n{}")
+                else:
+                    time.sleep(1)  # Received, but no answer before the client's timeout
+        super().__init__(("127.0.0.1", 0), Handler)
+
+
+def test_client_never_resends_a_post_that_timed_out():
+    server = _RecordingServer(respond=False)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        client = MonitoringClient(f"http://127.0.0.1:{server.server_address[1]}", timeout=0.2)
+        assert client.handle("POST", "/monitor/events", {"gender": "male"})[0] == 503
+        assert len(server.requests) == 1  # Not recorded twice
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_client_resends_on_a_keep_alive_connection_the_sidecar_closed():
+    server = _RecordingServer(respond=True)  # Closes every connection after answering
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        client = MonitoringClient(f"http://127.0.0.1:{server.server_address[1]}")
+        assert client.handle("POST", "/monitor", None) == (202, {})
+        time.sleep(0.1)
+        assert client.handle("POST", "/monitor", None) == (202, {})  # Stale connection, resent on a new one
+        assert len(server.requests) == 2
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,66 @@
+import os
+import numpy as np
+from sklearn.linear_model import LinearRegression
+
+from src.mlproject.pipelines.model_registry import ModelRegistry, ModelRegistryConfig
+from src.mlproject.pipelines.prediction_cache import PredictionCache, PredictionCacheConfig
+from src.mlproject.utils import save_object
+
+
+def test_lru_eviction_and_ttl_expiry(monkeypatch):
+    clock = [100.0]
+    monkeypatch.setattr("src.mlproject.pipelines.prediction_cache.time.monotonic", lambda: clock[0])
+    cache = PredictionCache(PredictionCacheConfig(max_entries=2, ttl_seconds=10))
+
+    cache.put_many(["a", "b"], [1.0, 2.0], version="v1")
+    assert cache.get_many(["a"], "v1") == [1.0]  # "a" is now the most recently used
+    cache.put_many(["c"], [3.0], version="v1")
+    assert cache.get_many(["a", "b", "c"], "v1") == [1.0, None, 3.0]
+
+    clock[0] += 11
+    assert cache.get_many(["a"], "v1") == [None]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["evictions"], stats["expirations"]) == (3, 2, 1, 1)
+    assert stats["hit_rate"] == 0.6
+
+
+def test_invalidation_moves_to_the_new_version_and_ignores_stale_pipelines():
+    cache = PredictionCache()
+    cache.put_many(["a"], [1.0], version="v1")
+
+    cache.invalidate("v2")
+    cache.put_many(["a"], [1.0], version="v1")  # A request still running on the old model
+    assert cache.get_many(["a"], "v1") == [None]
+    assert cache.get_many(["a"], "v2") == [None]
+    cache.put_many(["a"], [2.0], version="v2")
+    assert cache.get_many(["a"], "v2") == [2.0]
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_registry_pipelines_share_a_version_tied_cache(trained_artifacts, student_df):
+    model_path, preprocessor_path = trained_artifacts
+    registry = ModelRegistry(ModelRegistryConfig(
+        model_path=model_path, preprocessor_path=preprocessor_path, check_interval_seconds=0,
+        cache_config=PredictionCacheConfig(max_entries=100),
+    ))
+    features = student_df.drop(columns=["math_score"])
+    record = features.iloc[0].to_dict()
+
+    pipeline = registry.get()
+    expected = pipeline.predict(features.head(20))
+    assert registry.cache.stats()["misses"] == 20
+
+    # Equivalent inputs share a key; the frame path, single records and batches all hit the cache
+    np.testing.assert_allclose(pipeline.predict_record(dict(record, reading_score=str(record["reading_score"]))), expected[:1])
+    np.testing.assert_allclose(pipeline.predict(features.head(20)), expected)
+    np.testing.assert_allclose([r["prediction"] for r in pipeline.predict_batch(features.head(20).to_dict("records"))], expected)
+    assert registry.cache.stats()["hits"] == 41
+
+    # Replacing best_model.pkl empties the cache
+    X = pipeline.preprocessor.transform(features)
+    save_object(model_path, LinearRegression().fit(X, student_df["math_score"] * 0 + 50))
+    os.utime(model_path, ns=(1, 1))
+    new_pipeline = registry.get()
+    assert new_pipeline is not pipeline
+    assert registry.cache.stats()["size"] == 0
+    np.testing.assert_allclose(new_pipeline.predict_record(record), [50.0])
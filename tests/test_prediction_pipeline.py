@@ -0,0 +1,70 @@
+import json
+import numpy as np
+import pytest
+
+from src.mlproject.exception import CustomException
+from src.mlproject.pipelines.prediction_pipeline import PredictionPipeline, parse_batch_payload
+
+
+@pytest.fixture
+def pipeline(trained_artifacts):
+    model_path, preprocessor_path = trained_artifacts
+    return PredictionPipeline(model_path, preprocessor_path)
+
+
+def test_predict_batch_matches_predict(pipeline, student_df):
+    """Chunked batch scoring returns the same values as predict() on the whole frame."""
+    features = student_df.drop(columns=["math_score"])
+    expected = pipeline.predict(features)
+
+    results = list(pipeline.predict_batch(features.to_dict(orient="records"), chunk_size=7))
+
+    assert [result["index"] for result in results] == list(range(len(features)))
+    np.testing.assert_allclose([result["prediction"] for result in results], expected)
+
+
+def test_predict_batch_reports_row_errors(pipeline, student_df):
+    """Invalid rows get an error entry without failing the rest of the batch."""
+    records = student_df.drop(columns=["math_score"]).head(4).to_dict(orient="records")
+    records[1] = dict(records[1], writing_score="seventy")
+    del records[2]["gender"]
+
+    results = list(pipeline.predict_batch(records, chunk_size=10))
+
+    assert "prediction" in results[0] and "prediction" in results[3]
+    assert "writing_score" in results[1]["error"]
+    assert "gender" in results[2]["error"]
+
+
+@pytest.mark.parametrize("make_bad", [
+    lambda record: {"gender": "male"},
+    lambda record: {"foo": 1},
+    lambda record: dict(record, writing_score=True),
+    lambda record: dict(record, reading_score="n/a"),
+])
+def test_predict_record_rejects_what_the_batch_endpoint_rejects(pipeline, student_df, make_bad):
+    """Single records go through validate_record too, instead of having missing fields imputed."""
+    record = make_bad(student_df.drop(columns=["math_score"]).iloc[0].to_dict())
+
+    with pytest.raises(CustomException):
+        pipeline.predict_record(record)
+    assert "error" in next(pipeline.predict_batch([record]))
+
+
+def test_parse_batch_payload_formats(student_df):
+    """JSON arrays, NDJSON and CSV bodies yield the same records."""
+    features = student_df.drop(columns=["math_score"]).head(3)
+    records = features.to_dict(orient="records")
+
+    as_json = list(parse_batch_payload(json.dumps(records).encode(), "application/json"))
+    as_ndjson = list(parse_batch_payload(
+        "\n".join(json.dumps(record) for record in records).encode() + b"\n{broken",
+        "application/x-ndjson",
+    ))
+    as_csv = list(parse_batch_payload(features.to_csv(index=False).encode(), "text/csv; charset=utf-8"))
+
+    assert as_json == records
+    assert as_ndjson[:3] == records
+    assert isinstance(as_ndjson[3], ValueError)
+    assert [row["gender"] for row in as_csv] == [record["gender"] for record in records]
+    assert [float(row["reading_score"]) for row in as_csv] == [record["reading_score"] for record in records]
@@ -0,0 +1,89 @@
+import os
+import numpy as np
+import pytest
+from catboost import CatBoostRegressor
+from sklearn.ensemble import RandomForestRegressor
+from xgboost import XGBRegressor
+
+from src.mlproject.exception import CustomException
+from src.mlproject.serialization import artifact_format, read_manifest
+from src.mlproject.utils import load_object, save_object
+
+
+@pytest.fixture
+def xy():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(200, 5))
+    return X, X @ rng.normal(size=5) + rng.normal(scale=0.1, size=200)
+
+
+@pytest.mark.parametrize("model, fmt, payload_ext", [
+    (RandomForestRegressor(n_estimators=5, random_state=0), "auto", ".joblib"),
+    (XGBRegressor(n_estimators=10), "auto", ".ubj"),
+    (CatBoostRegressor(iterations=10, verbose=0, allow_writing_files=False), "auto", ".cbm"),
+    (RandomForestRegressor(n_estimators=5, random_state=0), "pickle", None),
+])
+def test_round_trip_keeps_predictions(tmp_path, xy, model, fmt, payload_ext):
+    X, y = xy
+    model.fit(X, y)
+    path = os.path.join(tmp_path, "best_model.pkl")
+    save_object(path, model, fmt=fmt)
+
+    manifest = read_manifest(path)
+    if payload_ext is None:
+        assert manifest is None and artifact_format(path) == "pickle"
+    else:
+        assert manifest["payload"].endswith(payload_ext) and os.path.exists(os.path.join(tmp_path, manifest["payload"]))
+        assert manifest["class"].endswith(type(model).__name__) and "numpy" in manifest["versions"]
+    np.testing.assert_allclose(load_object(path).predict(X), model.predict(X), rtol=1e-6)
+
+
+def test_joblib_payload_is_memory_mapped_unless_compressed(tmp_path, xy):
+    X, y = xy
+    model = RandomForestRegressor(n_estimators=3, random_state=0).fit(X, y)
+    path = os.path.join(tmp_path, "best_model.pkl")
+
+    save_object(path, {"model": model, "weights": np.arange(10_000.0)}, fmt="joblib")
+    first_payload, first_size = read_manifest(path)["payload"], read_manifest(path)["size_bytes"]
+    assert isinstance(load_object(path)["weights"], np.memmap)
+    assert not isinstance(load_object(path, mmap=False)["weights"], np.memmap)
+
+    save_object(path, {"model": model, "weights": np.arange(10_000.0)}, fmt="joblib", compress=3)
+    loaded = load_object(path)
+    assert not isinstance(loaded["weights"], np.memmap)
+    np.testing.assert_allclose(loaded["model"].predict(X), model.predict(X))
+    # The replaced payload is kept for readers of the old manifest, the new one is smaller
+    assert read_manifest(path)["previous_payload"] == first_payload
+    assert os.path.exists(os.path.join(tmp_path, first_payload))
+    assert read_manifest(path)["size_bytes"] < first_size
+
+    # ...and cleaned up one generation later
+    save_object(path, {"model": model, "weights": np.arange(5.0)}, fmt="joblib")
+    assert not os.path.exists(os.path.join(tmp_path, first_payload))
+    assert sorted(os.listdir(tmp_path)) == sorted(["best_model.pkl", read_manifest(path)["payload"],
+                                                   read_manifest(path)["previous_payload"]])
+
+
+def test_checksum_mismatch_is_rejected(tmp_path, xy):
+    X, y = xy
+    path = os.path.join(tmp_path, "best_model.pkl")
+    save_object(path, XGBRegressor(n_estimators=5).fit(X, y), fmt="native")
+    with open(os.path.join(tmp_path, read_manifest(path)["payload"]), "ab") as file_obj:
+        file_obj.write(b"\0")
+
+    with pytest.raises(CustomException, match="Checksum mismatch"):
+        load_object(path)
+
+
+def test_native_load_restores_the_tuned_hyperparameters(tmp_path, xy):
+    X, y = xy
+    path = os.path.join(tmp_path, "best_model.pkl")
+    save_object(path, XGBRegressor(n_estimators=5, max_depth=3, learning_rate=0.2).fit(X, y), fmt="native")
+
+    params = load_object(path).get_params()
+    assert (params["n_estimators"], params["max_depth"], params["learning_rate"]) == (5, 3, 0.2)
+
+
+def test_native_format_requires_a_native_model(tmp_path, xy):
+    with pytest.raises(CustomException, match="no native format"):
+        save_object(os.path.join(tmp_path, "model.pkl"), RandomForestRegressor(), fmt="native")
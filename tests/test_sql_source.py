@@ -0,0 +1,154 @@
+import os
+import sqlite3
+import pytest
+import pandas as pd
+
+from src.mlproject.components import data_ingestion, sql_source
+from src.mlproject.components.data_ingestion import DataIngestion, DataIngestionConfig
+from src.mlproject.components.sql_source import SQLSource, SQLSourceConfig
+from src.mlproject.exception import CustomException
+from src.mlproject.utils import load_frame
+
+
+@pytest.fixture
+def student_db(tmp_path, student_df):
+    """A file-backed SQLite stand-in for the MySQL `student` table, with an id key."""
+    path = os.path.join(tmp_path, "students.db")
+    with sqlite3.connect(path) as connection:
+        student_df.rename_axis("id").reset_index().to_sql("student", connection, index=False)
+
+    def connect():
+        return sqlite3.connect(path, check_same_thread=False)  # Pooled connections move between threads
+    return path, connect
+
+
+def _config(tmp_path, **kwargs):
+    return SQLSourceConfig(paramstyle="qmark", watermark_path=os.path.join(tmp_path, "watermarks.json"), **kwargs)
+
+
+def test_partitioned_parallel_read_matches_a_single_query(tmp_path, student_db, student_df):
+    path, connect = student_db
+    with sqlite3.connect(path) as connection:
+        connection.execute("INSERT INTO student (id, gender, math_score) VALUES (NULL, 'female', 50)")
+
+    config = _config(tmp_path, partition_column="id", n_partitions=4, max_workers=3, pool_size=2, fetch_size=7)
+    with SQLSource(config, connect=connect) as source:
+        chunks = list(source.iter_chunks())
+        assert max(len(chunk) for chunk in chunks) <= 7
+        assert source.pool.created <= 2
+
+        df = pd.concat(chunks, ignore_index=True)
+        assert len(df) == len(student_df) + 1  # Including the NULL-key row
+        pd.testing.assert_frame_equal(
+            source.read().dropna(subset=["id"]).drop(columns="id").astype(student_df.dtypes.to_dict()), student_df,
+        )
+
+
+def test_watermark_pulls_only_new_rows(tmp_path, student_db, student_df):
+    path, connect = student_db
+    config = _config(tmp_path, watermark_column="id", fetch_size=50)
+
+    with SQLSource(config, connect=connect) as source:
+        assert len(source.read()) == len(student_df)
+        assert source.watermark() is None  # Not committed until the caller has saved the rows
+        source.commit_watermark()
+        assert source.watermark() == len(student_df) - 1
+
+        with sqlite3.connect(path) as connection:
+            student_df.iloc[:5].rename_axis("id").reset_index().assign(id=range(200, 205)) \
+                .to_sql("student", connection, index=False, if_exists="append")
+
+        assert source.read()["id"].tolist() == list(range(200, 205))
+        assert source.read()["id"].tolist() == list(range(200, 205))  # Still uncommitted: pulled again
+        source.commit_watermark()
+        assert source.read().empty and source.watermark() == 204
+
+
+def test_interrupted_pull_keeps_the_watermark(tmp_path, student_db):
+    _, connect = student_db
+    with SQLSource(_config(tmp_path, watermark_column="id", fetch_size=10), connect=connect) as source:
+        next(source.iter_chunks())
+        assert source.watermark() is None
+
+
+def test_rejects_unsafe_identifiers_and_wraps_query_errors(tmp_path, student_db):
+    _, connect = student_db
+    with pytest.raises(ValueError):
+        SQLSource(_config(tmp_path, table="student; DROP TABLE student"), connect=connect)
+    with pytest.raises(CustomException):
+        SQLSource(_config(tmp_path, table="missing"), connect=connect).read()
+
+
+def test_streaming_ingestion_from_sql_source(tmp_path, student_db, student_df, monkeypatch):
+    _, connect = student_db
+    monkeypatch.setattr(sql_source, "mysql_connect", connect)
+    artifacts = os.path.join(tmp_path, "artifacts")
+    config = DataIngestionConfig(
+        source="mysql", chunk_size=32, sql_config=_config(tmp_path, columns=tuple(student_df.columns),
+                                                          partition_column="reading_score", max_workers=2),
+        train_data_path=os.path.join(artifacts, "train.parquet"),
+        test_data_path=os.path.join(artifacts, "test.parquet"),
+        raw_data_path=os.path.join(artifacts, "raw.parquet"),
+    )
+
+    train_path, test_path = DataIngestion(config).initiate_data_ingestion()
+
+    assert len(load_frame(train_path)) + len(load_frame(test_path)) == len(student_df)
+
+
+@pytest.mark.parametrize("chunk_size", [None, 32])
+def test_watermark_ingestion_appends_the_new_rows(tmp_path, student_db, student_df, monkeypatch, chunk_size):
+    path, connect = student_db
+    monkeypatch.setattr(sql_source, "mysql_connect", connect)
+    artifacts = os.path.join(tmp_path, "artifacts")
+    config = DataIngestionConfig(
+        source="mysql", chunk_size=chunk_size, sql_config=_config(tmp_path, watermark_column="id"),
+        train_data_path=os.path.join(artifacts, "train.parquet"),
+        test_data_path=os.path.join(artifacts, "test.parquet"),
+        raw_data_path=os.path.join(artifacts, "raw.parquet"),
+    )
+    train_path, test_path = DataIngestion(config).initiate_data_ingestion()
+    first_train, first_test = load_frame(train_path), load_frame(test_path)
+
+    with sqlite3.connect(path) as connection:
+        student_df.iloc[:20].rename_axis("id").reset_index().assign(id=range(200, 220)) \
+            .to_sql("student", connection, index=False, if_exists="append")
+    DataIngestion(config).initiate_data_ingestion()
+
+    train, test = load_frame(train_path), load_frame(test_path)
+    assert len(load_frame(config.raw_data_path)) == len(student_df) + 20
+    assert sorted(train["id"].tolist() + test["id"].tolist()) == list(range(220))
+    # The earlier split is kept, not replaced by the delta
+    assert set(first_train["id"]) <= set(train["id"]) and set(first_test["id"]) <= set(test["id"])
+
+    DataIngestion(config).initiate_data_ingestion()  # Nothing new: the artifacts stay as they are
+    assert len(load_frame(train_path)) + len(load_frame(test_path)) == len(student_df) + 20
+
+
+def test_failed_save_keeps_the_watermark(tmp_path, student_db, student_df, monkeypatch):
+    """Rows pulled by an ingestion that fails before they are saved are pulled again next time."""
+    path, connect = student_db
+    monkeypatch.setattr(sql_source, "mysql_connect", connect)
+    artifacts = os.path.join(tmp_path, "artifacts")
+    config = DataIngestionConfig(
+        source="mysql", sql_config=_config(tmp_path, watermark_column="id"),
+        train_data_path=os.path.join(artifacts, "train.parquet"),
+        test_data_path=os.path.join(artifacts, "test.parquet"),
+        raw_data_path=os.path.join(artifacts, "raw.parquet"),
+    )
+    DataIngestion(config).initiate_data_ingestion()
+    with sqlite3.connect(path) as connection:
+        student_df.iloc[:20].rename_axis("id").reset_index().assign(id=range(200, 220)) \
+            .to_sql("student", connection, index=False, if_exists="append")
+
+    def full_disk(frame, file_path):
+        raise OSError("No space left on device")
+    monkeypatch.setattr(data_ingestion, "save_frame", full_disk)
+    with pytest.raises(CustomException):
+        DataIngestion(config).initiate_data_ingestion()
+    assert SQLSource(config.sql_config).watermark() == len(student_df) - 1
+
+    monkeypatch.undo()
+    monkeypatch.setattr(sql_source, "mysql_connect", connect)
+    with SQLSource(config.sql_config) as source:
+        assert source.read()["id"].tolist() == list(range(200, 220))
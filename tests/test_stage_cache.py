@@ -0,0 +1,71 @@
+import os
+import pytest
+
+from src.mlproject.pipelines.stage_cache import StageCache, StageCacheConfig
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return StageCache(StageCacheConfig(cache_dir=os.path.join(tmp_path, ".stage_cache")))
+
+
+@pytest.fixture
+def stage_files(tmp_path):
+    source = os.path.join(tmp_path, "source.csv")
+    output = os.path.join(tmp_path, "output.csv")
+    with open(source, "w") as file_obj:
+        file_obj.write("a,b\n1,2\n")
+    return source, output
+
+
+def make_stage(source, output, calls):
+    def compute():
+        calls.append(1)
+        with open(source) as src, open(output, "w") as dst:
+            dst.write(src.read().upper())
+        return {"rows": 1}
+    return compute
+
+
+def test_second_run_is_a_cache_hit(cache, stage_files):
+    source, output = stage_files
+    calls = []
+    kwargs = dict(inputs=[source], config={"test_size": 0.2}, code=[make_stage], outputs=[output])
+
+    assert cache.run("ingestion", make_stage(source, output, calls), **kwargs) == {"rows": 1}
+    assert cache.run("ingestion", make_stage(source, output, calls), **kwargs) == {"rows": 1}
+    assert len(calls) == 1
+
+
+def test_changed_input_config_or_force_reruns(cache, stage_files):
+    source, output = stage_files
+    calls = []
+    kwargs = dict(inputs=[source], code=[make_stage], outputs=[output])
+
+    cache.run("ingestion", make_stage(source, output, calls), config={"test_size": 0.2}, **kwargs)
+    cache.run("ingestion", make_stage(source, output, calls), config={"test_size": 0.3}, **kwargs)
+    assert len(calls) == 2
+
+    with open(source, "a") as file_obj:
+        file_obj.write("3,4\n")
+    cache.run("ingestion", make_stage(source, output, calls), config={"test_size": 0.3}, **kwargs)
+    assert len(calls) == 3
+
+    cache.run("ingestion", make_stage(source, output, calls), config={"test_size": 0.3}, force=True, **kwargs)
+    assert len(calls) == 4
+
+
+def test_modified_or_missing_output_is_a_miss(cache, stage_files):
+    source, output = stage_files
+    calls = []
+    kwargs = dict(inputs=[source], code=[make_stage], outputs=[output])
+
+    cache.run("ingestion", make_stage(source, output, calls), **kwargs)
+    with open(output, "w") as file_obj:
+        file_obj.write("tampered")
+    cache.run("ingestion", make_stage(source, output, calls), **kwargs)
+    assert len(calls) == 2
+
+    os.remove(output)
+    cache.run("ingestion", make_stage(source, output, calls), **kwargs)
+    assert len(calls) == 3
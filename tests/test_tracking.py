@@ -0,0 +1,100 @@
+import os
+import time
+import threading
+import numpy as np
+import pandas as pd
+import pytest
+from mlflow.models.signature import infer_signature
+from sklearn.tree import DecisionTreeRegressor
+
+from src.mlproject.tracking import AsyncTracker, TrackingConfig
+
+
+@pytest.fixture
+def file_store_uri(tmp_path, monkeypatch):
+    """A local file-based MLflow store."""
+    monkeypatch.setenv("MLFLOW_ALLOW_FILE_STORE", "true")
+    return (tmp_path / "mlruns").as_uri()
+
+
+@pytest.fixture
+def model():
+    X = np.arange(20, dtype=float).reshape(10, 2)
+    return DecisionTreeRegressor(max_depth=3).fit(X, X.sum(axis=1))
+
+
+class UnreachableClient:
+    def __getattr__(self, name):
+        raise ConnectionError("tracking server unreachable")
+
+
+def test_runs_are_logged_in_background(tmp_path, file_store_uri, model):
+    """Params, metrics and the model artifact end up in the store after flush()."""
+    tracker = AsyncTracker(TrackingConfig(tracking_uri=file_store_uri, spool_dir=str(tmp_path / "spool")))
+    tracker.log_run("Tests", "Candidate Run", params={"n_estimators": 100},
+                    metrics={"rmse": np.float64(1.5), "r2": 0.9}, model=model)
+    assert tracker.flush(timeout=60)
+
+    experiment = tracker.client.get_experiment_by_name("Tests")
+    runs = tracker.client.search_runs([experiment.experiment_id])
+    assert len(runs) == 1
+    assert runs[0].data.params == {"n_estimators": "100"}
+    assert runs[0].data.metrics == {"rmse": 1.5, "r2": 0.9}
+    assert runs[0].info.status == "FINISHED"
+    assert "model/MLmodel" in [a.path for a in tracker.client.list_artifacts(runs[0].info.run_id, "model")]
+    assert os.listdir(tmp_path / "spool") == []
+
+
+def test_unreachable_remote_spools_and_replays(tmp_path, file_store_uri, model):
+    """Runs that fail to upload are spooled to disk and replayed by a later tracker."""
+    spool_dir = str(tmp_path / "spool")
+    offline = AsyncTracker(TrackingConfig(spool_dir=spool_dir, replay_on_start=False))
+    offline._client = UnreachableClient()
+    offline.log_run("Tests", "Offline Run", metrics={"mae": 2.0}, model=model)
+    assert offline.flush(timeout=60)
+    assert len([name for name in os.listdir(spool_dir) if name.endswith(".json")]) == 1
+
+    online = AsyncTracker(TrackingConfig(tracking_uri=file_store_uri, spool_dir=spool_dir))
+    online.start()  # replays the spool
+    assert online.flush(timeout=60)
+
+    experiment = online.client.get_experiment_by_name("Tests")
+    runs = online.client.search_runs([experiment.experiment_id])
+    assert [run.info.run_name for run in runs] == ["Offline Run"]
+    assert runs[0].data.metrics == {"mae": 2.0}
+    assert "model/MLmodel" in [a.path for a in online.client.list_artifacts(runs[0].info.run_id, "model")]
+    assert os.listdir(spool_dir) == []
+
+
+def test_spooled_run_is_kept_until_the_replay_is_logged(tmp_path, file_store_uri, model):
+    """The spool file survives until the upload succeeds, with the signature and input example."""
+    spool_dir = str(tmp_path / "spool")
+    X = np.arange(10, dtype=float).reshape(5, 2)
+    signature, example = infer_signature(X, model.predict(X)), pd.DataFrame(X, columns=["a", "b"])
+    offline = AsyncTracker(TrackingConfig(spool_dir=spool_dir, replay_on_start=False))
+    offline._client = UnreachableClient()
+    offline.log_run("Tests", "Offline Run", model=model, signature=signature, input_example=example)
+    assert offline.flush(timeout=60)
+    spool_file = [name for name in os.listdir(spool_dir) if name.endswith(".json")][0]
+
+    online = AsyncTracker(TrackingConfig(tracking_uri=file_store_uri, spool_dir=spool_dir, replay_on_start=False))
+    release, replayed = threading.Event(), []
+    log = online._log
+
+    def blocked_log(record):
+        replayed.append(record)
+        release.wait(30)
+        log(record)
+    online._log = blocked_log
+
+    assert online.replay_spool() == 1
+    assert online.replay_spool() == 0  # Already queued
+    while not replayed:
+        time.sleep(0.01)
+    assert os.path.exists(os.path.join(spool_dir, spool_file))  # A crash here replays the run again
+    assert replayed[0].signature == signature
+    pd.testing.assert_frame_equal(replayed[0].input_example, example)
+
+    release.set()
+    assert online.flush(timeout=60)
+    assert os.listdir(spool_dir) == []
@@ -0,0 +1,4 @@
+# Production WSGI entry point, see gunicorn.conf.py:  gunicorn -c gunicorn.conf.py wsgi:app
+from app import app
+
+application = app